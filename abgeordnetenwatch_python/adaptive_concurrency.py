@@ -0,0 +1,182 @@
+import asyncio
+import time
+from typing import Optional, Callable, List, Tuple, Any, TYPE_CHECKING
+
+from abgeordnetenwatch_python.session import SessionWrapper, WrappedRequest
+
+if TYPE_CHECKING:
+    import aiohttp
+
+
+def is_overload_status(status: int) -> bool:
+    """
+    :return: True, if the status shows, that the server is overloaded: 429 (too many requests) or 5xx.
+    """
+    return status == 429 or status >= 500
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """
+    :return: True, if the given exception of a request is a sign of an overloaded server: timeouts, dropped
+             connections and responses with status 429 or 5xx (raised with `raise_for_status=True`).
+    """
+    if isinstance(error, asyncio.TimeoutError):
+        return True
+    # the session exists, so aiohttp is already imported
+    import aiohttp
+    if isinstance(error, aiohttp.ClientResponseError):
+        return is_overload_status(error.status)
+    return isinstance(error, aiohttp.ClientConnectionError)
+
+
+class AdaptiveLimiter:
+    """
+    Limits the number of simultaneous requests with an AIMD controller (additive increase, multiplicative decrease):
+    Every successful request with a healthy latency raises the limit by `increase / limit`, so the limit grows by about
+    `increase` per round trip. A timeout, 429 or 5xx response multiplies the limit with `backoff`, at most once per
+    round trip. The same happens, when the moving average of the latency exceeds `latency_tolerance` times the lowest
+    moving average seen so far, as the requests queue up at the server then.
+    """
+    def __init__(
+            self, max_limit: int, min_limit: int = 1, initial_limit: Optional[int] = None, increase: float = 1.0,
+            backoff: float = 0.7, latency_tolerance: float = 2.0, log: Optional[Callable[[str], None]] = None
+    ):
+        """
+        :param max_limit: The maximal number of simultaneous requests.
+        :param min_limit: The minimal number of simultaneous requests.
+        :param initial_limit: The limit to start with. Defaults to a quarter of max_limit.
+        :param increase: The increase of the limit per round trip without errors.
+        :param backoff: The factor the limit is multiplied with on an overload.
+        :param latency_tolerance: The factor, by which the latency may grow before the limit is reduced.
+        :param log: If given, called with a message whenever the limit changes, e.g. `print` or `tqdm.write`.
+        """
+        self.max_limit = max(max_limit, 1)
+        self.min_limit = min(max(min_limit, 1), self.max_limit)
+        if initial_limit is None:
+            initial_limit = self.max_limit // 4
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.increase = increase
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.log = log
+
+        self.in_flight = 0
+        self.num_backoffs = 0
+        self.smoothed_latency: Optional[float] = None
+        self.base_latency: Optional[float] = None
+        self._last_backoff = 0.0
+        self._condition = asyncio.Condition()
+        self._started = time.monotonic()
+        # (time, limit) for every change of the limit
+        self.history: List[Tuple[float, int]] = [(self._started, self.get_limit())]
+
+    def get_limit(self) -> int:
+        return int(self.limit)
+
+    async def acquire(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.get_limit())
+            self.in_flight += 1
+
+    async def release(self):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def is_latency_healthy(self) -> bool:
+        if self.smoothed_latency is None:
+            return True
+        return self.smoothed_latency <= self.base_latency * self.latency_tolerance
+
+    def on_success(self, latency: float):
+        """
+        Called after a request finished without overload.
+
+        :param latency: The seconds until the response headers arrived.
+        """
+        if self.smoothed_latency is None:
+            self.smoothed_latency = latency
+        else:
+            self.smoothed_latency = 0.9 * self.smoothed_latency + 0.1 * latency
+        if self.base_latency is None or self.smoothed_latency < self.base_latency:
+            self.base_latency = self.smoothed_latency
+
+        if not self.is_latency_healthy():
+            # the requests queue up at the server
+            self.on_overload('latency')
+        elif self.in_flight >= self.get_limit():
+            # only grow, if the current limit is used
+            self._set_limit(min(self.limit + self.increase / self.limit, self.max_limit), 'healthy')
+
+    def on_overload(self, reason: str):
+        """
+        Called after a request failed with a timeout, a dropped connection or a 429 or 5xx response, or when the latency
+        is too high.
+        """
+        now = time.monotonic()
+        # the requests of one round trip probably failed for the same reason, so back off only once for all of them
+        if now - self._last_backoff < (self.smoothed_latency or 0.0):
+            return
+        self._last_backoff = now
+        self.num_backoffs += 1
+        self._set_limit(max(self.limit * self.backoff, self.min_limit), reason)
+
+    def _set_limit(self, limit: float, reason: str):
+        old_limit = self.get_limit()
+        self.limit = limit
+        if self.get_limit() != old_limit:
+            self.history.append((time.monotonic(), self.get_limit()))
+            if self.log is not None:
+                latency = f'{self.smoothed_latency:.2f}s' if self.smoothed_latency is not None else '-'
+                self.log(f'concurrency limit {old_limit} -> {self.get_limit()} ({reason}, latency {latency})')
+
+    def get_average_limit(self) -> float:
+        """
+        :return: The limit averaged over the time since the limiter was created.
+        """
+        now = time.monotonic()
+        total = 0.0
+        for (start, limit), (end, _) in zip(self.history, self.history[1:] + [(now, 0)]):
+            total += (end - start) * limit
+        return total / (now - self._started) if now > self._started else float(self.get_limit())
+
+    def get_summary(self) -> str:
+        limits = [limit for _, limit in self.history]
+        return 'concurrency limit: final {}, average {:.1f}, range {}-{}, {} backoffs'.format(
+            self.get_limit(), self.get_average_limit(), min(limits), max(limits), self.num_backoffs
+        )
+
+
+class AdaptiveSession(SessionWrapper):
+    """
+    Session, that adapts the number of simultaneous requests with an `AdaptiveLimiter`. The limit applies to all
+    requests of the session: listing pages, question pages and api calls.
+    """
+    def __init__(self, session: 'aiohttp.ClientSession', limiter: AdaptiveLimiter):
+        super().__init__(session)
+        self.limiter = limiter
+
+    def get(self, url: str, **kwargs) -> WrappedRequest:
+        return WrappedRequest(self, url, kwargs)
+
+    async def before_request(self):
+        await self.limiter.acquire()
+
+    async def open_request(self, url: str, kwargs: dict) -> Tuple[Any, 'aiohttp.ClientResponse']:
+        started = time.monotonic()
+        request, response = await super().open_request(url, kwargs)
+        if is_overload_status(response.status):
+            self.limiter.on_overload(f'status {response.status}')
+        else:
+            self.limiter.on_success(time.monotonic() - started)
+        return request, response
+
+    async def after_request(self, error: Optional[BaseException]):
+        # failed to send the request or e.g. a read timeout while reading the body
+        if isinstance(error, Exception) and is_overload_error(error):
+            self.limiter.on_overload(type(error).__name__)
+        # the slot is held, until the body was read
+        await self.limiter.release()
+
+    def get_summary(self) -> str:
+        return self.limiter.get_summary()
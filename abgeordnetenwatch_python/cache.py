@@ -1,20 +1,219 @@
-from typing import Optional, Dict
+import bisect
+import json
+import tempfile
+import warnings
+from array import array
+from typing import Optional, Dict, Iterable, List, Tuple, Any, IO
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict, ValidationError, model_validator
 
-from abgeordnetenwatch_python.models.questions_answers import QuestionAnswerResult, QuestionsAnswers
+from abgeordnetenwatch_python.models.questions_answers import QuestionAnswerResult, QuestionsAnswers, QuestionTile
+
+# flags of the questions in a CacheIndex
+_HAS_QUESTION = 1
+_ANSWERED = 2
+
+
+class CacheIndex:
+    """
+    Compact index of previously downloaded questions and answers: The hashes of the urls are kept in a sorted array
+    together with the answered state of the question and the position of the full record in a temporary file. Lookups
+    and skip decisions need a few bytes per question, full records are only read, when they are needed.
+
+    Small indexes are kept in memory, larger ones are spooled to disk.
+    """
+    def __init__(self, questions_answers: Iterable[QuestionAnswerResult], max_memory_size: int = 1 << 20):
+        """
+        :param questions_answers: The cached questions and answers. Questions without url are skipped. For duplicated
+                                  urls, the last question is used.
+        :param max_memory_size: The size of the records in bytes, up to which they are kept in memory.
+        """
+        self._start(max_memory_size)
+        for qa in questions_answers:
+            if qa.url is not None:
+                self._add(qa.url, _get_flags(qa.question, qa.answer), qa.model_dump_json())
+        self._sort()
+
+    @staticmethod
+    def load_json(f: IO, max_memory_size: int = 1 << 20) -> Tuple[Any, 'CacheIndex']:
+        """
+        Parses a json file, e.g. a dossier, and indexes the questions and answers in it during parsing: Every object
+        with the keys "url" and "question" is written to the index and replaced by None. So the questions and answers
+        are never in memory all at once, and no model is created and validated for them. A record is validated, when
+        it is read with `get()`.
+
+        :param f: The json file opened for reading.
+        :param max_memory_size: The size of the records in bytes, up to which they are kept in memory.
+        :return: The parsed json without the questions and answers and the index.
+        """
+        index = CacheIndex.__new__(CacheIndex)
+        index._start(max_memory_size)
+
+        def index_question_answer(obj: dict):
+            if 'url' not in obj or 'question' not in obj:
+                return obj
+            if isinstance(obj['url'], str):
+                index._add(obj['url'], _get_flags(obj['question'], obj.get('answer')), json.dumps(obj))
+            return None
+
+        try:
+            data = json.load(f, object_hook=index_question_answer)
+        except BaseException:
+            index.close()
+            raise
+        index._sort()
+        return data, index
+
+    def _start(self, max_memory_size: int):
+        self._file = tempfile.SpooledTemporaryFile(max_size=max_memory_size)
+        # the records in the order they were added, until they are sorted by the hash of the url
+        self._added: List[Tuple[int, int, int]] = []
+
+    def _add(self, url: str, flags: int, record_json: str):
+        # hash() is only stable within the process, which is enough for an index that is never saved
+        self._added.append((hash(url), flags, self._file.tell()))
+        # the url comes first, so urls can be compared and listed without parsing the records
+        self._file.write(f'{url}\n{record_json}\n'.encode('utf-8'))
+
+    def _sort(self):
+        self._hashes = array('q')
+        self._flags = array('B')
+        self._starts = array('Q')
+        # the sort is stable, so the later one of duplicated urls comes last
+        self._added.sort(key=lambda record: record[0])
+        for h, flags, start in self._added:
+            position = len(self._hashes)
+            if position and self._hashes[-1] == h:
+                # a duplicated url replaces the earlier question, a different url with the same hash is added
+                url = self._read_url(start)
+                position = next((p for p in self._get_positions(h) if self._read_url(self._starts[p]) == url), position)
+            if position == len(self._hashes):
+                self._hashes.append(h)
+                self._flags.append(flags)
+                self._starts.append(start)
+            else:
+                self._flags[position] = flags
+                self._starts[position] = start
+        self._added = []
+        self.num_unanswered = sum(1 for f in self._flags if f == _HAS_QUESTION)
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def __contains__(self, url: str) -> bool:
+        return self._find(url) != -1
+
+    def _get_positions(self, h: int) -> range:
+        # the positions of all urls with the given hash
+        return range(bisect.bisect_left(self._hashes, h), bisect.bisect_right(self._hashes, h))
+
+    def _find(self, url: str) -> int:
+        for position in self._get_positions(hash(url)):
+            # different urls with the same hash are told apart by the stored url
+            if self._read_url(self._starts[position]) == url:
+                return position
+        return -1
+
+    def _read_url(self, start: int) -> str:
+        self._file.seek(start)
+        return self._file.readline()[:-1].decode('utf-8')
+
+    def is_answered(self, url: str) -> Optional[bool]:
+        """
+        :return: True, if the cached question has an answer. None, if the url is not cached.
+        """
+        position = self._find(url)
+        if position == -1:
+            return None
+        return bool(self._flags[position] & _ANSWERED)
+
+    def is_unanswered(self, url: str) -> bool:
+        """
+        :return: True, if the question is cached with its text, but without answer.
+        """
+        position = self._find(url)
+        return position != -1 and self._flags[position] == _HAS_QUESTION
+
+    def get(self, url: str) -> Optional[QuestionAnswerResult]:
+        """
+        :return: The cached question with the given url, read from the record file. None, if the url is not cached or
+                 the record is invalid.
+        """
+        position = self._find(url)
+        if position == -1:
+            return None
+        # _find() left the file behind the url
+        record_json = self._file.readline()
+        try:
+            return QuestionAnswerResult.model_validate_json(record_json)
+        except ValidationError:
+            warnings.warn(f'Invalid cached question "{url}" - loading it again.')
+            return None
+
+    def get_urls(self) -> List[str]:
+        """
+        :return: The urls of all cached questions.
+        """
+        return [self._read_url(start) for start in self._starts]
+
+    def close(self):
+        self._file.close()
+
+
+def _get_flags(question: Optional[str], answer: Optional[str]) -> int:
+    return (_HAS_QUESTION if question is not None else 0) | (_ANSWERED if answer is not None else 0)
 
 
 class CacheInfo(BaseModel):
-    questions_answers: QuestionsAnswers
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    index: CacheIndex
     num_questions_missing: int = -1
     num_answers_missing: int = -1
-    lookup: Optional[Dict[str, QuestionAnswerResult]] = Field(None, exclude=True)
+    # answered state of questions as seen on the listing pages, by url
+    tiles: Dict[str, QuestionTile] = Field(default_factory=dict, exclude=True)
+    # counts updated by add_tiles(): the tiles shown as answered and the cached unanswered questions among the tiles
+    num_answered_tiles: int = Field(0, exclude=True)
+    num_unanswered_seen: int = Field(0, exclude=True)
+    num_newly_answered: int = Field(0, exclude=True)
+
+    @model_validator(mode='before')
+    @classmethod
+    def _index_questions_answers(cls, data):
+        # CacheInfo(questions_answers=...) indexes the given questions and answers
+        if isinstance(data, dict) and isinstance(data.get('questions_answers'), QuestionsAnswers):
+            data = dict(data)
+            data['index'] = CacheIndex(data.pop('questions_answers').questions_answers)
+        return data
 
     def get_by_url(self, url: str) -> Optional[QuestionAnswerResult]:
-        if self.lookup is None:
-            self.lookup = {qa.url: qa for qa in self.questions_answers.questions_answers}
-        return self.lookup.get(url)
+        return self.index.get(url)
+
+    def add_tiles(self, tiles: Dict[str, QuestionTile]):
+        """
+        Adds the tiles of a listing page and updates the counts of the cached unanswered questions among them.
+
+        :param tiles: The tiles of the page by the url of the question.
+        """
+        for url, tile in tiles.items():
+            old_tile = self.tiles.get(url)
+            unanswered = self.index.is_unanswered(url)
+            if old_tile is not None and old_tile.answered:
+                self.num_answered_tiles -= 1
+                self.num_newly_answered -= unanswered
+            if old_tile is None:
+                self.num_unanswered_seen += unanswered
+            if tile.answered:
+                self.num_answered_tiles += 1
+                self.num_newly_answered += unanswered
+            self.tiles[url] = tile
+
+    def are_tiles_reliable(self) -> bool:
+        """
+        :return: False, if the listing pages showed questions, but none of them as answered, while answers are missing.
+                 Then the answered state can not be read from the tiles (e.g. because of a changed page layout).
+        """
+        return not self.tiles or self.num_answered_tiles > 0 or self.num_answers_missing <= 0
 
     def should_cache(self, cache_qa: Optional[QuestionAnswerResult]) -> bool:
         # if we don't have something to cache, we don't do it
@@ -30,7 +229,31 @@ class CacheInfo(BaseModel):
             return True
 
         # cache, if there is no answer anymore to expect
-        return self.num_answers_missing == 0
+        if self.num_answers_missing == 0:
+            return True
+
+        # without the answered state of the listing pages, every unanswered question is loaded again
+        if not self.are_tiles_reliable():
+            return False
+
+        # otherwise, only reload questions that are shown as answered on the listing page
+        tile = self.tiles.get(cache_qa.url)
+        if tile is not None:
+            return not tile.answered
+
+        # if all missing answers were found on the listing pages, this question is still unanswered
+        return self.num_answers_missing > 0 and self.num_newly_answered >= self.num_answers_missing
+
+    def is_answer_missing(self) -> bool:
+        """
+        :return: True, if there are answers missing for cached questions, that could be found on the listing pages.
+        """
+        if self.num_answers_missing <= 0:
+            return False
+        if self.num_newly_answered >= self.num_answers_missing:
+            return False
+        # some cached unanswered questions were not seen on the listing pages yet
+        return self.num_unanswered_seen < self.index.num_unanswered
 
     def is_question_missing(self) -> bool:
         return self.num_questions_missing != 0
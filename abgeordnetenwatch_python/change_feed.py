@@ -0,0 +1,99 @@
+import datetime
+from pathlib import Path
+from typing import Optional, List, Iterable, Union
+
+from pydantic import BaseModel
+
+from abgeordnetenwatch_python.cache import CacheIndex
+from abgeordnetenwatch_python.models.questions_answers import QuestionsAnswers
+
+
+class ChangeEvent(BaseModel):
+    """
+    A change of the questions and answers of a politician, found by a download.
+    """
+    # "question" for a newly discovered question, "answer" for a newly arrived answer
+    type: str
+    politician_id: int
+    url: Optional[str]
+    question_date: Optional[datetime.date] = None
+    answer_date: Optional[datetime.date] = None
+    detected_at: datetime.datetime
+
+
+def get_changes(
+        politician_id: int, old: Optional[Union[QuestionsAnswers, CacheIndex]], new: QuestionsAnswers,
+        detected_at: Optional[datetime.datetime] = None
+) -> List[ChangeEvent]:
+    """
+    Compares the questions and answers of a politician before and after a download.
+
+    :param politician_id: The id of the politician.
+    :param old: The questions and answers before the download or their index. None, if the politician was not
+                downloaded before.
+    :param new: The questions and answers after the download.
+    :param detected_at: The time of the download. Defaults to now.
+    :return: An event for every new question and every new answer.
+    """
+    if detected_at is None:
+        detected_at = datetime.datetime.now(datetime.timezone.utc)
+    old_index = CacheIndex(old.questions_answers) if isinstance(old, QuestionsAnswers) else old
+    try:
+        return _get_changes(politician_id, old_index, new, detected_at)
+    finally:
+        if old_index is not old:
+            old_index.close()
+
+
+def _get_changes(
+        politician_id: int, old: Optional[CacheIndex], new: QuestionsAnswers, detected_at: datetime.datetime
+) -> List[ChangeEvent]:
+    changes = []
+    for qa in new.questions_answers:
+        # None, if the question is new
+        old_answered = old.is_answered(qa.url) if old is not None and qa.url is not None else None
+        event_args = dict(
+            politician_id=politician_id, url=qa.url, question_date=qa.question_date, answer_date=qa.answer_date,
+            detected_at=detected_at
+        )
+        if old_answered is None:
+            changes.append(ChangeEvent(type='question', **event_args))
+        if qa.answer is not None and not old_answered:
+            changes.append(ChangeEvent(type='answer', **event_args))
+    return changes
+
+
+def get_change_feed_filename(directory: Path, run_started: datetime.datetime) -> Path:
+    """
+    :return: The change feed of the run started at the given time, e.g. "changes-20240131T120000.jsonl".
+    """
+    return directory / f'changes-{run_started:%Y%m%dT%H%M%S}.jsonl'
+
+
+class ChangeFeedWriter:
+    """
+    Appends change events to a JSON lines file, one event per line. Every line is written with a single write to a file
+    opened in append mode, so several processes of a run can share the same change feed.
+    """
+    def __init__(self, filename: Path):
+        filename.parent.mkdir(exist_ok=True, parents=True)
+        self.filename = filename
+        self._file = open(filename, 'ab', buffering=0)
+
+    def write(self, changes: Iterable[ChangeEvent]):
+        for change in changes:
+            self._file.write((change.model_dump_json() + '\n').encode('utf-8'))
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def read_change_feed(filename: Path) -> List[ChangeEvent]:
+    with open(filename, encoding='utf-8') as f:
+        return [ChangeEvent.model_validate_json(line) for line in f if line.strip()]
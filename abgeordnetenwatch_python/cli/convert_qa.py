@@ -1,15 +1,20 @@
 import argparse
 from pathlib import Path
-from typing import List
-from tqdm import tqdm
+from typing import List, Optional
 
-from abgeordnetenwatch_python.questions_answers.load_qa import save_answers_to_format
+from abgeordnetenwatch_python.compression import find_dossier_files, strip_dossier_suffix, DOSSIER_SUFFIXES
+from abgeordnetenwatch_python.questions_answers.writers import open_questions_answers_writer
 from abgeordnetenwatch_python.models.politician_dossier import PoliticianDossier
 
+# dossiers can be converted to other compressions
+DOSSIER_FORMATS = [suffix[1:] for suffix in DOSSIER_SUFFIXES]
+FORMATS = ['csv', 'txt', 'jsonl'] + DOSSIER_FORMATS
+
 
 def parse_args():
     parser = argparse.ArgumentParser(
-        description='Convert questions/answers to csv, txt or json.'
+        description='Convert questions/answers to csv, txt or jsonl. Dossiers can also be converted to compressed '
+                    'dossiers (json.gz, json.zst) or back.'
     )
     parser.add_argument(
         'indir', type=Path, help='The directory to read files from.',
@@ -18,16 +23,29 @@ def parse_args():
         'outdir', type=Path, help='The directory to write converted files to.',
     )
     parser.add_argument(
-        'format', type=str, choices=['csv', 'txt'],
-        help='Output format to use. One of the following: csv, txt.'
+        'format', type=str, choices=FORMATS,
+        help='Output format to use. One of the following: {}.'.format(', '.join(FORMATS))
+    )
+    parser.add_argument(
+        '--compression-level', type=int, default=None,
+        help='Compression level for json.gz (1-9) and json.zst (1-22) files. Defaults to the default of the method.'
     )
     parser.add_argument('--verbose', '-v', action='store_true', help='Show progress.')
 
     return parser.parse_args()
 
 
-def list_files(indir: Path, file_format: str) -> List[Path]:
-    return [p.relative_to(indir) for p in indir.rglob(f'*.{file_format}')]
+def list_files(indir: Path) -> List[Path]:
+    return [p.relative_to(indir) for p in find_dossier_files(indir)]
+
+
+def convert_file(input_file: Path, output_file: Path, out_format: str, compression_level: Optional[int] = None):
+    politician_dossier = PoliticianDossier.from_file(input_file)
+    if out_format in DOSSIER_FORMATS:
+        politician_dossier.dump_to_file(output_file, compression_level)
+    else:
+        with open_questions_answers_writer(output_file, out_format) as writer:
+            writer.write_all(politician_dossier.questions_answers.questions_answers)
 
 
 def main():
@@ -36,21 +54,22 @@ def main():
     outdir = args.outdir
     out_format = args.format
 
-    input_files = list_files(indir, 'json')
+    input_files = list_files(indir)
 
     outdir.mkdir(exist_ok=True, parents=True)
 
     if args.verbose:
+        from tqdm import tqdm
         input_files = tqdm(input_files)
 
     for input_file in input_files:
         input_file = indir / input_file
-        output_file = outdir / input_file.relative_to(indir).with_suffix('.' + out_format)
+        output_file = strip_dossier_suffix(outdir / input_file.relative_to(indir))
+        output_file = output_file.with_name(f'{output_file.name}.{out_format}')
 
         output_file.parent.mkdir(exist_ok=True, parents=True)
 
-        politician_dossier = PoliticianDossier.from_file(input_file)
-        save_answers_to_format(politician_dossier.questions_answers, output_file, out_format)
+        convert_file(input_file, output_file, out_format, args.compression_level)
 
 
 if __name__ == '__main__':
@@ -1,14 +1,37 @@
 import argparse
 import asyncio
+import datetime
+import multiprocessing
+import os
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from queue import Empty
+from typing import Optional, List, Tuple, AsyncIterator, TYPE_CHECKING
 
-import aiohttp
 from tqdm import tqdm
 
 from abgeordnetenwatch_python.models.parliament import get_parliament
 from abgeordnetenwatch_python.models.politicians import get_politician, get_default_filename
 from abgeordnetenwatch_python.models.politician_dossier import load_politician_dossier_with_cache_file
+from abgeordnetenwatch_python.change_feed import ChangeFeedWriter, get_change_feed_filename
+from abgeordnetenwatch_python.compression import FileCompression, add_compression_arguments, \
+    file_compression_from_args
+from abgeordnetenwatch_python.mandate_cache import MandateCache
+from abgeordnetenwatch_python.page_store import PageStore
+from abgeordnetenwatch_python.refresh_daemon import RefreshDaemon
+from abgeordnetenwatch_python.session import add_session_arguments, session_config_from_args, create_session, \
+    SessionConfig, get_session_summaries
+from abgeordnetenwatch_python.work_queue import WorkQueue, parse_shard, in_shard
+
+if TYPE_CHECKING:
+    import aiohttp
+
+
+def _shard_argument(shard: str) -> Tuple[int, int]:
+    try:
+        return parse_shard(shard)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
 
 
 def parse_args():
@@ -31,8 +54,67 @@ def parse_args():
         '--outdir', '-o', type=Path, default=Path('data') / 'json', help='The directory to save the file to.'
     )
     parser.add_argument('--quiet', '-q', action='store_true', help='Do not show progress.')
+    parser.add_argument(
+        '--shard', type=_shard_argument, default=None,
+        help='Only load the politicians of shard "i/n" (0 <= i < n), e.g. "0/4". Politicians are assigned to shards '
+             'by their id.'
+    )
+    parser.add_argument(
+        '--queue', type=Path, default=None,
+        help='SQLite file of a work queue shared with other processes or hosts. Politicians are claimed from this '
+             'queue, so every politician is loaded once. The queue is filled by a process started with --coordinator.'
+    )
+    parser.add_argument(
+        '--coordinator', action='store_true',
+        help='Refill the work queue given by --queue with the politicians of the parliament, then work on it.'
+    )
+    parser.add_argument(
+        '--claim-timeout', type=float, default=60 * 10,
+        help='Seconds after which a claimed politician of a crashed worker is given to another worker. Claims of '
+             'running workers are renewed. Defaults to 600.'
+    )
+    parser.add_argument(
+        '--processes', '-p', type=int, default=1,
+        help='Number of worker processes. Every process runs its own event loop and session with --threads '
+             'connections. Defaults to 1.'
+    )
+    parser.add_argument(
+        '--page-store', type=Path, default=None, metavar='DIR',
+        help='Store the html of all downloaded question pages compressed in this directory, so they can be parsed '
+             'again with "reparse_qa" without downloading them. Requires zstandard.'
+    )
+    parser.add_argument(
+        '--mandate-cache', type=Path, default=None, metavar='DIR',
+        help='Cache the politicians of every parliament period in this directory. Closed periods are only loaded once, '
+             'the running period is loaded again on every run.'
+    )
+    parser.add_argument(
+        '--change-feed', type=Path, default=None, metavar='DIR',
+        help='Write the new questions and answers of this run to "DIR/changes-<start time>.jsonl".'
+    )
+    parser.add_argument(
+        '--daemon', action='store_true',
+        help='Keep running and refresh the parliament continuously: poll the statistics of all politicians every '
+             '--poll-interval minutes and only load the politicians, whose number of questions or answers changed. '
+             'Use --requests-per-hour to limit the request volume.'
+    )
+    parser.add_argument(
+        '--poll-interval', type=float, default=15, help='Minutes between two polls with --daemon. Defaults to 15.'
+    )
+    parser.add_argument(
+        '--mandate-interval', type=float, default=24,
+        help='Hours between two lookups of the politicians of the parliament with --daemon. Defaults to 24.'
+    )
+    add_compression_arguments(parser)
+    add_session_arguments(parser)
 
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.coordinator and args.queue is None:
+        parser.error('--coordinator requires --queue')
+    if args.daemon and (args.queue is not None or args.processes > 1):
+        parser.error('--daemon can not be combined with --queue or --processes')
+    args.run_started = datetime.datetime.now()
+    return args
 
 
 async def async_main():
@@ -42,49 +124,191 @@ async def async_main():
 
     outdir: Path = args.outdir / args.parliament.lower()
     outdir.mkdir(exist_ok=True, parents=True)
+    compression = file_compression_from_args(args)
 
-    timeout = aiohttp.ClientTimeout(total=60 * 60 * 24 * 2)  # run 2 days max
-    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=args.threads), timeout=timeout) as session:
-        # load parliament
-        if verbose:
-            print('loading politicians to scan:')
-        parliament = await get_parliament(session, label=args.parliament)
-        politician_ids = await parliament.get_politician_ids(session, verbose=verbose)
-        if verbose:
-            print('found {} politicians'.format(len(politician_ids)))
-
-        # load politicians
-        queue = asyncio.Queue()
-        overall_progress = None
-        if verbose:
-            overall_progress = tqdm(desc='Progress', total=len(politician_ids))
-
-        for p_id in politician_ids:
-            await queue.put(p_id)
+    async with create_session(get_session_config(args), log=tqdm.write if verbose else None) as session, \
+            create_page_store(args) as page_store, \
+            create_change_feed(args) as change_feed:
+        if args.daemon:
+            daemon = RefreshDaemon(
+                session, args.parliament, outdir, threads=args.threads, sort_by=args.sort_by,
+                poll_interval=args.poll_interval * 60, mandate_interval=args.mandate_interval * 60 * 60,
+                shard=args.shard, mandate_cache=MandateCache(args.mandate_cache) if args.mandate_cache else None,
+                page_store=page_store, compression=compression, change_feed=change_feed,
+                log=tqdm.write if verbose else None
+            )
+            await daemon.run()
+            return
 
-        workers = [
-            asyncio.create_task(worker(session, queue, overall_progress, outdir, args.sort_by, verbose, args.threads))
-            for _ in range(args.threads)
-        ]
+        work_queue = None
+        if args.queue is not None:
+            work_queue = WorkQueue(args.queue, claim_timeout=args.claim_timeout)
+            if args.coordinator:
+                # workers must not work on the queue of the previous run, while the politicians are loaded
+                work_queue.reset()
 
-        await queue.join()
-        for w in workers:
-            w.cancel()
-        worker_errors = await asyncio.gather(*workers, return_exceptions=True)
+        politician_ids = []
+        if work_queue is None or args.coordinator:
+            # load parliament
+            if verbose:
+                print('loading politicians to scan:')
+            parliament = await get_parliament(session, label=args.parliament)
+            mandate_cache = MandateCache(args.mandate_cache) if args.mandate_cache is not None else None
+            politician_ids = await parliament.get_politician_ids(session, verbose=verbose, mandate_cache=mandate_cache)
+            if args.shard is not None:
+                politician_ids = [p_id for p_id in politician_ids if in_shard(p_id, args.shard)]
+            if verbose:
+                print('found {} politicians'.format(len(politician_ids)))
 
-        if overall_progress is not None:
-            overall_progress.close()
+        if work_queue is not None and args.coordinator:
+            work_queue.fill(politician_ids, reset=True)
 
-        errors = [e for worker_error in worker_errors for e in worker_error]
+        if args.processes > 1:
+            errors = await asyncio.to_thread(run_worker_processes, args, politician_ids, work_queue, verbose)
+        elif work_queue is not None:
+            errors = await load_from_work_queue(
+                session, work_queue, outdir, args.sort_by, verbose, args.threads, page_store, compression, change_feed
+            )
+        else:
+            errors = await load_politicians(
+                session, politician_ids, outdir, args.sort_by, verbose, args.threads, page_store, compression,
+                change_feed
+            )
 
         print(f'{len(errors)} errors occurred during loading')
         for e in errors:
             print(e)
+        # with several processes, every worker process reports its own statistics
+        if verbose and args.processes == 1:
+            for summary in get_session_summaries(session):
+                print(summary)
+
+
+def get_session_config(args: argparse.Namespace) -> SessionConfig:
+    return session_config_from_args(args, total_timeout=60 * 60 * 24 * 2)  # run 2 days max
+
+
+@asynccontextmanager
+async def create_change_feed(args: argparse.Namespace) -> AsyncIterator[Optional[ChangeFeedWriter]]:
+    if args.change_feed is None:
+        yield None
+        return
+    # all processes of a run write to the same file
+    with ChangeFeedWriter(get_change_feed_filename(args.change_feed, args.run_started)) as change_feed:
+        yield change_feed
+
+
+@asynccontextmanager
+async def create_page_store(args: argparse.Namespace) -> AsyncIterator[Optional[PageStore]]:
+    if args.page_store is None:
+        yield None
+        return
+    with PageStore(args.page_store) as page_store:
+        yield page_store
+
+
+async def load_politicians(
+        session: 'aiohttp.ClientSession', politician_ids: List[int], outdir: Path, sort_by: str, verbose: bool = False,
+        threads: int = 1, page_store: Optional[PageStore] = None,
+        compression: Optional[FileCompression] = None, change_feed: Optional[ChangeFeedWriter] = None
+) -> list:
+    queue = asyncio.Queue()
+    overall_progress = None
+    if verbose:
+        overall_progress = tqdm(desc='Progress', total=len(politician_ids))
+
+    for p_id in politician_ids:
+        await queue.put(p_id)
+
+    workers = [
+        asyncio.create_task(
+            worker(
+                session, queue, overall_progress, outdir, sort_by, verbose, threads, page_store, compression,
+                change_feed
+            )
+        )
+        for _ in range(threads)
+    ]
+
+    await queue.join()
+    for w in workers:
+        w.cancel()
+    worker_errors = await asyncio.gather(*workers, return_exceptions=True)
+
+    if overall_progress is not None:
+        overall_progress.close()
+
+    return [e for worker_error in worker_errors for e in worker_error]
+
+
+async def wait_until_filled(work_queue: WorkQueue, verbose: bool = False):
+    while not await asyncio.to_thread(work_queue.is_filled):
+        if verbose:
+            print(f'waiting for a coordinator to fill {work_queue.filename}')
+        await asyncio.sleep(10)
+
+
+def create_queue_progress(work_queue: WorkQueue) -> tqdm:
+    counts = work_queue.counts()
+    return tqdm(desc='Progress', total=sum(counts.values()), initial=counts.get(WorkQueue.DONE, 0))
+
+
+async def load_from_work_queue(
+        session: 'aiohttp.ClientSession', work_queue: WorkQueue, outdir: Path, sort_by: str, verbose: bool = False,
+        threads: int = 1, page_store: Optional[PageStore] = None,
+        compression: Optional[FileCompression] = None, change_feed: Optional[ChangeFeedWriter] = None
+) -> list:
+    await wait_until_filled(work_queue, verbose)
+
+    overall_progress = None
+    if verbose:
+        overall_progress = await asyncio.to_thread(create_queue_progress, work_queue)
+
+    workers = [
+        asyncio.create_task(
+            queue_worker(
+                session, work_queue, overall_progress, outdir, sort_by, verbose, threads, page_store, compression,
+                change_feed
+            )
+        )
+        for _ in range(threads)
+    ]
+    worker_errors = await asyncio.gather(*workers)
+
+    if overall_progress is not None:
+        overall_progress.close()
+
+    return [e for worker_error in worker_errors for e in worker_error]
+
+
+async def load_politician(
+        session: 'aiohttp.ClientSession', politician_id: int, outdir: Path, sort_by: str, verbose: bool = False,
+        threads: int = 1, page_store: Optional[PageStore] = None,
+        compression: Optional[FileCompression] = None, change_feed: Optional[ChangeFeedWriter] = None
+):
+    tqdm_obj = None
+    if verbose:
+        tqdm_obj = tqdm(desc=f"preparing {politician_id}", bar_format='{desc}', leave=None)
+        tqdm_obj.refresh()
+    politician = await get_politician(session, id=politician_id)
+    if verbose:
+        tqdm_obj.close()
+
+    filename = get_default_filename(politician, outdir, compression.method if compression else None)
+    tqdm_args = {
+        'leave': False, 'colour': '#777777'
+    }
+    await load_politician_dossier_with_cache_file(
+        politician, filename, session=session, threads=threads, url_threads=1, verbose=verbose, sort_by=sort_by,
+        tqdm_args=tqdm_args, page_store=page_store, compression_level=compression.level if compression else None,
+        change_feed=change_feed
+    )
 
 
 async def worker(
-        session: aiohttp.ClientSession, queue: asyncio.Queue, overall_progress: Optional[tqdm], outdir: Path,
-        sort_by: str, verbose: bool = False, threads: int = 1
+        session: 'aiohttp.ClientSession', queue: asyncio.Queue, overall_progress: Optional[tqdm], outdir: Path,
+        sort_by: str, verbose: bool = False, threads: int = 1, page_store: Optional[PageStore] = None,
+        compression: Optional[FileCompression] = None, change_feed: Optional[ChangeFeedWriter] = None
 ) -> list:
     errors = []
     while True:
@@ -94,27 +318,193 @@ async def worker(
             break
 
         try:
-            tqdm_obj = None
-            if verbose:
-                tqdm_obj = tqdm(desc=f"preparing {politician_id}", bar_format='{desc}', leave=None)
-                tqdm_obj.refresh()
-            politician = await get_politician(session, id=politician_id)
-            if verbose:
-                tqdm_obj.close()
-
-            filename = get_default_filename(politician, outdir)
-            tqdm_args = {
-                'leave': False, 'colour': '#777777'
-            }
-            await load_politician_dossier_with_cache_file(
-                politician, filename, session=session, threads=threads, url_threads=1, verbose=verbose, sort_by=sort_by,
-                tqdm_args=tqdm_args
+            await load_politician(
+                session, politician_id, outdir, sort_by, verbose, threads, page_store, compression, change_feed
             )
 
             if overall_progress is not None:
                 overall_progress.update(1)
-
+        except Exception as e:
+            print('failed to load politician {}'.format(politician_id))
+            print(e)
+            errors.append(e)
+        finally:
             queue.task_done()
+    return errors
+
+
+async def renew_claim(work_queue: WorkQueue, politician_id: int, load_task: asyncio.Task):
+    while True:
+        await asyncio.sleep(work_queue.claim_timeout / 3)
+        if not await asyncio.to_thread(work_queue.renew, politician_id):
+            # the claim expired and may be taken by another worker, which must not write the same file concurrently
+            load_task.cancel()
+            return
+
+
+async def queue_worker(
+        session: 'aiohttp.ClientSession', work_queue: WorkQueue, overall_progress: Optional[tqdm], outdir: Path,
+        sort_by: str, verbose: bool = False, threads: int = 1, page_store: Optional[PageStore] = None,
+        compression: Optional[FileCompression] = None, change_feed: Optional[ChangeFeedWriter] = None
+) -> list:
+    errors = []
+    while True:
+        politician_id = await asyncio.to_thread(work_queue.claim)
+        if politician_id is None:
+            break
+
+        load_task = asyncio.create_task(load_politician(
+            session, politician_id, outdir, sort_by, verbose, threads, page_store, compression, change_feed
+        ))
+        renew_task = asyncio.create_task(renew_claim(work_queue, politician_id, load_task))
+        try:
+            await load_task
+            await asyncio.to_thread(work_queue.complete, politician_id)
+
+            if overall_progress is not None:
+                overall_progress.update(1)
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                raise
+            print('lost the claim of politician {}, it is loaded by another worker'.format(politician_id))
+        except Exception as e:
+            print('failed to load politician {}'.format(politician_id))
+            print(e)
+            errors.append(e)
+            await asyncio.to_thread(work_queue.fail, politician_id, str(e))
+        finally:
+            renew_task.cancel()
+    return errors
+
+
+class ResultQueueProgress:
+    """
+    Forwards the progress of a worker process to the progress bar of the parent process.
+    """
+    def __init__(self, result_queue: multiprocessing.Queue):
+        self.result_queue = result_queue
+
+    def update(self, n: int = 1):
+        self.result_queue.put(('progress', n))
+
+
+def run_worker_processes(
+        args: argparse.Namespace, politician_ids: List[int], work_queue: Optional[WorkQueue], verbose: bool
+) -> list:
+    """
+    Loads the given politicians (or the politicians of the work queue) in `args.processes` worker processes and
+    collects their progress and errors.
+    """
+    context = multiprocessing.get_context('spawn')
+    politician_queue = context.Queue()
+    result_queue = context.Queue()
+    if work_queue is None:
+        for p_id in politician_ids:
+            politician_queue.put(p_id)
+        for _ in range(args.processes * args.threads):
+            politician_queue.put(None)
+
+    overall_progress = None
+    if verbose:
+        if work_queue is not None:
+            asyncio.run(wait_until_filled(work_queue, verbose))
+            overall_progress = create_queue_progress(work_queue)
+        else:
+            overall_progress = tqdm(desc='Progress', total=len(politician_ids))
+
+    processes = [
+        context.Process(target=process_main, args=(politician_queue, result_queue, args))
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    errors = []
+    num_finished = 0
+    while num_finished < len(processes):
+        try:
+            kind, value = result_queue.get(timeout=1)
+        except Empty:
+            if not any(process.is_alive() for process in processes):
+                break
+            continue
+        if kind == 'progress':
+            if overall_progress is not None:
+                overall_progress.update(value)
+        elif kind == 'errors':
+            errors.extend(value)
+            num_finished += 1
+
+    for process in processes:
+        process.join()
+        if process.exitcode != 0:
+            errors.append(f'worker process {process.pid} exited with code {process.exitcode}')
+
+    if overall_progress is not None:
+        overall_progress.close()
+
+    return errors
+
+
+def process_main(
+        politician_queue: multiprocessing.Queue, result_queue: multiprocessing.Queue, args: argparse.Namespace
+):
+    errors = asyncio.run(async_process_main(politician_queue, result_queue, args))
+    # exceptions are sent as text, as they are not necessarily picklable
+    result_queue.put(('errors', [str(e) for e in errors]))
+
+
+async def async_process_main(
+        politician_queue: multiprocessing.Queue, result_queue: multiprocessing.Queue, args: argparse.Namespace
+) -> list:
+    outdir: Path = args.outdir / args.parliament.lower()
+    compression = file_compression_from_args(args)
+    overall_progress = ResultQueueProgress(result_queue)
+    log = tqdm.write if not args.quiet else None
+    async with create_session(get_session_config(args), log=log) as session, create_page_store(args) as page_store, \
+            create_change_feed(args) as change_feed:
+        if args.queue is not None:
+            work_queue = WorkQueue(args.queue, claim_timeout=args.claim_timeout)
+            await wait_until_filled(work_queue)
+            workers = [
+                queue_worker(
+                    session, work_queue, overall_progress, outdir, args.sort_by, False, args.threads, page_store,
+                    compression, change_feed
+                )
+                for _ in range(args.threads)
+            ]
+        else:
+            workers = [
+                process_queue_worker(
+                    session, politician_queue, overall_progress, outdir, args.sort_by, args.threads, page_store,
+                    compression, change_feed
+                )
+                for _ in range(args.threads)
+            ]
+        worker_errors = await asyncio.gather(*workers)
+        if log is not None:
+            for summary in get_session_summaries(session):
+                log(f'process {os.getpid()}: {summary}')
+    return [e for worker_error in worker_errors for e in worker_error]
+
+
+async def process_queue_worker(
+        session: 'aiohttp.ClientSession', politician_queue: multiprocessing.Queue,
+        overall_progress: ResultQueueProgress, outdir: Path, sort_by: str, threads: int = 1,
+        page_store: Optional[PageStore] = None,
+        compression: Optional[FileCompression] = None, change_feed: Optional[ChangeFeedWriter] = None
+) -> list:
+    errors = []
+    while True:
+        politician_id = await asyncio.to_thread(politician_queue.get)
+        if politician_id is None:
+            break
+
+        try:
+            await load_politician(
+                session, politician_id, outdir, sort_by, False, threads, page_store, compression, change_feed
+            )
+            overall_progress.update(1)
         except Exception as e:
             print('failed to load politician {}'.format(politician_id))
             print(e)
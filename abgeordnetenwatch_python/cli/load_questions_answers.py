@@ -1,14 +1,22 @@
 import argparse
 import asyncio
+import datetime
 import sys
 from pathlib import Path
-from typing import List
-
-import aiohttp
+from typing import List, Union, Optional, TYPE_CHECKING
 
 from abgeordnetenwatch_python.models import politicians
 from abgeordnetenwatch_python.models.politicians import get_default_filename
 from abgeordnetenwatch_python.models.politician_dossier import load_politician_dossier_with_cache_file
+from abgeordnetenwatch_python.change_feed import ChangeFeedWriter, get_change_feed_filename
+from abgeordnetenwatch_python.compression import add_compression_arguments, file_compression_from_args
+from abgeordnetenwatch_python.page_store import PageStore
+from abgeordnetenwatch_python.politician_directory import PoliticianDirectory, DirectoryEntry
+from abgeordnetenwatch_python.session import add_session_arguments, session_config_from_args, create_session, \
+    get_session_summaries
+
+if TYPE_CHECKING:
+    import aiohttp
 
 
 def parse_args():
@@ -20,6 +28,16 @@ def parse_args():
     parser.add_argument('--firstname', '-fn', type=str, help='Firstname of the politician to search for.')
     parser.add_argument('--lastname', '-ln', type=str, help='Lastname of the politician to search for.')
     # parser.add_argument('--party', '-p', type=str, help='Party of the politician to search for')
+    parser.add_argument(
+        '--directory', type=Path, default=None, metavar='FILE',
+        help='Resolve --firstname and --lastname typo-tolerant with the local politician directory in this file '
+             '(e.g. data/politicians.json.gz) instead of the api. The directory is downloaded, if it does not exist.'
+    )
+    parser.add_argument(
+        '--sync-directory', type=str, default=None, choices=['new', 'all'],
+        help='Update the politician directory before resolving the name: "new" downloads the politicians added since '
+             'the last sync, "all" downloads all politicians again.'
+    )
 
     parser.add_argument(
         '--sort-by', type=str, default='question', choices=['answer', 'question'],
@@ -36,11 +54,30 @@ def parse_args():
         '--outdir', '-o', type=Path, default=Path('data') / 'json', help='The directory to save the file to.'
     )
     parser.add_argument('--quiet', '-q', action='store_true', help='Do not show progress.')
+    parser.add_argument(
+        '--page-store', type=Path, default=None, metavar='DIR',
+        help='Store the html of all downloaded question pages compressed in this directory, so they can be parsed '
+             'again with "reparse_qa" without downloading them. Requires zstandard.'
+    )
+    parser.add_argument(
+        '--change-feed', type=Path, default=None, metavar='DIR',
+        help='Write the new questions and answers of this run to "DIR/changes-<start time>.jsonl".'
+    )
+    add_compression_arguments(parser)
+    add_session_arguments(parser)
 
     return parser, parser.parse_args()
 
 
-def choose_from_list(politician_list: List[politicians.Politician]) -> politicians.Politician:
+def write_message(message: str):
+    # without breaking the progress bars
+    from tqdm import tqdm
+    tqdm.write(message)
+
+
+def choose_from_list(
+        politician_list: List[Union[politicians.Politician, DirectoryEntry]]
+) -> Union[politicians.Politician, DirectoryEntry]:
     selected_politician = None
     print('found multiple politicians:')
     while selected_politician is None:
@@ -60,6 +97,35 @@ def choose_from_list(politician_list: List[politicians.Politician]) -> politicia
     return selected_politician
 
 
+async def find_in_directory(
+        session: 'aiohttp.ClientSession', args: argparse.Namespace
+) -> Optional[politicians.Politician]:
+    """
+    Resolves the name with the local politician directory without api calls. The chosen politician is still requested
+    from the api by id: the directory does not keep the current number of questions and answers of a politician, which
+    decides, which cached questions can be skipped. The questions are downloaded anyway, so this is one more request
+    instead of a name search in the api.
+
+    :return: The chosen politician with current statistics, None if no politician matches the name.
+    """
+    directory = PoliticianDirectory(args.directory)
+    if args.sync_directory is not None or len(directory) == 0:
+        num_politicians = await directory.sync(session, full=args.sync_directory == 'all')
+        if not args.quiet:
+            print(f'synced {num_politicians} politicians to {args.directory}')
+
+    results = directory.find(first_name=args.firstname, last_name=args.lastname)
+    if len(results) == 0:
+        return None
+    elif len(results) == 1:
+        entry = results[0].entry
+        if results[0].score < 1.0:
+            print(f'no exact match, using {entry.get_full_name()} {entry.id} ({entry.party or "unknown"})')
+    else:
+        entry = choose_from_list([r.entry for r in results])
+    return await politicians.get_politician(session, id=entry.id)
+
+
 async def async_main():
     parser, args = parse_args()
     outdir: Path = args.outdir
@@ -78,26 +144,46 @@ async def async_main():
         print('Please provide --id --firstname or --lastname')
         sys.exit(1)
 
-    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=args.threads)) as session:
-        politician_search_result = await politicians.get_politicians(session=session, **filter_args)
-        if len(politician_search_result) == 0:
-            print('no politician found with the given arguments')
-            return
-        elif len(politician_search_result) == 1:
-            politician = politician_search_result[0]
+    async with create_session(session_config_from_args(args), log=write_message if verbose else None) as session:
+        if args.directory is not None and args.id is None:
+            politician = await find_in_directory(session, args)
+            if politician is None:
+                print('no politician found with the given arguments')
+                return
         else:
-            politician = choose_from_list(politician_search_result)
+            politician_search_result = await politicians.get_politicians(session=session, **filter_args)
+            if len(politician_search_result) == 0:
+                print('no politician found with the given arguments')
+                return
+            elif len(politician_search_result) == 1:
+                politician = politician_search_result[0]
+            else:
+                politician = choose_from_list(politician_search_result)
 
         if verbose:
             print(f'Downloading {politician.first_name} {politician.last_name} {politician.id}')
 
-        filename = get_default_filename(politician, outdir)
-        await load_politician_dossier_with_cache_file(
-            politician, filename, session=session, sort_by=args.sort_by, verbose=verbose, threads=args.threads
-        )
+        compression = file_compression_from_args(args)
+        filename = get_default_filename(politician, outdir, compression.method)
+        page_store = PageStore(args.page_store) if args.page_store is not None else None
+        change_feed = None
+        if args.change_feed is not None:
+            change_feed = ChangeFeedWriter(get_change_feed_filename(args.change_feed, datetime.datetime.now()))
+        try:
+            await load_politician_dossier_with_cache_file(
+                politician, filename, session=session, sort_by=args.sort_by, verbose=verbose, threads=args.threads,
+                page_store=page_store, compression_level=compression.level, change_feed=change_feed
+            )
+        finally:
+            if page_store is not None:
+                page_store.close()
+            if change_feed is not None:
+                change_feed.close()
 
     if verbose:
         print(f'Saved {str(politician)} to {filename}')
+        for summary in get_session_summaries(session):
+            print(summary)
 
 
 def main():
@@ -0,0 +1,102 @@
+import argparse
+import json
+from pathlib import Path
+from typing import Dict
+
+from abgeordnetenwatch_python.corpus.loader import DossierLoader
+from abgeordnetenwatch_python.corpus.near_duplicates import NearDuplicateIndex, summarize_clusters
+from abgeordnetenwatch_python.models.politicians import Politician
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Find questions, that were sent to several politicians with nearly the same text, and show their '
+                    'answer rates. Requires numpy.'
+    )
+    parser.add_argument(
+        'datadir', type=Path, nargs='?', default=Path('data') / 'json',
+        help='The directory with the dossiers (searched recursively). Defaults to data/json.'
+    )
+    parser.add_argument(
+        '--index', type=Path, default=None,
+        help='Load the index from this file, if it exists, add the new questions and save it again. Only new '
+             'questions are hashed.'
+    )
+    parser.add_argument(
+        '--threshold', type=float, default=None,
+        help='Minimal estimated Jaccard similarity of the word 3-grams of near-duplicates. Defaults to 0.8.'
+    )
+    parser.add_argument(
+        '--bands', type=int, default=16, help='Number of LSH bands of a new index. Must divide 128. Defaults to 16.'
+    )
+    parser.add_argument('--min-size', type=int, default=5, help='Minimal number of questions of a cluster.')
+    parser.add_argument(
+        '--output', '-o', type=Path, default=None,
+        help='Write all clusters with their politicians and questions to this jsonl file.'
+    )
+    parser.add_argument('--top', type=int, default=20, help='Number of clusters to print. Defaults to 20.')
+    parser.add_argument('--quiet', '-q', action='store_true', help='Do not show progress.')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    verbose = not args.quiet
+
+    if args.index is not None and args.index.is_file():
+        index = NearDuplicateIndex.load(args.index, threshold=args.threshold)
+    else:
+        index = NearDuplicateIndex(bands=args.bands, threshold=args.threshold or 0.8)
+    old_size = len(index)
+
+    politicians: Dict[int, Politician] = {}
+    questions: Dict[str, str] = {}
+    dossiers = DossierLoader(args.datadir, use_processes=True)
+    if verbose:
+        from tqdm import tqdm
+        dossiers = tqdm(dossiers, desc='indexing')
+    for _path, dossier in dossiers:
+        politicians[dossier.politician.id] = dossier.politician
+        for qa in dossier.questions_answers.questions_answers:
+            if qa.url is not None and qa.question is not None:
+                questions[qa.url] = qa.question
+        index.add_dossier(dossier)
+    if verbose:
+        print(f'indexed {len(index) - old_size} new questions, {len(index)} questions in total')
+
+    if args.index is not None:
+        index.save(args.index)
+
+    clusters = summarize_clusters(index, index.get_clusters(args.min_size))
+    print(f'{len(clusters)} clusters with at least {args.min_size} questions')
+    for cluster in clusters[:args.top]:
+        first = index.records[cluster.record_indices[0]]
+        print('{:>5} questions  {:>5} politicians  answer rate {:>4.0%}  {}'.format(
+            cluster.questions, cluster.politicians, cluster.answer_rate, questions.get(first.url, first.url)[:80]
+        ))
+
+    if args.output is not None:
+        args.output.parent.mkdir(exist_ok=True, parents=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            for cluster in clusters:
+                records = [index.records[i] for i in cluster.record_indices]
+                entries = []
+                for record in records:
+                    politician = politicians.get(record.politician_id)
+                    entries.append({
+                        'politician_id': record.politician_id,
+                        'name': politician.get_full_name() if politician is not None else None,
+                        'party': politician.party.label if politician is not None and politician.party else None,
+                        'url': record.url,
+                        'answered': record.answered,
+                    })
+                data = {
+                    'questions': cluster.questions, 'politicians': cluster.politicians, 'answered': cluster.answered,
+                    'answer_rate': cluster.answer_rate, 'question': questions.get(records[0].url),
+                    'entries': entries,
+                }
+                f.write(json.dumps(data, ensure_ascii=False) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+import argparse
+import csv
+import sys
+from pathlib import Path
+
+from abgeordnetenwatch_python.corpus.qa_stats import QAStats, GROUP_KEYS, BUCKETS
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Compute answer rates and response times of downloaded questions/answers. Requires numpy.'
+    )
+    parser.add_argument(
+        'datadir', type=Path, nargs='?', default=Path('data') / 'json',
+        help='The directory with the dossiers (searched recursively). Defaults to data/json.'
+    )
+    parser.add_argument(
+        '--group-by', '-g', type=str, default='party', choices=GROUP_KEYS,
+        help='Group the questions by politician, party, parliament (directory of the dossier) or not at all. '
+             'Defaults to party.'
+    )
+    parser.add_argument(
+        '--buckets', '-b', type=str, default=None, choices=list(BUCKETS),
+        help='Count the questions per group and year, month, week or day of the question instead.'
+    )
+    parser.add_argument(
+        '--compare-statistics', action='store_true',
+        help='List the politicians, where the number of downloaded questions and answers differs from the statistics '
+             'of abgeordnetenwatch.de.'
+    )
+    parser.add_argument('--csv', type=Path, default=None, help='Write the table to this csv file instead of stdout.')
+    parser.add_argument(
+        '--limit', type=int, default=-1, help='The maximal number of dossiers to load. Defaults to all.'
+    )
+    return parser.parse_args()
+
+
+def _format(value: float) -> str:
+    return '' if value != value else f'{value:.3f}'.rstrip('0').rstrip('.')
+
+
+def get_table(stats: QAStats, args):
+    if args.compare_statistics:
+        comparison = stats.compare_statistics()
+        header = [
+            'politician_id', 'name', 'statistic_questions', 'observed_questions', 'statistic_answered',
+            'observed_answered'
+        ]
+        rows = [
+            [
+                comparison.politicians[i].id, comparison.politicians[i].get_full_name(),
+                comparison.statistic_questions[i], comparison.observed_questions[i],
+                comparison.statistic_answered[i], comparison.observed_answered[i]
+            ]
+            for i in comparison.get_mismatches()
+        ]
+    elif args.buckets is not None:
+        counts = stats.bucket_counts(args.group_by, args.buckets)
+        header = [args.group_by, args.buckets, 'questions', 'answered']
+        groups, buckets = counts.questions.nonzero()
+        rows = [
+            [counts.labels[g], str(counts.buckets[b]), counts.questions[g, b], counts.answered[g, b]]
+            for g, b in zip(groups, buckets)
+        ]
+    else:
+        group_stats = stats.group_stats(args.group_by)
+        header = [args.group_by, 'questions', 'answered', 'answer_rate', 'median_days', 'p90_days']
+        rows = [
+            [
+                label, group_stats.questions[i], group_stats.answered[i], _format(group_stats.answer_rate[i]),
+                _format(group_stats.median_latency[i]), _format(group_stats.p90_latency[i])
+            ]
+            for i, label in enumerate(group_stats.labels)
+        ]
+    return header, rows
+
+
+def main():
+    args = parse_args()
+    stats = QAStats.from_directory(args.datadir, limit=args.limit, use_processes=True)
+    header, rows = get_table(stats, args)
+
+    if args.csv is not None:
+        args.csv.parent.mkdir(exist_ok=True, parents=True)
+        with open(args.csv, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+    else:
+        writer = csv.writer(sys.stdout, delimiter='\t')
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+if __name__ == '__main__':
+    main()
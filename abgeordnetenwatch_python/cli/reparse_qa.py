@@ -0,0 +1,126 @@
+import argparse
+import concurrent.futures
+import os
+from pathlib import Path
+from typing import List, Dict
+
+from tqdm import tqdm
+
+from abgeordnetenwatch_python.corpus.loader import DossierLoader
+from abgeordnetenwatch_python.models.questions_answers import QuestionAnswerResult
+from abgeordnetenwatch_python.page_store import PageStore, PageStoreEntry
+from abgeordnetenwatch_python.questions_answers.load_qa import parse_question_answer
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Parse the question pages of a page store (see --page-store of load_parliament_qa) again and '
+                    'update the downloaded dossiers. Useful after a bug in the parser was fixed.'
+    )
+    parser.add_argument('store', type=Path, help='The directory of the page store.')
+    parser.add_argument(
+        '--datadir', '-d', type=Path, default=Path('data') / 'json',
+        help='The directory with the dossiers to update (searched recursively). Defaults to data/json.'
+    )
+    parser.add_argument(
+        '--processes', '-p', type=int, default=None,
+        help='Number of processes used for parsing. Defaults to the number of cpus.'
+    )
+    parser.add_argument(
+        '--batch-size', type=int, default=500, help='Number of pages parsed by a process at once. Defaults to 500.'
+    )
+    parser.add_argument('--dry-run', action='store_true', help='Only report the changes, do not write any files.')
+    parser.add_argument('--quiet', '-q', action='store_true', help='Do not show progress.')
+    return parser.parse_args()
+
+
+def reparse_pages(directory: Path, entries: List[PageStoreEntry]) -> List[QuestionAnswerResult]:
+    """
+    Parses the given pages of a page store. Runs in a worker process.
+    """
+    results = []
+    with PageStore(directory) as page_store:
+        for entry, content in page_store.iter_pages(entries):
+            result = QuestionAnswerResult(url=entry.url)
+            try:
+                parse_question_answer(content, result)
+            except Exception as e:
+                result.errors.append(f'Parsing stored page of "{entry.url}" failed: {e}')
+            results.append(result)
+    return results
+
+
+def reparse_store(
+        directory: Path, processes: int, batch_size: int, verbose: bool = False
+) -> Dict[str, QuestionAnswerResult]:
+    """
+    Parses the newest version of every page in the page store in parallel.
+
+    :return: The results by url.
+    """
+    # batches of neighbouring pages, so every process reads its segment sequentially
+    entries = sorted(PageStore(directory).get_latest_entries(), key=lambda e: (e.segment, e.offset))
+    batches = [entries[i:i + batch_size] for i in range(0, len(entries), batch_size)]
+
+    results: Dict[str, QuestionAnswerResult] = {}
+    pbar = tqdm(desc='parsing', total=len(entries)) if verbose else None
+    with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [executor.submit(reparse_pages, directory, batch) for batch in batches]
+        for future in concurrent.futures.as_completed(futures):
+            batch_results = future.result()
+            results.update((result.url, result) for result in batch_results)
+            if pbar is not None:
+                pbar.update(len(batch_results))
+    if pbar is not None:
+        pbar.close()
+    return results
+
+
+def should_replace(old: QuestionAnswerResult, new: QuestionAnswerResult) -> bool:
+    """
+    :param old: The question of a dossier.
+    :param new: The question parsed from the newest stored page.
+    :return: True, if the question of the dossier should be replaced by the parsed one.
+    """
+    if new.errors:
+        return False
+    # the dossier may be newer than the stored page, e.g. when the answer was loaded by a run without page store. An
+    # answer is never replaced by an older, unanswered version of the page.
+    if old.answer is not None and new.answer is None:
+        return False
+    return old.model_dump(exclude={'errors'}) != new.model_dump(exclude={'errors'})
+
+
+def main():
+    args = parse_args()
+    verbose = not args.quiet
+    processes = args.processes or os.cpu_count() or 1
+
+    results = reparse_store(args.store, processes, args.batch_size, verbose)
+    if verbose:
+        print(f'parsed {len(results)} pages')
+
+    num_dossiers = 0
+    num_questions = 0
+    loader = DossierLoader(args.datadir, workers=processes, use_processes=True)
+    for path, dossier in tqdm(loader, desc='updating', disable=not verbose):
+        if dossier is None:
+            continue
+        changed = 0
+        questions_answers = dossier.questions_answers.questions_answers
+        for index, qa in enumerate(questions_answers):
+            result = results.get(qa.url)
+            if result is not None and should_replace(qa, result):
+                questions_answers[index] = result
+                changed += 1
+        if changed:
+            num_dossiers += 1
+            num_questions += changed
+            if not args.dry_run:
+                dossier.dump_to_file(path)
+
+    print(f'{"would update" if args.dry_run else "updated"} {num_questions} questions in {num_dossiers} dossiers')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+import argparse
+import asyncio
+from pathlib import Path
+
+from abgeordnetenwatch_python.politician_directory import PoliticianDirectory, FIELDS
+from abgeordnetenwatch_python.session import create_session
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Search politicians typo-tolerant by name, party or residence in a local copy of all politicians '
+                    'of abgeordnetenwatch.de.'
+    )
+    parser.add_argument('query', type=str, nargs='?', default=None, help='The text to search for, e.g. "merk".')
+    parser.add_argument(
+        '--field', type=str, default='name', choices=FIELDS, help='The field to search. Defaults to name.'
+    )
+    parser.add_argument(
+        '--directory', type=Path, default=Path('data') / 'politicians.json.gz', metavar='FILE',
+        help='The file of the politician directory. It is downloaded, if it does not exist. Defaults to '
+             'data/politicians.json.gz.'
+    )
+    parser.add_argument(
+        '--sync', type=str, default=None, choices=['new', 'all'],
+        help='Update the directory first: "new" downloads the politicians added since the last sync, "all" downloads '
+             'all politicians again.'
+    )
+    parser.add_argument('--limit', type=int, default=10, help='Maximal number of results. Defaults to 10.')
+    return parser.parse_args()
+
+
+async def async_main():
+    args = parse_args()
+    directory = PoliticianDirectory(args.directory)
+    if args.sync is not None or len(directory) == 0:
+        async with create_session() as session:
+            num_politicians = await directory.sync(session, full=args.sync == 'all')
+        print(f'synced {num_politicians} politicians, {len(directory)} politicians in {args.directory}')
+
+    if args.query is None:
+        return
+    for result in directory.search(args.query, field=args.field, limit=args.limit):
+        entry = result.entry
+        print('{:>7}  {:<40} {:<20} {:<25} {:.2f}'.format(
+            entry.id, entry.get_full_name(), entry.party or '', entry.residence or '', result.score
+        ))
+
+
+def main():
+    asyncio.run(async_main())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+from pathlib import Path
+from typing import Optional, List, Iterable, Callable, AsyncIterator, TYPE_CHECKING
+
+from abgeordnetenwatch_python.cache import CacheInfo, CacheIndex
+from abgeordnetenwatch_python.change_feed import ChangeFeedWriter
+from abgeordnetenwatch_python.mandate_cache import MandateCache
+from abgeordnetenwatch_python.models.candidacy_mandate import CandidacyMandate, get_candidacy_mandates
+from abgeordnetenwatch_python.models.parliament import Parliament, get_parliaments, get_parliament
+from abgeordnetenwatch_python.models.parliament_period import ParliamentPeriod, get_parliament_periods, \
+    get_parliament_period
+from abgeordnetenwatch_python.models.politician_dossier import PoliticianDossier, load_politician_dossier, \
+    iter_politician_dossier, load_politician_dossier_with_cache_file
+from abgeordnetenwatch_python.models.politicians import Politician, get_politicians, get_politician, \
+    get_politicians_by_ids
+from abgeordnetenwatch_python.models.questions_answers import QuestionsAnswers, QuestionAnswerResult, TqdmArgs
+from abgeordnetenwatch_python.page_store import PageStore
+from abgeordnetenwatch_python.session import SessionConfig, create_session, get_session_summaries
+
+if TYPE_CHECKING:
+    import aiohttp
+
+    from abgeordnetenwatch_python.questions_answers.writers import QuestionsAnswersWriter
+
+
+class AbgeordnetenwatchClient:
+    """
+    Owns a session with its connection pool and performance layers (request budget, adaptive concurrency, retries and
+    hedging, see `SessionConfig`) together with the caches, and shares them across all calls. A long-lived service
+    keeps one client, so the learned concurrency limit, the latencies for hedging, the request budget and the open
+    connections are reused by every request instead of starting cold.
+
+    All model getters and loaders are available as methods, which take the same arguments as the functions without the
+    session.
+
+    Usage:
+        async with AbgeordnetenwatchClient(
+                SessionConfig(limit=8, adaptive_concurrency=True, retries=3),
+                mandate_cache=MandateCache(Path('data/cache/mandates'))
+        ) as client:
+            parliament = await client.get_parliament(label='Bundestag')
+            politician_ids = await client.get_politician_ids(parliament)
+            for politician in await client.get_politicians_by_ids(politician_ids[:10]):
+                dossier = await client.load_politician_dossier(politician, threads=8)
+            print('\\n'.join(client.get_summaries()))
+    """
+    def __init__(
+            self, config: Optional[SessionConfig] = None, mandate_cache: Optional[MandateCache] = None,
+            page_store: Optional[PageStore] = None, log: Optional[Callable[[str], None]] = None,
+            session: Optional['aiohttp.ClientSession'] = None, **kwargs
+    ):
+        """
+        :param config: The settings of the session. If None, the defaults are used.
+        :param mandate_cache: If given, the mandates of closed parliament periods are taken from this cache.
+        :param page_store: If given, the html of every downloaded question page is stored in it.
+        :param log: Called with messages about changes of the adaptive concurrency limit.
+        :param session: Use this session instead of creating one. It is closed with the client.
+        :param kwargs: Additional arguments for aiohttp.ClientSession.
+        """
+        self.config = config if config is not None else SessionConfig()
+        self.mandate_cache = mandate_cache
+        self.page_store = page_store
+        self.log = log
+        self._session = session
+        self._session_kwargs = kwargs
+
+    @property
+    def session(self) -> 'aiohttp.ClientSession':
+        """
+        The session of the client. It is created on first use, which has to be inside a running event loop.
+        """
+        if self._session is None:
+            self._session = create_session(self.config, log=self.log, **self._session_kwargs)
+        return self._session
+
+    def get_summaries(self) -> List[str]:
+        """
+        :return: The statistics of the performance layers of the session, e.g. the number of retries.
+        """
+        return get_session_summaries(self._session) if self._session is not None else []
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> 'AbgeordnetenwatchClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def get_politicians(
+            self, id: Optional[int] = None, first_name: Optional[str] = None, last_name: Optional[str] = None,
+            party: Optional[str] = None, residence: Optional[str] = None
+    ) -> List[Politician]:
+        return await get_politicians(self.session, id, first_name, last_name, party, residence)
+
+    async def get_politician(
+            self, id: Optional[int] = None, first_name: Optional[str] = None, last_name: Optional[str] = None,
+            party: Optional[str] = None, residence: Optional[str] = None
+    ) -> Politician:
+        return await get_politician(self.session, id, first_name, last_name, party, residence)
+
+    async def get_politicians_by_ids(self, ids: Iterable[int], batch_size: int = 100) -> List[Politician]:
+        return await get_politicians_by_ids(self.session, ids, batch_size)
+
+    async def get_parliaments(self, id: Optional[int] = None, label: Optional[str] = None) -> List[Parliament]:
+        return await get_parliaments(self.session, id, label)
+
+    async def get_parliament(self, id: Optional[int] = None, label: Optional[str] = None) -> Parliament:
+        return await get_parliament(self.session, id, label)
+
+    async def get_politician_ids(self, parliament: Parliament, verbose: bool = False) -> List[int]:
+        """
+        :return: The sorted ids of all politicians with a mandate in a legislature of the parliament. The mandates of
+                 closed periods are taken from the mandate cache of the client.
+        """
+        return await parliament.get_politician_ids(self.session, verbose=verbose, mandate_cache=self.mandate_cache)
+
+    async def get_parliament_periods(
+            self, id: Optional[int] = None, parliament_id: Optional[int] = None, limit: int = 100
+    ) -> List[ParliamentPeriod]:
+        return await get_parliament_periods(self.session, id, parliament_id, limit)
+
+    async def get_parliament_period(
+            self, id: Optional[int] = None, parliament_id: Optional[int] = None, limit: int = 100
+    ) -> ParliamentPeriod:
+        return await get_parliament_period(self.session, id, parliament_id, limit)
+
+    async def get_candidacy_mandates(
+            self, id: Optional[int] = None, politician_id: Optional[int] = None,
+            parliament_period_id: Optional[int] = None, limit: int = 100
+    ) -> List[CandidacyMandate]:
+        return await get_candidacy_mandates(self.session, id, politician_id, parliament_period_id, limit)
+
+    async def load_questions_answers(
+            self, politician_url: str, verbose: bool = False, threads: int = 1, url_threads: int = -1,
+            cache_info: Optional[CacheInfo] = None, tqdm_args: TqdmArgs = None, politician_name: Optional[str] = None,
+            sink: Optional['QuestionsAnswersWriter'] = None
+    ) -> QuestionsAnswers:
+        from abgeordnetenwatch_python.questions_answers.load_qa import load_questions_answers
+        return await load_questions_answers(
+            politician_url, self.session, verbose=verbose, threads=threads, url_threads=url_threads,
+            cache_info=cache_info, tqdm_args=tqdm_args, politician_name=politician_name, sink=sink,
+            page_store=self.page_store
+        )
+
+    async def iter_questions_answers(
+            self, politician_url: str, threads: int = 1, url_threads: int = -1, cache_info: Optional[CacheInfo] = None
+    ) -> AsyncIterator[QuestionAnswerResult]:
+        from abgeordnetenwatch_python.questions_answers.load_qa import iter_questions_answers
+        async for result in iter_questions_answers(
+                politician_url, self.session, threads=threads, url_threads=url_threads, cache_info=cache_info,
+                page_store=self.page_store
+        ):
+            yield result
+
+    async def load_politician_dossier(
+            self, politician: Politician, cache: Optional[PoliticianDossier] = None, verbose: bool = False,
+            threads: int = 1, url_threads: int = -1, tqdm_args: TqdmArgs = None,
+            cache_index: Optional[CacheIndex] = None
+    ) -> PoliticianDossier:
+        return await load_politician_dossier(
+            politician, self.session, cache=cache, verbose=verbose, threads=threads, url_threads=url_threads,
+            tqdm_args=tqdm_args, page_store=self.page_store, cache_index=cache_index
+        )
+
+    async def iter_politician_dossier(
+            self, politician: Politician, cache: Optional[PoliticianDossier] = None, threads: int = 1,
+            url_threads: int = -1
+    ) -> AsyncIterator[QuestionAnswerResult]:
+        async for result in iter_politician_dossier(
+                politician, self.session, cache=cache, threads=threads, url_threads=url_threads,
+                page_store=self.page_store
+        ):
+            yield result
+
+    async def load_politician_dossier_with_cache_file(
+            self, politician: Politician, filename: Path, sort_by: Optional[str] = None, verbose: bool = False,
+            threads: int = 1, url_threads: int = -1, tqdm_args: TqdmArgs = None,
+            compression_level: Optional[int] = None, change_feed: Optional[ChangeFeedWriter] = None
+    ):
+        await load_politician_dossier_with_cache_file(
+            politician, filename, self.session, sort_by=sort_by, verbose=verbose, threads=threads,
+            url_threads=url_threads, tqdm_args=tqdm_args, page_store=self.page_store,
+            compression_level=compression_level, change_feed=change_feed
+        )
@@ -0,0 +1,109 @@
+import argparse
+import gzip
+from pathlib import Path
+from typing import Optional, IO, List, Iterable
+
+from pydantic import BaseModel
+
+
+# file suffix per compression method. None means uncompressed.
+COMPRESSION_SUFFIXES = {None: '', 'gzip': '.gz', 'zstd': '.zst'}
+COMPRESSION_METHODS = [method for method in COMPRESSION_SUFFIXES if method is not None]
+DOSSIER_SUFFIXES = [f'.json{suffix}' for suffix in COMPRESSION_SUFFIXES.values()]
+
+
+class FileCompression(BaseModel):
+    """
+    How dossier files are written.
+    """
+    # one of COMPRESSION_METHODS or None for uncompressed files
+    method: Optional[str] = None
+    # compression level of the method. None uses the default of the method.
+    level: Optional[int] = None
+
+    def get_suffix(self) -> str:
+        return COMPRESSION_SUFFIXES[self.method]
+
+
+def get_compression_method(filename: Path) -> Optional[str]:
+    """
+    :return: The compression method of the given file by its suffix or None, if it is not compressed.
+    """
+    for method, suffix in COMPRESSION_SUFFIXES.items():
+        if method is not None and filename.name.endswith(suffix):
+            return method
+    return None
+
+
+def is_dossier_file(filename: Path) -> bool:
+    return any(filename.name.endswith(suffix) for suffix in DOSSIER_SUFFIXES)
+
+
+def strip_dossier_suffix(filename: Path) -> Path:
+    """
+    :return: The filename without ".json" and the suffix of the compression, e.g. "a/b.json.zst" -> "a/b".
+    """
+    for suffix in sorted(DOSSIER_SUFFIXES, key=len, reverse=True):
+        if filename.name.endswith(suffix):
+            return filename.with_name(filename.name[:-len(suffix)])
+    return filename
+
+
+def get_dossier_file_variants(filename: Path) -> List[Path]:
+    """
+    :return: The given dossier file with all supported compression suffixes.
+    """
+    stem = strip_dossier_suffix(filename)
+    return [stem.with_name(stem.name + suffix) for suffix in DOSSIER_SUFFIXES]
+
+
+def find_dossier_files(data_dir: Path) -> Iterable[Path]:
+    """
+    :return: All dossier files (compressed or not) in the given directory and its subdirectories.
+    """
+    return (path for path in data_dir.rglob('*.json*') if is_dossier_file(path))
+
+
+def open_file(filename: Path, mode: str = 'r', level: Optional[int] = None) -> IO:
+    """
+    Opens a text file. Files ending with ".gz" or ".zst" are compressed and decompressed while reading and writing,
+    so the content is never held in memory completely.
+
+    :param filename: The file to open.
+    :param mode: "r" or "w".
+    :param level: The compression level used for writing. None uses the default of the method.
+    """
+    method = get_compression_method(filename)
+    if method == 'gzip':
+        return gzip.open(filename, mode + 't', compresslevel=9 if level is None else level, encoding='utf-8')
+    elif method == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError(
+                f'Reading and writing {filename} requires "zstandard" (pip install abgeordnetenwatch_python[zstd]).'
+            )
+        cctx = None
+        if 'w' in mode:
+            cctx = zstandard.ZstdCompressor(level=3 if level is None else level)
+        return zstandard.open(filename, mode + 't', cctx=cctx, encoding='utf-8')
+    return open(filename, mode, encoding='utf-8')
+
+
+def add_compression_arguments(parser: argparse.ArgumentParser):
+    """
+    Adds the command line arguments used by `file_compression_from_args()` to the given parser.
+    """
+    parser.add_argument(
+        '--compression', type=str, default=None, choices=COMPRESSION_METHODS,
+        help='Save the dossiers compressed as .json.gz (gzip) or .json.zst (zstd, requires zstandard). Existing '
+             'dossiers are converted, when they are updated.'
+    )
+    parser.add_argument(
+        '--compression-level', type=int, default=None,
+        help='Compression level for gzip (1-9) or zstd (1-22). Defaults to the default of the method.'
+    )
+
+
+def file_compression_from_args(args: argparse.Namespace) -> FileCompression:
+    return FileCompression(method=args.compression, level=args.compression_level)
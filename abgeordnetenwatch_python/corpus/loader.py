@@ -0,0 +1,111 @@
+import collections
+import concurrent.futures
+import os
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, Tuple, Optional, Iterable, List, Set
+
+from abgeordnetenwatch_python.compression import find_dossier_files
+from abgeordnetenwatch_python.models.politician_dossier import PoliticianDossier
+
+
+def get_politician_id_from_filename(path: Path) -> Optional[int]:
+    """
+    Reads the politician id from a filename created by `get_default_filename()`, e.g. "079137_Angela_Merkel.json".
+
+    :return: The politician id or None, if the filename does not start with an id.
+    """
+    prefix = path.name.split('_', 1)[0]
+    if prefix.isdigit():
+        return int(prefix)
+    return None
+
+
+def _load_dossier(path: Path) -> Tuple[Path, Optional[PoliticianDossier]]:
+    return path, PoliticianDossier.from_file(path)
+
+
+class DossierLoader:
+    """
+    Loads all dossiers in a directory lazily. Files are read and validated in a thread or process pool, while the
+    already loaded dossiers are consumed.
+
+    Usage:
+        for path, dossier in DossierLoader(Path('data/json/bundestag'), workers=8):
+            ...
+    """
+    def __init__(
+            self, data_dir: Path, limit: int = -1, politician_ids: Optional[Iterable[int]] = None,
+            workers: Optional[int] = None, use_processes: bool = False, ordered: bool = True,
+            read_ahead: Optional[int] = None
+    ):
+        """
+        :param data_dir: The directory to search for dossiers (recursively). Compressed dossiers are loaded as well.
+        :param limit: The maximal number of files to load. If -1, all files are loaded.
+        :param politician_ids: If given, only files of these politicians are loaded. The id is taken from the filename,
+                               so other files are skipped without parsing them.
+        :param workers: The number of threads or processes. Defaults to the number of cpus.
+        :param use_processes: Use a process pool instead of a thread pool. Validating dossiers is CPU bound, so
+                              processes scale better for large directories.
+        :param ordered: If True, dossiers are yielded in the order of their filenames. Otherwise, they are yielded as
+                        soon as they are loaded.
+        :param read_ahead: The maximal number of dossiers, that are loaded but not yet consumed. Defaults to twice the
+                           number of workers.
+        """
+        self.data_dir = data_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.use_processes = use_processes
+        self.ordered = ordered
+        self.read_ahead = read_ahead or 2 * self.workers
+
+        json_files: Iterable[Path] = sorted(find_dossier_files(data_dir))
+        if politician_ids is not None:
+            politician_ids: Set[int] = set(politician_ids)
+            json_files = (p for p in json_files if get_politician_id_from_filename(p) in politician_ids)
+        if limit > 0:
+            json_files = islice(json_files, limit)
+        self.json_files: List[Path] = list(json_files)
+
+    def _create_executor(self) -> concurrent.futures.Executor:
+        if self.use_processes:
+            return concurrent.futures.ProcessPoolExecutor(max_workers=self.workers)
+        return concurrent.futures.ThreadPoolExecutor(max_workers=self.workers)
+
+    def __iter__(self) -> Iterator[Tuple[Path, PoliticianDossier]]:
+        paths = iter(self.json_files)
+        pending = collections.deque()
+        executor = self._create_executor()
+        try:
+            for path in islice(paths, self.read_ahead):
+                pending.append(executor.submit(_load_dossier, path))
+
+            while pending:
+                if self.ordered:
+                    future = pending.popleft()
+                else:
+                    done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    future = done.pop()
+                    pending.remove(future)
+
+                # keep the pool busy, while the caller works on the current dossier
+                for path in islice(paths, 1):
+                    pending.append(executor.submit(_load_dossier, path))
+
+                path, dossier = future.result()
+                if dossier is not None:
+                    yield path, dossier
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def __len__(self):
+        return len(self.json_files)
+
+
+def load_dossiers(data_dir: Path, **kwargs) -> Iterator[PoliticianDossier]:
+    """
+    Yields all dossiers in the given directory. See `DossierLoader` for the available arguments.
+    """
+    for _path, dossier in DossierLoader(data_dir, **kwargs):
+        yield dossier
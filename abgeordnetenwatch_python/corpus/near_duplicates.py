@@ -0,0 +1,251 @@
+import zlib
+from pathlib import Path
+from typing import List, Optional, Dict, Iterable, NamedTuple
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError('near_duplicates requires numpy (pip install abgeordnetenwatch_python[stats]).')
+
+from abgeordnetenwatch_python.models.politician_dossier import PoliticianDossier
+from abgeordnetenwatch_python.models.questions_answers import QuestionAnswerResult, normalize_text
+
+# prime larger than the 32 bit shingle hashes
+_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def get_question_text(qa: QuestionAnswerResult) -> Optional[str]:
+    """
+    :return: The normalized text of the question and its addition. None, if the question is missing.
+    """
+    if qa.question is None:
+        return None
+    parts = [qa.question] + ([qa.question_addition] if qa.question_addition else [])
+    return normalize_text(' '.join(parts)).lower()
+
+
+def get_shingles(text: str, size: int = 3) -> np.ndarray:
+    """
+    :return: The 32 bit hashes of all word n-grams of the given size. Texts with fewer words are a single shingle.
+    """
+    words = text.split(' ')
+    shingles = {' '.join(words[i:i + size]) for i in range(max(len(words) - size + 1, 1))}
+    # crc32 instead of hash(), so signatures are the same in every process
+    return np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+
+class MinHash:
+    """
+    Computes MinHash signatures with `num_perm` hash functions of the form (a * x + b) mod p. The signatures of two
+    texts agree in about the fraction of their Jaccard similarity.
+    """
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.seed = seed
+        self._a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+
+    def get_signature(self, text: str) -> np.ndarray:
+        shingles = get_shingles(text)
+        # shape (num_perm, shingles). The products overflow intentionally, like in most MinHash implementations.
+        hashes = (np.outer(self._a, shingles) + self._b[:, None]) % _PRIME & _MAX_HASH
+        return hashes.min(axis=1).astype(np.uint32)
+
+
+class IndexRecord(NamedTuple):
+    url: str
+    politician_id: int
+    answered: bool
+
+
+class NearDuplicateIndex:
+    """
+    Finds questions with nearly the same text with MinHash signatures and locality sensitive hashing: The signature is
+    cut into `bands` bands, questions sharing a band are candidates. Candidates with an estimated Jaccard similarity of
+    at least `threshold` are near-duplicates. Near-duplicates are merged into clusters transitively. A new question is
+    compared with one candidate of every cluster first, so large clusters do not make adding quadratic.
+
+    The index can be updated incrementally: Questions are identified by url, only new questions are hashed.
+
+    Usage:
+        index = NearDuplicateIndex.load(Path('near_duplicates.npz')) if exists else NearDuplicateIndex()
+        for dossier in load_dossiers(Path('data/json/bundestag')):
+            index.add_dossier(dossier)
+        clusters = index.get_clusters(min_size=10)
+        index.save(Path('near_duplicates.npz'))
+    """
+    def __init__(self, num_perm: int = 128, bands: int = 16, threshold: float = 0.8, seed: int = 1):
+        """
+        :param num_perm: The length of the signatures.
+        :param bands: The number of LSH bands. Must divide num_perm. More bands find less similar candidates.
+        :param threshold: The minimal estimated Jaccard similarity of near-duplicates.
+        :param seed: The seed of the hash functions. Indexes can only be combined with the same seed.
+        """
+        if num_perm % bands != 0:
+            raise ValueError(f'The number of bands ({bands}) must divide num_perm ({num_perm})')
+        self.minhash = MinHash(num_perm, seed)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+
+        self.records: List[IndexRecord] = []
+        self._by_url: Dict[str, int] = {}
+        self._signatures: List[np.ndarray] = []
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        # union find over the record indices
+        self._parent: List[int] = []
+
+    def __len__(self):
+        return len(self.records)
+
+    def _find(self, index: int) -> int:
+        while self._parent[index] != index:
+            self._parent[index] = self._parent[self._parent[index]]
+            index = self._parent[index]
+        return index
+
+    def _union(self, a: int, b: int):
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a != root_b:
+            self._parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    def get_band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def get_candidates(self, signature: np.ndarray) -> List[int]:
+        """
+        :return: The indices of all records sharing at least one band with the signature.
+        """
+        candidates = set()
+        for bucket, key in zip(self._buckets, self.get_band_keys(signature)):
+            candidates.update(bucket.get(key, ()))
+        return sorted(candidates)
+
+    def get_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
+        """
+        :return: The estimated Jaccard similarity of two signatures.
+        """
+        return float(np.count_nonzero(a == b)) / len(a)
+
+    def find_similar(self, text: str) -> List[int]:
+        """
+        :return: The indices of all indexed questions, that are near-duplicates of the given text.
+        """
+        signature = self.minhash.get_signature(normalize_text(text).lower())
+        return self._verify(signature, self.get_candidates(signature))
+
+    def _verify(self, signature: np.ndarray, candidates: List[int]) -> List[int]:
+        if not candidates:
+            return []
+        similarities = np.count_nonzero(np.stack([self._signatures[i] for i in candidates]) == signature, axis=1)
+        return [c for c, s in zip(candidates, similarities) if s >= self.threshold * len(signature)]
+
+    def _add_signature(self, record: IndexRecord, signature: np.ndarray):
+        index = len(self.records)
+        self.records.append(record)
+        self._by_url[record.url] = index
+        self._signatures.append(signature)
+        self._parent.append(index)
+        # a bucket of a large cluster holds all its members, so only the first candidate of every cluster is verified
+        # instead of all. The other candidates of a cluster are verified only, if the first one is not similar enough.
+        clusters: Dict[int, List[int]] = {}
+        for candidate in self.get_candidates(signature):
+            clusters.setdefault(self._find(candidate), []).append(candidate)
+        matches = set(self._verify(signature, [candidates[0] for candidates in clusters.values()]))
+        matches.update(self._verify(signature, [
+            c for candidates in clusters.values() if candidates[0] not in matches for c in candidates[1:]
+        ]))
+        for other in matches:
+            self._union(index, other)
+        for bucket, key in zip(self._buckets, self.get_band_keys(signature)):
+            bucket.setdefault(key, []).append(index)
+
+    def add(self, url: str, politician_id: int, text: str, answered: bool = False) -> int:
+        """
+        Adds a question. If the url is indexed already, only its answered state is updated.
+
+        :param text: The normalized question text, see `get_question_text()`.
+        :return: The index of the question.
+        """
+        index = self._by_url.get(url)
+        if index is not None:
+            self.records[index] = self.records[index]._replace(answered=answered)
+            return index
+        self._add_signature(IndexRecord(url, politician_id, answered), self.minhash.get_signature(text))
+        return len(self.records) - 1
+
+    def add_dossier(self, dossier: PoliticianDossier) -> int:
+        """
+        Adds all questions of a dossier. Questions without url or text are skipped.
+
+        :return: The number of newly added questions.
+        """
+        old_size = len(self.records)
+        for qa in dossier.questions_answers.questions_answers:
+            text = get_question_text(qa)
+            if qa.url is None or text is None:
+                continue
+            self.add(qa.url, dossier.politician.id, text, qa.answer is not None)
+        return len(self.records) - old_size
+
+    def get_clusters(self, min_size: int = 2) -> List[List[int]]:
+        """
+        :return: The record indices of all clusters with at least `min_size` questions, the largest first.
+        """
+        clusters: Dict[int, List[int]] = {}
+        for index in range(len(self.records)):
+            clusters.setdefault(self._find(index), []).append(index)
+        return sorted((c for c in clusters.values() if len(c) >= min_size), key=lambda c: (-len(c), c[0]))
+
+    def save(self, filename: Path):
+        filename.parent.mkdir(exist_ok=True, parents=True)
+        num_perm = self.minhash.num_perm
+        with open(filename, 'wb') as f:
+            np.savez_compressed(
+                f,
+                params=np.array([num_perm, self.bands, self.minhash.seed], dtype=np.int64),
+                threshold=np.array([self.threshold]),
+                signatures=np.stack(self._signatures) if self._signatures else np.zeros((0, num_perm), np.uint32),
+                urls=np.array([r.url for r in self.records], dtype=np.str_),
+                politician_ids=np.array([r.politician_id for r in self.records], dtype=np.int64),
+                answered=np.array([r.answered for r in self.records], dtype=bool),
+            )
+
+    @staticmethod
+    def load(filename: Path, threshold: Optional[float] = None) -> 'NearDuplicateIndex':
+        """
+        Loads an index saved with `save()`. The buckets and clusters are rebuilt from the signatures.
+
+        :param threshold: Overrides the saved threshold.
+        """
+        with np.load(filename) as data:
+            num_perm, bands, seed = (int(v) for v in data['params'])
+            index = NearDuplicateIndex(
+                num_perm, bands, float(data['threshold'][0]) if threshold is None else threshold, seed
+            )
+            records = zip(data['urls'], data['politician_ids'], data['answered'], data['signatures'])
+            for url, politician_id, answered, signature in records:
+                index._add_signature(IndexRecord(str(url), int(politician_id), bool(answered)), signature)
+        return index
+
+
+class ClusterSummary(NamedTuple):
+    questions: int
+    politicians: int
+    answered: int
+    answer_rate: float
+    record_indices: List[int]
+
+
+def summarize_clusters(index: NearDuplicateIndex, clusters: Iterable[List[int]]) -> List[ClusterSummary]:
+    summaries = []
+    for cluster in clusters:
+        records = [index.records[i] for i in cluster]
+        answered = sum(r.answered for r in records)
+        summaries.append(ClusterSummary(
+            questions=len(records), politicians=len({r.politician_id for r in records}), answered=answered,
+            answer_rate=answered / len(records), record_indices=cluster,
+        ))
+    return summaries
@@ -0,0 +1,224 @@
+import datetime
+from pathlib import Path
+from typing import List, Optional, Iterable, NamedTuple, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError('qa_stats requires numpy (pip install abgeordnetenwatch_python[stats]).')
+
+from abgeordnetenwatch_python.corpus.loader import DossierLoader
+from abgeordnetenwatch_python.models.politicians import Politician
+
+GROUP_KEYS = ['politician', 'party', 'parliament', 'all']
+BUCKETS = {'year': 'datetime64[Y]', 'month': 'datetime64[M]', 'week': 'datetime64[W]', 'day': 'datetime64[D]'}
+
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+class GroupStats(NamedTuple):
+    """
+    Aggregates per group. All arrays have one entry per group.
+    """
+    labels: List[str]
+    questions: np.ndarray
+    answered: np.ndarray
+    answer_rate: np.ndarray
+    # days from question to answer. NaN for groups without dated answers.
+    median_latency: np.ndarray
+    p90_latency: np.ndarray
+
+
+class BucketCounts(NamedTuple):
+    """
+    Number of questions per group and time bucket of the question date.
+    """
+    labels: List[str]
+    buckets: np.ndarray
+    # arrays of shape (groups, buckets)
+    questions: np.ndarray
+    answered: np.ndarray
+
+
+class StatisticComparison(NamedTuple):
+    """
+    The statistics of the api (`Politician.statistic_questions`, `Politician.statistic_questions_answered`) compared to
+    the locally observed counts. One entry per politician.
+    """
+    politicians: List[Politician]
+    statistic_questions: np.ndarray
+    observed_questions: np.ndarray
+    statistic_answered: np.ndarray
+    observed_answered: np.ndarray
+
+    def get_mismatches(self) -> np.ndarray:
+        """
+        :return: The indices of the politicians, where the observed counts differ from the statistics.
+        """
+        return np.flatnonzero(
+            (self.statistic_questions != self.observed_questions) | (self.statistic_answered != self.observed_answered)
+        )
+
+
+def _dates_to_array(dates: List[Optional[datetime.date]]) -> np.ndarray:
+    days = np.fromiter((d.toordinal() - _EPOCH_ORDINAL if d else 0 for d in dates), dtype=np.int64, count=len(dates))
+    result = days.astype('datetime64[D]')
+    result[np.fromiter((d is None for d in dates), dtype=bool, count=len(dates))] = np.datetime64('NaT')
+    return result
+
+
+def _encode(values: List[str]) -> Tuple[List[str], np.ndarray]:
+    labels, codes = np.unique(np.array(values, dtype=object).astype(str), return_inverse=True)
+    return [str(label) for label in labels], codes.astype(np.int64)
+
+
+def grouped_quantiles(codes: np.ndarray, values: np.ndarray, num_groups: int, q: float) -> np.ndarray:
+    """
+    Computes the q-quantile of the values of every group at once (with linear interpolation like `np.quantile`).
+    NaN values are ignored.
+
+    :param codes: The group of every value.
+    :param values: The values.
+    :param num_groups: The number of groups.
+    :param q: The quantile between 0 and 1.
+    :return: The quantile per group. NaN for groups without values.
+    """
+    valid = ~np.isnan(values)
+    codes, values = codes[valid], values[valid]
+    # sort by group, then by value, so the values of every group are consecutive and sorted
+    order = np.lexsort((values, codes))
+    values = values[order]
+    counts = np.bincount(codes, minlength=num_groups)
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    result = np.full(num_groups, np.nan)
+    has_values = counts > 0
+    pos = offsets[has_values] + q * (counts[has_values] - 1)
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.ceil(pos).astype(np.int64)
+    result[has_values] = values[lo] + (values[hi] - values[lo]) * (pos - lo)
+    return result
+
+
+class QAStats:
+    """
+    The questions and answers of a corpus as NumPy arrays with one entry per question. The arrays are built once, all
+    statistics are computed on them in vectorized form.
+    """
+    def __init__(self, records: Iterable[Tuple[Politician, str, Iterable]]):
+        """
+        :param records: Tuples (politician, parliament, questions_answers) for every dossier.
+        """
+        self.politicians: List[Politician] = []
+        politician_index = []
+        parliaments = []
+        question_dates = []
+        answer_dates = []
+        answered = []
+        for politician, parliament, questions_answers in records:
+            index = len(self.politicians)
+            self.politicians.append(politician)
+            for qa in questions_answers:
+                politician_index.append(index)
+                parliaments.append(parliament)
+                question_dates.append(qa.question_date)
+                answer_dates.append(qa.answer_date)
+                answered.append(qa.answer is not None)
+
+        self.politician_index = np.array(politician_index, dtype=np.int64)
+        self.question_date = _dates_to_array(question_dates)
+        self.answer_date = _dates_to_array(answer_dates)
+        self.answered = np.array(answered, dtype=bool)
+
+        self.party_labels, party_codes = _encode([
+            p.party.label if p.party is not None else 'unknown' for p in self.politicians
+        ])
+        self.party_code = party_codes[self.politician_index] if len(self.politician_index) else party_codes[:0]
+        self.parliament_labels, self.parliament_code = _encode(parliaments)
+
+    @staticmethod
+    def from_directory(data_dir: Path, **kwargs) -> 'QAStats':
+        """
+        Loads all dossiers in the given directory. The parliament of a dossier is the name of its directory, e.g.
+        "bundestag" for "data/json/bundestag/079137_Angela_Merkel.json".
+
+        :param data_dir: The directory to load the dossiers from, e.g. "data/json".
+        :param kwargs: Additional arguments for the `DossierLoader`.
+        """
+        return QAStats(
+            (dossier.politician, path.parent.name, dossier.questions_answers.questions_answers)
+            for path, dossier in DossierLoader(data_dir, **kwargs)
+        )
+
+    def __len__(self):
+        return len(self.politician_index)
+
+    def get_latency(self) -> np.ndarray:
+        """
+        :return: The days from question to answer. NaN for unanswered questions or missing dates.
+        """
+        latency = (self.answer_date - self.question_date).astype(np.float64)
+        latency[np.isnat(self.answer_date) | np.isnat(self.question_date)] = np.nan
+        return latency
+
+    def get_groups(self, group_by: str) -> Tuple[List[str], np.ndarray]:
+        """
+        :param group_by: One of GROUP_KEYS.
+        :return: The labels of the groups and the group of every question.
+        """
+        if group_by == 'politician':
+            labels = [f'{p.get_full_name()} ({p.id})' for p in self.politicians]
+            return labels, self.politician_index
+        elif group_by == 'party':
+            return self.party_labels, self.party_code
+        elif group_by == 'parliament':
+            return self.parliament_labels, self.parliament_code
+        elif group_by == 'all':
+            return ['all'], np.zeros(len(self), dtype=np.int64)
+        raise ValueError('Invalid group: {}'.format(group_by))
+
+    def group_stats(self, group_by: str) -> GroupStats:
+        labels, codes = self.get_groups(group_by)
+        num_groups = len(labels)
+        questions = np.bincount(codes, minlength=num_groups)
+        answered = np.bincount(codes, weights=self.answered, minlength=num_groups).astype(np.int64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            answer_rate = answered / questions
+        latency = self.get_latency()
+        return GroupStats(
+            labels=labels, questions=questions, answered=answered, answer_rate=answer_rate,
+            median_latency=grouped_quantiles(codes, latency, num_groups, 0.5),
+            p90_latency=grouped_quantiles(codes, latency, num_groups, 0.9),
+        )
+
+    def bucket_counts(self, group_by: str, bucket: str = 'month') -> BucketCounts:
+        """
+        Counts the questions per group and time bucket of the question date. Questions without date are skipped.
+
+        :param group_by: One of GROUP_KEYS.
+        :param bucket: One of BUCKETS.
+        """
+        labels, codes = self.get_groups(group_by)
+        dated = ~np.isnat(self.question_date)
+        bucket_values = self.question_date[dated].astype(BUCKETS[bucket])
+        buckets, bucket_codes = np.unique(bucket_values, return_inverse=True)
+        combined = codes[dated] * len(buckets) + bucket_codes
+        shape = (len(labels), len(buckets))
+        size = shape[0] * shape[1]
+        questions = np.bincount(combined, minlength=size).reshape(shape)
+        answered = np.bincount(combined, weights=self.answered[dated], minlength=size).astype(np.int64).reshape(shape)
+        return BucketCounts(labels=labels, buckets=buckets, questions=questions, answered=answered)
+
+    def compare_statistics(self) -> StatisticComparison:
+        num_politicians = len(self.politicians)
+        return StatisticComparison(
+            politicians=self.politicians,
+            statistic_questions=np.array([p.statistic_questions or 0 for p in self.politicians], dtype=np.int64),
+            observed_questions=np.bincount(self.politician_index, minlength=num_politicians),
+            statistic_answered=np.array(
+                [p.statistic_questions_answered or 0 for p in self.politicians], dtype=np.int64
+            ),
+            observed_answered=np.bincount(
+                self.politician_index, weights=self.answered, minlength=num_politicians
+            ).astype(np.int64),
+        )
@@ -0,0 +1,154 @@
+import bisect
+import datetime
+from pathlib import Path
+from typing import List, Optional, Dict, Iterable, NamedTuple, Sequence, Tuple
+
+from abgeordnetenwatch_python.corpus.loader import load_dossiers
+from abgeordnetenwatch_python.models.politician_dossier import PoliticianDossier
+from abgeordnetenwatch_python.models.politicians import Politician
+from abgeordnetenwatch_python.models.questions_answers import QuestionAnswerResult, QuestionsAnswers
+
+
+class CorpusRecord(NamedTuple):
+    politician: Politician
+    qa: QuestionAnswerResult
+
+
+class _DateIndex:
+    """
+    Record indices sorted by a date, to find all records in a date range by bisection. The rank of a record is its
+    position in date order, so membership in a date range is checked without building a set.
+    """
+    def __init__(self, dates: List[Optional[datetime.date]]):
+        order = sorted((i for i, d in enumerate(dates) if d is not None), key=lambda i: dates[i])
+        self.dates = [dates[i] for i in order]
+        self.record_indices = order
+        # undated records get ranks behind all dated ones, in the order of their record index
+        self.undated = [i for i, d in enumerate(dates) if d is None]
+        self.ranks = [0] * len(dates)
+        for rank, index in enumerate(order + self.undated):
+            self.ranks[index] = rank
+
+    def get_bounds(self, start: Optional[datetime.date] = None, end: Optional[datetime.date] = None) -> Tuple[int, int]:
+        """
+        :return: The ranks (lo, hi) of the records in the date range are lo <= rank < hi.
+        """
+        lo = 0 if start is None else bisect.bisect_left(self.dates, start)
+        hi = len(self.dates) if end is None else bisect.bisect_right(self.dates, end)
+        return lo, hi
+
+    def range(
+            self, start: Optional[datetime.date] = None, end: Optional[datetime.date] = None
+    ) -> Sequence[int]:
+        lo, hi = self.get_bounds(start, end)
+        return self.record_indices[lo:hi]
+
+
+def _contains(indices: Sequence[int], index: int) -> bool:
+    # membership in a list sorted by record index
+    position = bisect.bisect_left(indices, index)
+    return position < len(indices) and indices[position] == index
+
+
+class QuestionsAnswersCorpus:
+    """
+    Holds the questions and answers of many dossiers in memory and answers filter queries with prebuilt indexes on
+    question date, answer date, politician, party and answered state.
+    """
+    def __init__(self, dossiers: Iterable[PoliticianDossier]):
+        self.records: List[CorpusRecord] = []
+        self.politicians: Dict[int, Politician] = {}
+        self._by_politician: Dict[int, List[int]] = {}
+        self._by_party: Dict[str, List[int]] = {}
+        self._by_answered: Dict[bool, List[int]] = {True: [], False: []}
+
+        for dossier in dossiers:
+            politician = dossier.politician
+            self.politicians[politician.id] = politician
+            for qa in dossier.questions_answers.questions_answers:
+                index = len(self.records)
+                self.records.append(CorpusRecord(politician, qa))
+                self._by_politician.setdefault(politician.id, []).append(index)
+                if politician.party is not None:
+                    self._by_party.setdefault(politician.party.label, []).append(index)
+                self._by_answered[qa.answer is not None].append(index)
+
+        self._question_dates = _DateIndex([r.qa.question_date for r in self.records])
+        self._answer_dates = _DateIndex([r.qa.answer_date for r in self.records])
+
+    @staticmethod
+    def from_directory(data_dir: Path, **kwargs) -> 'QuestionsAnswersCorpus':
+        """
+        Loads all dossiers in the given directory (recursively).
+
+        :param data_dir: The directory to load the dossiers from, e.g. "data/json/bundestag".
+        :param kwargs: Additional arguments for the `DossierLoader`.
+        """
+        return QuestionsAnswersCorpus(load_dossiers(data_dir, **kwargs))
+
+    def get_parties(self) -> List[str]:
+        return sorted(self._by_party)
+
+    def query(
+            self, politician_id: Optional[int] = None, party: Optional[str] = None, answered: Optional[bool] = None,
+            question_date_from: Optional[datetime.date] = None, question_date_to: Optional[datetime.date] = None,
+            answer_date_from: Optional[datetime.date] = None, answer_date_to: Optional[datetime.date] = None,
+    ) -> List[CorpusRecord]:
+        """
+        Finds all records matching all the given filters. Date ranges include both ends.
+
+        :param politician_id: Only questions to the politician with this id.
+        :param party: Only questions to politicians of the party with this label.
+        :param answered: If True, only answered questions. If False, only unanswered questions.
+        :param question_date_from: Only questions asked at or after this date.
+        :param question_date_to: Only questions asked at or before this date.
+        :param answer_date_from: Only questions answered at or after this date.
+        :param answer_date_to: Only questions answered at or before this date.
+        :return: The matching records, sorted by question date.
+        """
+        # record indices sorted by record index
+        candidates: List[Sequence[int]] = []
+        if politician_id is not None:
+            candidates.append(self._by_politician.get(politician_id, []))
+        if party is not None:
+            candidates.append(self._by_party.get(party, []))
+        if answered is not None:
+            candidates.append(self._by_answered[answered])
+        # rank bounds in a date index
+        date_ranges: List[Tuple[_DateIndex, int, int]] = []
+        for date_index, start, end in (
+                (self._question_dates, question_date_from, question_date_to),
+                (self._answer_dates, answer_date_from, answer_date_to)
+        ):
+            if start is not None or end is not None:
+                date_ranges.append((date_index, *date_index.get_bounds(start, end)))
+
+        question_ranks = self._question_dates.ranks
+        if not candidates and not date_ranges:
+            indices = self._question_dates.record_indices + self._question_dates.undated
+            return [self.records[i] for i in indices]
+
+        # start with the smallest filter and check membership in the others: by bisection in the sorted candidate
+        # lists and by the rank in the date ranges, so no filter is copied
+        candidates.sort(key=len)
+        date_ranges.sort(key=lambda r: r[2] - r[1])
+        if not candidates or (date_ranges and date_ranges[0][2] - date_ranges[0][1] < len(candidates[0])):
+            date_index, lo, hi = date_ranges.pop(0)
+            indices = date_index.record_indices[lo:hi]
+        else:
+            indices = candidates.pop(0)
+        for other in candidates:
+            indices = [i for i in indices if _contains(other, i)]
+        for date_index, lo, hi in date_ranges:
+            ranks = date_index.ranks
+            indices = [i for i in indices if lo <= ranks[i] < hi]
+        return [self.records[i] for i in sorted(indices, key=question_ranks.__getitem__)]
+
+    def query_questions_answers(self, **kwargs) -> QuestionsAnswers:
+        """
+        Like `query()`, but only returns the questions and answers.
+        """
+        return QuestionsAnswers(questions_answers=[record.qa for record in self.query(**kwargs)])
+
+    def __len__(self):
+        return len(self.records)
@@ -0,0 +1,147 @@
+import asyncio
+import collections
+import time
+from typing import Optional, Tuple, Awaitable, TYPE_CHECKING
+
+from abgeordnetenwatch_python.session import SessionWrapper
+
+if TYPE_CHECKING:
+    import aiohttp
+
+
+class HedgingSession(SessionWrapper):
+    """
+    Session, that cuts the tail latency of question pages with hedged requests: If a page requested with
+    `get(url, hedge=True)`, e.g. by `fetch_text()`, did not arrive within the `quantile` of the observed download times
+    (the 95th percentile by default), the same page is requested a second time and the first response wins. The slower
+    request is cancelled.
+
+    Hedging starts after `min_samples` downloads, so the percentile is known. At most `1 - quantile` of the requests
+    are sent twice, if the latencies do not change. All other requests are passed to the wrapped session unchanged.
+    The session can be wrapped again, the `hedge` argument is passed through the other wrappers.
+    """
+    def __init__(
+            self, session: 'aiohttp.ClientSession', quantile: float = 0.95, min_samples: int = 20,
+            max_samples: int = 1000
+    ):
+        """
+        :param session: The session to wrap.
+        :param quantile: The quantile of the download times, after which a request is sent again.
+        :param min_samples: The number of downloads needed, before requests are hedged.
+        :param max_samples: The number of latest download times used for the quantile.
+        """
+        super().__init__(session)
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.latencies = collections.deque(maxlen=max_samples)
+        self.num_requests = 0
+        self.num_hedged = 0
+        # hedged requests, that were faster than the original request
+        self.num_hedge_wins = 0
+
+    def get(self, url: str, hedge: bool = False, **kwargs):
+        """
+        :param hedge: Send the request again, if it takes unusually long. The body of the response is read, before it
+                      is returned.
+        """
+        if not hedge:
+            return self.session.get(url, **kwargs)
+        return _HedgedRequest(self.get_response(url, kwargs))
+
+    def get_hedge_delay(self) -> Optional[float]:
+        """
+        :return: The seconds after which a request is sent again. None, if not enough downloads were observed yet.
+        """
+        if len(self.latencies) < self.min_samples:
+            return None
+        latencies = sorted(self.latencies)
+        return latencies[min(int(self.quantile * len(latencies)), len(latencies) - 1)]
+
+    async def _fetch(self, url: str, kwargs: dict) -> 'aiohttp.ClientResponse':
+        started = time.monotonic()
+        async with self.session.get(url, **kwargs) as r:
+            if not r.ok:
+                return r
+            # the body is kept by the response after the connection was released
+            await r.read()
+        self.latencies.append(time.monotonic() - started)
+        return r
+
+    async def get_response(self, url: str, kwargs: dict) -> 'aiohttp.ClientResponse':
+        """
+        Downloads a page and sends a hedged request, if it takes unusually long.
+
+        :return: The first response. Its body was read already.
+        """
+        self.num_requests += 1
+        delay = self.get_hedge_delay()
+        if delay is None:
+            return await self._fetch(url, kwargs)
+
+        first = asyncio.ensure_future(self._fetch(url, kwargs))
+        pending = {first}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return first.result()
+            self.num_hedged += 1
+            pending.add(asyncio.ensure_future(self._fetch(url, kwargs)))
+
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self.num_hedge_wins += 1
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+            # wait for the cancelled request, so its connection is released
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def get_summary(self) -> str:
+        delay = self.get_hedge_delay()
+        return 'hedged {} of {} question requests ({} duplicates were faster), current delay {}'.format(
+            self.num_hedged, self.num_requests, self.num_hedge_wins, f'{delay:.2f}s' if delay is not None else '-'
+        )
+
+
+class _HedgedRequest:
+    # the object returned by `HedgingSession.get()`, so it can be used as "async with session.get(...) as r"
+    def __init__(self, response: Awaitable['aiohttp.ClientResponse']):
+        self._response = response
+
+    async def __aenter__(self) -> 'aiohttp.ClientResponse':
+        return await self._response
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        # the connection was released after reading the body
+        pass
+
+
+def is_hedging(session: 'aiohttp.ClientSession') -> bool:
+    """
+    :return: True, if the session or one of the sessions wrapped by it is a `HedgingSession`.
+    """
+    while isinstance(session, SessionWrapper):
+        if isinstance(session, HedgingSession):
+            return True
+        session = session.session
+    return False
+
+
+async def fetch_text(url: str, session: 'aiohttp.ClientSession') -> Tuple[int, Optional[str]]:
+    """
+    Downloads a page. If the session wraps a `HedgingSession`, slow requests are hedged.
+
+    :return: The status and the content of the response. The content is None, if the status is not ok.
+    """
+    kwargs = {'hedge': True} if is_hedging(session) else {}
+    async with session.get(url, **kwargs) as r:
+        if not r.ok:
+            return r.status, None
+        return r.status, await r.text()
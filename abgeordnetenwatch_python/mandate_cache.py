@@ -0,0 +1,68 @@
+import datetime
+import os
+from pathlib import Path
+from typing import List, Optional
+
+from pydantic import BaseModel, ValidationError
+
+
+class MandateCacheEntry(BaseModel):
+    """
+    The politicians with a candidacy or mandate in a parliament period.
+    """
+    parliament_period_id: int
+    end_date_period: datetime.date
+    politician_ids: List[int]
+    fetched_at: datetime.datetime
+
+    def is_final(self) -> bool:
+        """
+        :return: True, if the entry was fetched after the end of the period. The mandates of a closed period do not
+                 change anymore, so the entry never expires.
+        """
+        return self.fetched_at.date() > self.end_date_period
+
+
+class MandateCache:
+    """
+    Caches the politician ids of the mandates per parliament period on disk, one json file per period. Entries of
+    closed periods are used forever, the currently running period is loaded again on every run.
+
+    Usage:
+        mandate_cache = MandateCache(Path('data/cache/mandates'))
+        politician_ids = await parliament.get_politician_ids(session, mandate_cache=mandate_cache)
+    """
+    def __init__(self, directory: Path):
+        directory.mkdir(exist_ok=True, parents=True)
+        self.directory = directory
+
+    def get_filename(self, parliament_period_id: int) -> Path:
+        return self.directory / f'period-{parliament_period_id}.json'
+
+    def get(self, parliament_period_id: int) -> Optional[MandateCacheEntry]:
+        """
+        :return: The cached politician ids of the period, if they do not need to be revalidated. Otherwise, None.
+        """
+        filename = self.get_filename(parliament_period_id)
+        try:
+            entry = MandateCacheEntry.model_validate_json(filename.read_bytes())
+        except (FileNotFoundError, ValidationError):
+            return None
+        if not entry.is_final():
+            return None
+        return entry
+
+    def set(
+            self, parliament_period_id: int, end_date_period: datetime.date, politician_ids: List[int],
+            fetched_at: Optional[datetime.datetime] = None
+    ) -> MandateCacheEntry:
+        entry = MandateCacheEntry(
+            parliament_period_id=parliament_period_id, end_date_period=end_date_period,
+            politician_ids=sorted(set(politician_ids)), fetched_at=fetched_at or datetime.datetime.now()
+        )
+        filename = self.get_filename(parliament_period_id)
+        # write to a temporary file first, so concurrent runs never read a partial file
+        tmp_filename = filename.with_name(f'{filename.name}.{os.getpid()}.tmp')
+        tmp_filename.write_text(entry.model_dump_json(), encoding='utf-8')
+        os.replace(tmp_filename, filename)
+        return entry
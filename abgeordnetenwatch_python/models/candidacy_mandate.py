@@ -1,11 +1,13 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, TYPE_CHECKING
 
-import aiohttp
 from pydantic import BaseModel
 
 from abgeordnetenwatch_python.models.parliament_period import ParliamentPeriod, get_parliament_period
 from abgeordnetenwatch_python.models.politicians import Politician, get_politician
 
+if TYPE_CHECKING:
+    import aiohttp
+
 
 class CandidacyMandate(BaseModel):
     id: int
@@ -13,10 +15,10 @@ class CandidacyMandate(BaseModel):
     politician_id: int
     parliament_period_id: int
 
-    async def get_politician(self, session: aiohttp.ClientSession) -> Politician:
+    async def get_politician(self, session: 'aiohttp.ClientSession') -> Politician:
         return await get_politician(session, id=self.politician_id)
 
-    async def get_parliament_period(self, session: aiohttp.ClientSession) -> ParliamentPeriod:
+    async def get_parliament_period(self, session: 'aiohttp.ClientSession') -> ParliamentPeriod:
         return await get_parliament_period(session, id=self.parliament_period_id)
 
     def __repr__(self) -> str:
@@ -25,7 +27,7 @@ class CandidacyMandate(BaseModel):
 
 
 async def get_candidacy_mandates(
-        session: aiohttp.ClientSession, id: Optional[int] = None, politician_id: Optional[int] = None,
+        session: 'aiohttp.ClientSession', id: Optional[int] = None, politician_id: Optional[int] = None,
         parliament_period_id: Optional[int] = None, limit: int = 100
 ) -> List[CandidacyMandate]:
     """
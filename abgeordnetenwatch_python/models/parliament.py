@@ -1,9 +1,11 @@
-import asyncio
-from typing import List, Optional
+from typing import List, Optional, TYPE_CHECKING
 
-import aiohttp
 from pydantic import BaseModel
-from tqdm.asyncio import tqdm_asyncio
+
+if TYPE_CHECKING:
+    import aiohttp
+
+    from abgeordnetenwatch_python.mandate_cache import MandateCache
 
 
 class Parliament(BaseModel):
@@ -12,7 +14,17 @@ class Parliament(BaseModel):
     api_url: str
     abgeordnetenwatch_url: str
 
-    async def get_politician_ids(self, session: aiohttp.ClientSession, verbose: bool = True) -> List[int]:
+    async def get_politician_ids(
+            self, session: 'aiohttp.ClientSession', verbose: bool = True, mandate_cache: Optional['MandateCache'] = None
+    ) -> List[int]:
+        """
+        :param session: aiohttp session to use for making the request.
+        :param verbose: Show the progress of loading the mandates.
+        :param mandate_cache: If given, the mandates of closed parliament periods are taken from this cache and only
+                              the mandates of running periods are loaded from the api.
+        :return: The sorted ids of all politicians with a mandate in a legislature of this parliament.
+        """
+        import asyncio
         # local imports to prevent cyclic import
         from abgeordnetenwatch_python.models.parliament_period import get_parliament_periods
         from abgeordnetenwatch_python.models.candidacy_mandate import get_candidacy_mandates
@@ -22,15 +34,29 @@ class Parliament(BaseModel):
         # skip election periods
         parliament_periods = [pp for pp in parliament_periods if pp.is_legislature()]
 
+        politician_ids = set()
+        if mandate_cache is not None:
+            uncached_periods = []
+            for pp in parliament_periods:
+                entry = mandate_cache.get(pp.id)
+                if entry is not None:
+                    politician_ids.update(entry.politician_ids)
+                else:
+                    uncached_periods.append(pp)
+            parliament_periods = uncached_periods
+
         tasks = [get_candidacy_mandates(session, parliament_period_id=pp.id, limit=1000) for pp in parliament_periods]
         if verbose:
+            from tqdm.asyncio import tqdm_asyncio
             candidacy_mandates_per_pp = await tqdm_asyncio.gather(*tasks, desc='Loading mandates')
         else:
             candidacy_mandates_per_pp = await asyncio.gather(*tasks)
 
-        politician_ids = set()
-        for candidacy_mandates in candidacy_mandates_per_pp:
-            politician_ids.update(cm.politician_id for cm in candidacy_mandates)
+        for pp, candidacy_mandates in zip(parliament_periods, candidacy_mandates_per_pp):
+            pp_politician_ids = [cm.politician_id for cm in candidacy_mandates]
+            politician_ids.update(pp_politician_ids)
+            if mandate_cache is not None:
+                mandate_cache.set(pp.id, pp.end_date_period, pp_politician_ids)
 
         return sorted(politician_ids)
 
@@ -39,7 +65,7 @@ class Parliament(BaseModel):
 
 
 async def get_parliaments(
-        session: aiohttp.ClientSession, id: Optional[int] = None, label: Optional[str] = None
+        session: 'aiohttp.ClientSession', id: Optional[int] = None, label: Optional[str] = None
 ) -> List[Parliament]:
     """
     Calls the abgeordnetenwatch API to retrieve all parliaments matching the given parameters.
@@ -62,7 +88,7 @@ async def get_parliaments(
 
 
 async def get_parliament(
-        session: aiohttp.ClientSession, id: Optional[int] = None, label: Optional[str] = None
+        session: 'aiohttp.ClientSession', id: Optional[int] = None, label: Optional[str] = None
 ) -> Parliament:
     parliaments = await get_parliaments(session, id, label)
     assert len(parliaments), 'Expected 1 parliament, but found {}'.format(len(parliaments))
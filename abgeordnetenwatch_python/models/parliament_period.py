@@ -1,12 +1,14 @@
 import datetime
 from enum import StrEnum
-from typing import List, Optional
+from typing import List, Optional, TYPE_CHECKING
 
-import aiohttp
 from pydantic import BaseModel
 
 from abgeordnetenwatch_python.models.parliament import Parliament
 
+if TYPE_CHECKING:
+    import aiohttp
+
 
 class ParliamentPeriodType(StrEnum):
     ELECTION = 'election'
@@ -34,7 +36,8 @@ class ParliamentPeriod(BaseModel):
 
 
 async def get_parliament_periods(
-        session: aiohttp.ClientSession, id: Optional[int] = None, parliament_id: Optional[int] = None, limit: int = 100
+        session: 'aiohttp.ClientSession', id: Optional[int] = None, parliament_id: Optional[int] = None,
+        limit: int = 100
 ) -> List[ParliamentPeriod]:
     """
     Calls the abgeordnetenwatch API to retrieve the ParliamentPeriod with the given id.
@@ -58,7 +61,8 @@ async def get_parliament_periods(
 
 
 async def get_parliament_period(
-        session: aiohttp.ClientSession, id: Optional[int] = None, parliament_id: Optional[int] = None, limit: int = 100
+        session: 'aiohttp.ClientSession', id: Optional[int] = None, parliament_id: Optional[int] = None,
+        limit: int = 100
 ) -> ParliamentPeriod:
     pps = await get_parliament_periods(session, id, parliament_id, limit)
     assert len(pps) == 1, 'Expected 1 parliament period, but found {}'.format(len(pps))
@@ -1,17 +1,21 @@
 import json
 import warnings
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, AsyncIterator, Tuple, TYPE_CHECKING
 
-import aiohttp
 from pydantic import BaseModel, ValidationError
-from tqdm.asyncio import tqdm
 
-from abgeordnetenwatch_python.cache import CacheInfo
-from abgeordnetenwatch_python.questions_answers.load_qa import load_questions_answers, sort_questions_answers
+from abgeordnetenwatch_python.cache import CacheInfo, CacheIndex
+from abgeordnetenwatch_python.change_feed import ChangeFeedWriter, get_changes
+from abgeordnetenwatch_python.compression import open_file, get_dossier_file_variants
+from abgeordnetenwatch_python.page_store import PageStore
 from abgeordnetenwatch_python.models.candidacy_mandate import get_candidacy_mandates
 from abgeordnetenwatch_python.models.politicians import Politician
-from abgeordnetenwatch_python.models.questions_answers import QuestionsAnswers, TqdmArgs
+from abgeordnetenwatch_python.models.questions_answers import QuestionsAnswers, TqdmArgs, sort_questions_answers, \
+    QuestionAnswerResult
+
+if TYPE_CHECKING:
+    import aiohttp
 
 
 class PoliticianDossier(BaseModel):
@@ -26,8 +30,13 @@ class PoliticianDossier(BaseModel):
 
     @staticmethod
     def from_file(filename: Path) -> Optional['PoliticianDossier']:
+        """
+        Loads a dossier. Files ending with ".json.gz" or ".json.zst" are decompressed.
+
+        :return: The dossier or None, if the file does not exist or has an unsupported format.
+        """
         if filename.is_file():
-            with open(filename, 'r') as f:
+            with open_file(filename, 'r') as f:
                 data = json.load(f)
                 try:
                     return PoliticianDossier.model_validate(data)
@@ -36,16 +45,100 @@ class PoliticianDossier(BaseModel):
                     return None
         return None
 
-    def dump_to_file(self, filename: Path):
+    @staticmethod
+    def read_politician(filename: Path) -> Optional[Politician]:
+        """
+        Reads only the politician of a dossier. Dossiers are saved with sorted keys (see `dump_to_file()`), so the
+        politician comes before the questions and answers, which are not read. Other files are loaded completely.
+
+        :return: The politician or None, if the file does not exist or has an unsupported format.
+        """
+        if not filename.is_file():
+            return None
+        head: Optional[List[str]] = []
+        with open_file(filename, 'r') as f:
+            for line in f:
+                if line.startswith('  "questions_answers":'):
+                    break
+                head.append(line)
+            else:
+                head = None
+        if head is None:
+            dossier = PoliticianDossier.from_file(filename)
+            return dossier.politician if dossier is not None else None
+        try:
+            data = json.loads(''.join(head).rstrip().rstrip(',') + '}')
+            return Politician.model_validate(data['politician'])
+        except (ValueError, KeyError, TypeError):
+            warnings.warn(f'Unsupported file format in {filename} - skipping file.')
+            return None
+
+    @staticmethod
+    def from_file_with_index(filename: Path) -> Tuple[Optional['PoliticianDossier'], Optional[CacheIndex]]:
+        """
+        Loads a dossier to use it as cache. The questions and answers are written to a `CacheIndex` while the file is
+        parsed (see `CacheIndex.load_json()`). The returned dossier has no questions and answers.
+
+        :return: The dossier and the index of its questions and answers. (None, None), if the file does not exist or
+                 has an unsupported format.
+        """
+        if not filename.is_file():
+            return None, None
+        with open_file(filename, 'r') as f:
+            data, index = CacheIndex.load_json(f)
+        try:
+            data['questions_answers'] = QuestionsAnswers.empty()
+            return PoliticianDossier.model_validate(data), index
+        except (ValidationError, TypeError):
+            warnings.warn(f'Unsupported file format in {filename} - skipping file.')
+            index.close()
+            return None, None
+
+    def dump_to_file(self, filename: Path, compression_level: Optional[int] = None):
+        """
+        Saves the dossier. Files ending with ".json.gz" or ".json.zst" are compressed.
+
+        :param filename: The file to write.
+        :param compression_level: The compression level of compressed files. None uses the default of the method.
+        """
         filename.parent.mkdir(exist_ok=True, parents=True)
-        with open(filename, 'w') as f:
+        with open_file(filename, 'w', compression_level) as f:
             data = self.model_dump(mode='json')
             json.dump(data, f, indent=2, sort_keys=True)
 
 
+def get_cache_info(
+        politician: Politician, mandate_ids: List[int], cache: Optional[PoliticianDossier],
+        cache_index: Optional[CacheIndex] = None
+) -> Optional[CacheInfo]:
+    """
+    :param politician: The current state of the politician.
+    :param mandate_ids: The current candidacy mandates of the politician.
+    :param cache: The previously downloaded dossier of the politician.
+    :param cache_index: The index of the questions and answers of the cache. Built from the cache, if None.
+    :return: The cache info for downloading the questions and answers of the politician again. None without cache.
+    """
+    if cache is None:
+        return None
+    if cache.politician.id != politician.id:
+        raise ValueError(
+            f'Cache politician id {cache.politician.id} does not match requested politician id {politician.id}'
+        )
+    if cache_index is None:
+        cache_index = CacheIndex(cache.questions_answers.questions_answers)
+    cache_info = CacheInfo(index=cache_index)
+    if set(cache.mandate_ids) == set(mandate_ids):
+        cache_info.num_questions_missing =\
+            (politician.statistic_questions or 0) - (cache.politician.statistic_questions or 0)
+        cache_info.num_answers_missing =\
+            (politician.statistic_questions_answered or 0) - (cache.politician.statistic_questions_answered or 0)
+    return cache_info
+
+
 async def load_politician_dossier(
-        politician: Politician, session: aiohttp.ClientSession, cache: Optional[PoliticianDossier] = None,
+        politician: Politician, session: 'aiohttp.ClientSession', cache: Optional[PoliticianDossier] = None,
         verbose: bool = True, threads: int = 1, url_threads: int = -1, tqdm_args: TqdmArgs = None,
+        page_store: Optional[PageStore] = None, cache_index: Optional[CacheIndex] = None,
 ) -> PoliticianDossier:
     """
     Loads all questions and answers for a politician together with the current candidacy mandate.
@@ -58,7 +151,13 @@ async def load_politician_dossier(
     :param url_threads: The number of threads to use for loading individual question and answer pages.
                         If -1, the argument "threads" is used.
     :param tqdm_args: Additional arguments to pass to tqdm.
+    :param page_store: If given, the html of every downloaded question page is stored in it.
+    :param cache_index: The index of the questions and answers of the cache, see `get_cache_info()`.
     """
+    # the download machinery is only imported, when a dossier is downloaded
+    from tqdm.asyncio import tqdm
+    from abgeordnetenwatch_python.questions_answers.load_qa import load_questions_answers
+
     tqdm_obj = None
     if verbose:
         tqdm_obj = tqdm(desc=f"preparing {politician.get_full_name()}", bar_format='{desc}', leave=None)
@@ -66,39 +165,91 @@ async def load_politician_dossier(
     candidacy_mandates = await get_candidacy_mandates(session, politician_id=politician.id)
 
     mandate_ids = [cm.id for cm in candidacy_mandates]
-
-    cache_info = None
-    if cache is not None:
-        if cache.politician.id != politician.id:
-            raise ValueError(
-                f'Cache politician id {cache.politician.id} does not match requested politician id {politician.id}'
-            )
-        cache_info = CacheInfo(questions_answers=cache.questions_answers, lookup=None)
-        if set(cache.mandate_ids) == set(mandate_ids):
-            cache_info.num_questions_missing =\
-                (politician.statistic_questions or 0) - (cache.politician.statistic_questions or 0)
-            cache_info.num_answers_missing =\
-                (politician.statistic_questions_answered or 0) - (cache.politician.statistic_questions_answered or 0)
+    cache_info = get_cache_info(politician, mandate_ids, cache, cache_index)
 
     if verbose:
         tqdm_obj.close()
 
-    questions_answers = await load_questions_answers(
-        politician.abgeordnetenwatch_url, session=session, verbose=verbose, threads=threads, url_threads=url_threads,
-        cache_info=cache_info, tqdm_args=tqdm_args, politician_name=politician.get_full_name()
-    )
+    try:
+        questions_answers = await load_questions_answers(
+            politician.abgeordnetenwatch_url, session=session, verbose=verbose, threads=threads,
+            url_threads=url_threads, cache_info=cache_info, tqdm_args=tqdm_args,
+            politician_name=politician.get_full_name(), page_store=page_store
+        )
+    finally:
+        # an index passed by the caller is closed by the caller
+        if cache_info is not None and cache_index is None:
+            cache_info.index.close()
 
     return PoliticianDossier(politician=politician, mandate_ids=mandate_ids, questions_answers=questions_answers)
 
 
+async def iter_politician_dossier(
+        politician: Politician, session: 'aiohttp.ClientSession', cache: Optional[PoliticianDossier] = None,
+        threads: int = 1, url_threads: int = -1, page_store: Optional[PageStore] = None,
+) -> AsyncIterator[QuestionAnswerResult]:
+    """
+    Like `load_politician_dossier()`, but yields every question of the politician as soon as it is downloaded, in the
+    order of completion. Questions taken from the cache are yielded as well. If the iteration is stopped early, the
+    pending downloads are cancelled.
+
+    :param politician: The politician for which to load the questions and answers.
+    :param session: The aiohttp session to use for making the request.
+    :param cache: An optional previously loaded dossier of the politician. Its questions are not downloaded again.
+    :param threads: The number of questions to download in parallel.
+    :param url_threads: The number of listing pages to download in parallel. If -1, the argument "threads" is used.
+    :param page_store: If given, the html of every downloaded question page is stored in it.
+    """
+    from abgeordnetenwatch_python.questions_answers.load_qa import iter_questions_answers
+
+    cache_info = None
+    if cache is not None:
+        # the mandates only decide, whether the cached statistics can be trusted
+        candidacy_mandates = await get_candidacy_mandates(session, politician_id=politician.id)
+        cache_info = get_cache_info(politician, [cm.id for cm in candidacy_mandates], cache)
+
+    try:
+        async for result in iter_questions_answers(
+                politician.abgeordnetenwatch_url, session=session, threads=threads, url_threads=url_threads,
+                cache_info=cache_info, page_store=page_store
+        ):
+            yield result
+    finally:
+        if cache_info is not None:
+            cache_info.index.close()
+
+
 async def load_politician_dossier_with_cache_file(
-        politician: Politician, filename: Path, session: aiohttp.ClientSession, sort_by: Optional[str] = None,
-        verbose: bool = False, threads: int = 1, url_threads: int = -1, tqdm_args: TqdmArgs = None
+        politician: Politician, filename: Path, session: 'aiohttp.ClientSession', sort_by: Optional[str] = None,
+        verbose: bool = False, threads: int = 1, url_threads: int = -1, tqdm_args: TqdmArgs = None,
+        page_store: Optional[PageStore] = None, compression_level: Optional[int] = None,
+        change_feed: Optional[ChangeFeedWriter] = None
 ):
-    cache = PoliticianDossier.from_file(filename)
-    politician_dossier = await load_politician_dossier(
-        politician, session=session, verbose=verbose, threads=threads, url_threads=url_threads, cache=cache,
-        tqdm_args=tqdm_args
-    )
-    politician_dossier.sort_questions_answers(sort_by)
-    politician_dossier.dump_to_file(filename)
+    """
+    Loads the dossier of a politician and saves it to the given file. An existing file is used as cache.
+
+    Unlike `load_questions_answers()` with a sink, the questions and answers of the politician are collected in memory
+    before the dossier is saved: they are sorted by `sort_by` and compared with the cache for the change feed first.
+    So the memory grows with the largest dossier of a parliament, not with the whole parliament.
+
+    :param change_feed: If given, the new questions and answers compared to the cache are written to it.
+    """
+    # the dossier may have been saved with another compression before
+    cache_filename = next((f for f in get_dossier_file_variants(filename) if f.is_file()), filename)
+    # the cached questions are only kept in their compact index, the full records stay in its temporary file
+    cache, cache_index = PoliticianDossier.from_file_with_index(cache_filename)
+    try:
+        politician_dossier = await load_politician_dossier(
+            politician, session=session, verbose=verbose, threads=threads, url_threads=url_threads, cache=cache,
+            tqdm_args=tqdm_args, page_store=page_store, cache_index=cache_index
+        )
+        politician_dossier.sort_questions_answers(sort_by)
+        politician_dossier.dump_to_file(filename, compression_level)
+        if cache_filename != filename and cache is not None:
+            # the old file is replaced by the new one
+            cache_filename.unlink()
+        if change_feed is not None:
+            change_feed.write(get_changes(politician.id, cache_index, politician_dossier.questions_answers))
+    finally:
+        if cache_index is not None:
+            cache_index.close()
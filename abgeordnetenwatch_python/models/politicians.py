@@ -1,13 +1,17 @@
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import List, Optional, Union, AsyncIterator, Iterable, TYPE_CHECKING
 
-import aiohttp
 from pydantic import BaseModel
 
 from abgeordnetenwatch_python.models.party import Party
-from abgeordnetenwatch_python.models.questions_answers import QuestionsAnswers
-from abgeordnetenwatch_python.questions_answers.load_qa import load_questions_answers
+from abgeordnetenwatch_python.models.questions_answers import QuestionsAnswers, QuestionAnswerResult
+from abgeordnetenwatch_python.questions_answers.writers import QuestionsAnswersWriter
 from abgeordnetenwatch_python.cache import CacheInfo
+from abgeordnetenwatch_python.compression import COMPRESSION_SUFFIXES
+from abgeordnetenwatch_python.page_store import PageStore
+
+if TYPE_CHECKING:
+    import aiohttp
 
 
 class Politician(BaseModel):
@@ -22,14 +26,31 @@ class Politician(BaseModel):
     residence: Optional[str] = None
 
     async def load_questions_answers(
-            self, session: aiohttp.ClientSession, verbose: bool = False, threads: int = 1,
-            cache_info: Optional[CacheInfo] = None
+            self, session: 'aiohttp.ClientSession', verbose: bool = False, threads: int = 1,
+            cache_info: Optional[CacheInfo] = None, sink: Optional[QuestionsAnswersWriter] = None,
+            page_store: Optional[PageStore] = None
     ) -> QuestionsAnswers:
+        from abgeordnetenwatch_python.questions_answers.load_qa import load_questions_answers
         return await load_questions_answers(
             self.abgeordnetenwatch_url, session=session, verbose=verbose, threads=threads, cache_info=cache_info,
-            politician_name=self.get_full_name()
+            politician_name=self.get_full_name(), sink=sink, page_store=page_store
         )
 
+    async def iter_questions_answers(
+            self, session: 'aiohttp.ClientSession', threads: int = 1, cache_info: Optional[CacheInfo] = None,
+            page_store: Optional[PageStore] = None
+    ) -> AsyncIterator[QuestionAnswerResult]:
+        """
+        Yields the questions and answers of the politician as soon as they are downloaded. See
+        `iter_questions_answers()` in `questions_answers.load_qa`.
+        """
+        from abgeordnetenwatch_python.questions_answers.load_qa import iter_questions_answers
+        async for result in iter_questions_answers(
+                self.abgeordnetenwatch_url, session=session, threads=threads, cache_info=cache_info,
+                page_store=page_store
+        ):
+            yield result
+
     def get_label(self) -> str:
         return '{} {}'.format(self.first_name, self.last_name)
 
@@ -48,7 +69,7 @@ class Politician(BaseModel):
 
 
 async def get_politicians(
-        session: aiohttp.ClientSession, id: Optional[int] = None, first_name: Optional[str] = None,
+        session: 'aiohttp.ClientSession', id: Optional[int] = None, first_name: Optional[str] = None,
         last_name: Optional[str] = None, party: Optional[str] = None, residence: Optional[str] = None
 ) -> List[Politician]:
     """
@@ -79,8 +100,31 @@ async def get_politicians(
         return [Politician.model_validate(pol_data) for pol_data in data['data']]
 
 
+async def get_politicians_by_ids(
+        session: 'aiohttp.ClientSession', ids: Iterable[int], batch_size: int = 100
+) -> List[Politician]:
+    """
+    Calls the abgeordnetenwatch API to retrieve many politicians with few requests, e.g. to poll their statistics.
+
+    :param session: aiohttp session to use for making the request.
+    :param ids: The ids of the politicians.
+    :param batch_size: The number of politicians requested at once.
+    :return: The found politicians. Unknown ids are skipped.
+    """
+    ids = list(ids)
+    url = 'https://www.abgeordnetenwatch.de/api/v2/politicians'
+    politicians = []
+    for start in range(0, len(ids), batch_size):
+        batch = ids[start:start + batch_size]
+        params = {'id[in]': '[{}]'.format(','.join(str(i) for i in batch)), 'range_end': str(len(batch))}
+        async with session.get(url, raise_for_status=True, params=params) as r:
+            data = await r.json()
+            politicians.extend(Politician.model_validate(pol_data) for pol_data in data['data'])
+    return politicians
+
+
 async def get_politician(
-        session: aiohttp.ClientSession, id: Optional[int] = None, first_name: Optional[str] = None,
+        session: 'aiohttp.ClientSession', id: Optional[int] = None, first_name: Optional[str] = None,
         last_name: Optional[str] = None, party: Optional[str] = None, residence: Optional[str] = None
 ) -> Politician:
     """
@@ -104,16 +148,20 @@ async def get_politician(
     return politicians[0]
 
 
-def get_default_filename(politician: Union[Politician, str], outdir: Path) -> Path:
+def get_default_filename(
+        politician: Union[Politician, str], outdir: Path, compression: Optional[str] = None
+) -> Path:
     """
     Creates the default filename for a politician.
     :param politician: The politician for which the filename should be created. Can also be the url of the politician.
     :param outdir: The directory where the file should be located.
+    :param compression: The compression method of the file ("gzip" or "zstd"). None for an uncompressed file.
     :return: A Path object with the filename.
     """
+    suffix = '.json' + COMPRESSION_SUFFIXES[compression]
     if isinstance(politician, str):
         u = [u for u in politician.split('/') if u][-1]
-        return outdir / f'{u}.json'
+        return outdir / f'{u}{suffix}'
     elif isinstance(politician, Politician):
-        return outdir / f'{politician.id:0>6}_{politician.first_name}_{politician.last_name}.json'
+        return outdir / f'{politician.id:0>6}_{politician.first_name}_{politician.last_name}{suffix}'
     raise TypeError(f'Invalid type for politician: {type(politician)}')
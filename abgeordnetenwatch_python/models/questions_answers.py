@@ -40,6 +40,15 @@ class QuestionAnswerResult(BaseModel):
                 )
 
 
+class QuestionTile(BaseModel):
+    """
+    The state of a question as shown on the listing page of a politician.
+    """
+    href: str
+    answered: bool = False
+    answer_date: Optional[datetime.date] = None
+
+
 class QuestionsAnswers(BaseModel):
     questions_answers: List[QuestionAnswerResult]
 
@@ -70,3 +79,34 @@ def normalize_tqdm_args(tqdm_args: TqdmArgs, default_desc: Optional[str] = None)
     if 'desc' not in tqdm_args:
         tqdm_args['desc'] = default_desc
     return tqdm_args
+
+
+def normalize_text(text: str) -> str:
+    return ' '.join(filter(bool, text.strip().replace('\n', ' ').split(' ')))
+
+
+def sort_questions_answers(questions_answers: QuestionsAnswers, sort_by: str):
+    """
+    Sort the given QuestionAnswerResults.
+
+    :param questions_answers: The questions and answers to sort
+    :param sort_by: The value to sort by. Either 'answer' or 'question'. Sorts by the date of the answer or the
+                    question.
+    :return: The same list, sorted by answer or question date.
+    """
+    if sort_by == 'answer':
+        def _key_function(qa):
+            if qa.answer_date:
+                return qa.answer_date
+            if qa.question_date:
+                return qa.question_date
+            return datetime.date.today()
+    elif sort_by == 'question':
+        def _key_function(qa):
+            if qa.question_date:
+                return qa.question_date
+            return datetime.date.today()
+    else:
+        raise ValueError('Invalid sort option: {}'.format(sort_by))
+    questions_answers = list(sorted(questions_answers.questions_answers, key=_key_function))
+    return QuestionsAnswers(questions_answers=questions_answers)
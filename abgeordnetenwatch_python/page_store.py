@@ -0,0 +1,142 @@
+import os
+import socket
+import time
+from pathlib import Path
+from typing import Optional, Dict, List, Iterator, BinaryIO, Tuple
+
+from pydantic import BaseModel
+
+
+class PageStoreEntry(BaseModel):
+    """
+    Position of one stored page in a segment file of a page store.
+    """
+    url: str
+    fetched_at: float
+    segment: str
+    offset: int
+    length: int
+
+
+class PageStore:
+    """
+    Stores the raw html of downloaded question pages, so they can be parsed again without downloading them (see the
+    command "reparse_qa"). Requires the package "zstandard" (pip install abgeordnetenwatch_python[zstd]).
+
+    Every process appends to its own segment "pages-<host>-<pid>.zst" and index "pages-<host>-<pid>.jsonl", so several
+    processes or hosts can share a store directory. Every page is a separate zstd frame, so single pages can be read
+    without decompressing the whole segment. A page is stored again every time it is downloaded, so all versions of a
+    page are kept together with their fetch time.
+    """
+    def __init__(self, directory: Path, level: int = 3):
+        """
+        :param directory: The directory of the store. Created on the first write.
+        :param level: The zstd compression level.
+        """
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError('The page store requires "zstandard" (pip install abgeordnetenwatch_python[zstd]).')
+        self.directory = directory
+        self.level = level
+        self._name = f'pages-{socket.gethostname()}-{os.getpid()}'
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+        self._segment: Optional[BinaryIO] = None
+        self._index = None
+        self._readers: Dict[str, BinaryIO] = {}
+
+    def add(self, url: str, html: str, fetched_at: Optional[float] = None):
+        """
+        Appends a downloaded page to the store.
+
+        :param url: The url of the page.
+        :param html: The content of the page.
+        :param fetched_at: The time of the download as unix timestamp. Defaults to now.
+        """
+        if self._segment is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._segment = open(self.directory / f'{self._name}.zst', 'ab')
+            self._index = open(self.directory / f'{self._name}.jsonl', 'a', encoding='utf-8')
+        data = self._compressor.compress(html.encode('utf-8'))
+        entry = PageStoreEntry(
+            url=url, fetched_at=fetched_at if fetched_at is not None else time.time(), segment=f'{self._name}.zst',
+            offset=self._segment.tell(), length=len(data)
+        )
+        self._segment.write(data)
+        self._segment.flush()
+        # the index is written after the page, so an index entry always points to a complete page
+        self._index.write(entry.model_dump_json() + '\n')
+        self._index.flush()
+
+    def get_entries(self) -> Dict[str, List[PageStoreEntry]]:
+        """
+        Reads the indexes of all processes, that wrote to the store.
+
+        :return: All stored versions per url, sorted by fetch time.
+        """
+        entries: Dict[str, List[PageStoreEntry]] = {}
+        for index_file in sorted(self.directory.glob('pages-*.jsonl')):
+            with open(index_file, encoding='utf-8') as f:
+                for line in f:
+                    # skip a line, that is currently written by another process
+                    if line.endswith('\n'):
+                        entry = PageStoreEntry.model_validate_json(line)
+                        entries.setdefault(entry.url, []).append(entry)
+        for url_entries in entries.values():
+            url_entries.sort(key=lambda e: e.fetched_at)
+        return entries
+
+    def get_latest_entries(self) -> List[PageStoreEntry]:
+        """
+        :return: The newest version of every stored url.
+        """
+        return [url_entries[-1] for url_entries in self.get_entries().values()]
+
+    def read(self, entry: PageStoreEntry) -> str:
+        """
+        :return: The html of the given page.
+        """
+        reader = self._readers.get(entry.segment)
+        if reader is None:
+            reader = self._readers[entry.segment] = open(self.directory / entry.segment, 'rb')
+        reader.seek(entry.offset)
+        return self._decompressor.decompress(reader.read(entry.length)).decode('utf-8')
+
+    def get(self, url: str, before: Optional[float] = None) -> Optional[str]:
+        """
+        :param url: The url of the page.
+        :param before: If given, the newest version fetched before this unix timestamp is returned.
+        :return: The html of the newest stored version of the page or None, if the page is not stored.
+        """
+        url_entries = self.get_entries().get(url, [])
+        if before is not None:
+            url_entries = [e for e in url_entries if e.fetched_at < before]
+        if not url_entries:
+            return None
+        return self.read(url_entries[-1])
+
+    def iter_pages(self, entries: List[PageStoreEntry]) -> Iterator[Tuple[PageStoreEntry, str]]:
+        """
+        Reads the given pages in the order of their position in the segments.
+
+        :return: Tuples (entry, html).
+        """
+        for entry in sorted(entries, key=lambda e: (e.segment, e.offset)):
+            yield entry, self.read(entry)
+
+    def close(self):
+        if self._segment is not None:
+            self._segment.close()
+            self._index.close()
+            self._segment = None
+            self._index = None
+        for reader in self._readers.values():
+            reader.close()
+        self._readers.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
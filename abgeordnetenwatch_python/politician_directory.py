@@ -0,0 +1,368 @@
+import collections
+import datetime
+import json
+import os
+import sys
+import unicodedata
+from array import array
+from pathlib import Path
+from typing import List, Optional, Dict, NamedTuple, Iterable, Sequence, TYPE_CHECKING
+
+from pydantic import BaseModel
+
+from abgeordnetenwatch_python.compression import open_file
+from abgeordnetenwatch_python.models.politicians import Politician
+
+if TYPE_CHECKING:
+    import aiohttp
+
+FIELDS = ['name', 'first_name', 'last_name', 'party', 'residence']
+
+
+class DirectoryEntry(NamedTuple):
+    id: int
+    first_name: str
+    last_name: str
+    party: Optional[str]
+    residence: Optional[str]
+
+    def get_full_name(self) -> str:
+        return '{} {}'.format(self.first_name, self.last_name)
+
+    def get_field(self, field: str) -> str:
+        if field == 'name':
+            return self.get_full_name()
+        return getattr(self, field) or ''
+
+    @staticmethod
+    def from_politician(politician: Politician) -> 'DirectoryEntry':
+        return DirectoryEntry(
+            id=politician.id, first_name=politician.first_name, last_name=politician.last_name,
+            party=politician.party.label if politician.party else None, residence=politician.residence
+        )
+
+
+class SearchResult(NamedTuple):
+    entry: DirectoryEntry
+    # Dice coefficient of the trigrams of the query and the field
+    score: float
+    # every word of the query is the beginning of a word of the field
+    prefix: bool
+
+
+class DirectoryData(BaseModel):
+    """
+    The file format of the politician directory: one list per column, which compresses better than one object per
+    politician.
+    """
+    synced_at: datetime.datetime
+    ids: List[int]
+    first_names: List[str]
+    last_names: List[str]
+    parties: List[Optional[str]]
+    residences: List[Optional[str]]
+
+
+class _FieldIndex(NamedTuple):
+    # the number of the trigram in `offsets` by trigram
+    positions: Dict[str, int]
+    # the indices of the entries with the trigram number i are entry_indices[offsets[i]:offsets[i + 1]]
+    offsets: array
+    entry_indices: array
+    # the number of distinct trigrams per entry
+    num_trigrams: array
+
+    def get(self, trigram: str) -> Sequence[int]:
+        position = self.positions.get(trigram)
+        if position is None:
+            return ()
+        return self.entry_indices[self.offsets[position]:self.offsets[position + 1]]
+
+
+def normalize_name(text: str) -> str:
+    """
+    :return: The text in lower case without accents and punctuation, e.g. "Müller-Lüdenscheidt" -> "muller
+             ludenscheidt".
+    """
+    text = unicodedata.normalize('NFKD', text.casefold())
+    text = ''.join(c if c.isalnum() else ' ' for c in text if not unicodedata.combining(c))
+    return ' '.join(text.split())
+
+
+def get_trigrams(text: str) -> List[str]:
+    """
+    :return: The distinct trigrams of the words of the normalized text. The words are padded with two spaces in front,
+             so the beginnings of words weigh more and prefixes are found.
+    """
+    trigrams = set()
+    for word in text.split(' '):
+        padded = f'  {word} '
+        trigrams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return sorted(trigrams)
+
+
+def _is_prefix(query_words: List[str], words: List[str]) -> bool:
+    return all(any(w.startswith(q) for w in words) for q in query_words)
+
+
+def _build_field_index(entries: List[DirectoryEntry], field: str) -> _FieldIndex:
+    postings: Dict[str, array] = {}
+    num_trigrams = array('H')
+    for i, entry in enumerate(entries):
+        trigrams = get_trigrams(normalize_name(entry.get_field(field)))
+        num_trigrams.append(len(trigrams))
+        for trigram in trigrams:
+            postings.setdefault(trigram, array('I')).append(i)
+    offsets = array('I', [0])
+    entry_indices = array('I')
+    for entry_indices_of_trigram in postings.values():
+        entry_indices.extend(entry_indices_of_trigram)
+        offsets.append(len(entry_indices))
+    return _FieldIndex({trigram: i for i, trigram in enumerate(postings)}, offsets, entry_indices, num_trigrams)
+
+
+class PoliticianDirectory:
+    """
+    Local copy of all politicians of abgeordnetenwatch.de for name resolution without api calls. The politicians are
+    downloaded once in bulk, later syncs only download politicians, that were added since. Names, parties and
+    residences are searched typo-tolerant with a trigram index. The index is saved next to the directory file (with the
+    suffix ".index"), so searches in a new process do not have to build it first.
+
+    The directory only keeps the names, parties and residences. The current statistics of a politician have to be
+    requested by id.
+
+    Usage:
+        directory = PoliticianDirectory(Path('data/politicians.json.gz'))
+        await directory.sync(session)
+        results = directory.search('agela merkl')
+    """
+    def __init__(self, filename: Path):
+        """
+        :param filename: The file of the directory. Files ending with ".gz" or ".zst" are compressed. The entries are
+                         loaded, if it exists.
+        """
+        self.filename = filename
+        self.entries: List[DirectoryEntry] = []
+        self.synced_at: Optional[datetime.datetime] = None
+        # the trigram index per field, built on the first search of the field, if it was not loaded
+        self._indexes: Dict[str, _FieldIndex] = {}
+        if filename.is_file():
+            self.load()
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def index_filename(self) -> Path:
+        return self.filename.with_name(self.filename.name + '.index')
+
+    def load(self):
+        with open_file(self.filename, 'r') as f:
+            data = DirectoryData.model_validate(json.load(f))
+        self.synced_at = data.synced_at
+        self._set_entries(
+            DirectoryEntry(*columns) for columns in
+            zip(data.ids, data.first_names, data.last_names, data.parties, data.residences)
+        )
+        self._load_index()
+
+    def save(self):
+        data = DirectoryData(
+            synced_at=self.synced_at or datetime.datetime.now(), ids=[e.id for e in self.entries],
+            first_names=[e.first_name for e in self.entries], last_names=[e.last_name for e in self.entries],
+            parties=[e.party for e in self.entries], residences=[e.residence for e in self.entries]
+        )
+        self.filename.parent.mkdir(exist_ok=True, parents=True)
+        # write to a temporary file first, so concurrent runs never read a partial file. The suffix of the name decides
+        # the compression, so the process id comes first.
+        tmp_filename = self.filename.with_name(f'{os.getpid()}.tmp.{self.filename.name}')
+        with open_file(tmp_filename, 'w') as f:
+            json.dump(data.model_dump(mode='json'), f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_filename, self.filename)
+        self.synced_at = data.synced_at
+        self._save_index()
+
+    def _get_index_header(self) -> dict:
+        # an index file only belongs to the directory file with the same sync time and number of politicians
+        return {
+            'synced_at': self.synced_at.isoformat() if self.synced_at else None, 'num_entries': len(self.entries),
+            'byteorder': sys.byteorder
+        }
+
+    def _save_index(self):
+        """
+        Writes the trigram indexes of all fields: a json header line with the trigrams, followed by the arrays.
+        """
+        indexes = [self._get_index(field) for field in FIELDS]
+        header = self._get_index_header()
+        header['trigrams'] = [list(index.positions) for index in indexes]
+        header['num_entry_indices'] = [len(index.entry_indices) for index in indexes]
+        tmp_filename = self.index_filename.with_name(f'{os.getpid()}.tmp.{self.index_filename.name}')
+        with open(tmp_filename, 'wb') as f:
+            f.write(json.dumps(header, ensure_ascii=False).encode('utf-8') + b'\n')
+            for index in indexes:
+                index.offsets.tofile(f)
+                index.entry_indices.tofile(f)
+                index.num_trigrams.tofile(f)
+        os.replace(tmp_filename, self.index_filename)
+
+    def _load_index(self):
+        """
+        Loads the trigram indexes of the index file, if it belongs to the loaded directory.
+        """
+        try:
+            with open(self.index_filename, 'rb') as f:
+                header = json.loads(f.readline())
+                if any(header.get(key) != value for key, value in self._get_index_header().items()):
+                    return
+                indexes = {}
+                for field, trigrams, num_entry_indices in zip(FIELDS, header['trigrams'], header['num_entry_indices']):
+                    offsets, entry_indices, num_trigrams = array('I'), array('I'), array('H')
+                    offsets.fromfile(f, len(trigrams) + 1)
+                    entry_indices.fromfile(f, num_entry_indices)
+                    num_trigrams.fromfile(f, len(self.entries))
+                    positions = {trigram: i for i, trigram in enumerate(trigrams)}
+                    indexes[field] = _FieldIndex(positions, offsets, entry_indices, num_trigrams)
+        except (OSError, EOFError, ValueError, KeyError):
+            # a missing or broken index is built again on the first search
+            return
+        self._indexes = indexes
+
+    def _set_entries(self, entries: Iterable[DirectoryEntry]):
+        self.entries = sorted(entries, key=lambda e: e.id)
+        self._indexes = {}
+
+    def get_max_id(self) -> int:
+        return self.entries[-1].id if self.entries else 0
+
+    def update(self, politicians: Iterable[Politician]):
+        """
+        Adds the given politicians. Known politicians are replaced.
+        """
+        self._add_entries(DirectoryEntry.from_politician(p) for p in politicians)
+
+    def _add_entries(self, entries: Iterable[DirectoryEntry]):
+        by_id = {e.id: e for e in self.entries}
+        by_id.update((e.id, e) for e in entries)
+        self._set_entries(by_id.values())
+
+    async def sync(self, session: 'aiohttp.ClientSession', full: bool = False, page_size: int = 1000) -> int:
+        """
+        Downloads the politicians added since the last sync and saves the directory. A full sync downloads all
+        politicians again, so changed names, parties and residences are updated as well.
+
+        :param session: aiohttp session to use for making the request.
+        :param full: Download all politicians instead of the new ones. An empty directory is always synced fully.
+        :param page_size: The number of politicians requested at once.
+        :return: The number of downloaded politicians.
+        """
+        synced_at = datetime.datetime.now()
+        min_id = 0 if full else self.get_max_id()
+        url = 'https://www.abgeordnetenwatch.de/api/v2/politicians'
+        entries = []
+        while True:
+            params = {
+                'id[gt]': str(min_id), 'sort_by': 'id', 'sort_direction': 'asc', 'range_end': str(page_size)
+            }
+            async with session.get(url, raise_for_status=True, params=params) as r:
+                data = await r.json()
+            page = [DirectoryEntry.from_politician(Politician.model_validate(pol_data)) for pol_data in data['data']]
+            entries.extend(page)
+            if len(page) < page_size:
+                break
+            # paging by id instead of an offset, so politicians added meanwhile are not skipped
+            min_id = max(e.id for e in page)
+        if full:
+            self._set_entries(entries)
+        else:
+            self._add_entries(entries)
+        self.synced_at = synced_at
+        # the index is built and saved with the directory
+        self.save()
+        return len(entries)
+
+    def _get_index(self, field: str) -> _FieldIndex:
+        if field not in FIELDS:
+            raise ValueError(f'Unknown field "{field}", expected one of {FIELDS}')
+        if field not in self._indexes:
+            self._indexes[field] = _build_field_index(self.entries, field)
+        return self._indexes[field]
+
+    def _count_common(self, query: str, field: str):
+        index = self._get_index(field)
+        query_trigrams = get_trigrams(normalize_name(query))
+        common = collections.Counter()
+        for trigram in query_trigrams:
+            common.update(index.get(trigram))
+        return common, len(query_trigrams), index.num_trigrams
+
+    def get_scores(self, query: str, field: str = 'name') -> Dict[int, float]:
+        """
+        :return: The Dice coefficient of the trigrams of the query and the field by entry index, for all entries
+                 sharing at least one trigram with the query.
+        """
+        common, num_query_trigrams, num_trigrams = self._count_common(query, field)
+        return {i: 2 * c / (num_query_trigrams + num_trigrams[i]) for i, c in common.items()}
+
+    def search(
+            self, query: str, field: str = 'name', limit: Optional[int] = 10, min_score: float = 0.3
+    ) -> List[SearchResult]:
+        """
+        Searches the politicians typo-tolerant. Politicians, whose field starts with the query words, come first.
+
+        :param query: The text to search for, e.g. "merk" or "angla merkel".
+        :param field: The field to search: one of "name" (first and last name), "first_name", "last_name", "party" or
+                      "residence".
+        :param limit: The maximal number of results. None for all results.
+        :param min_score: The minimal similarity of non-prefix matches between 0 and 1.
+        :return: The results, the best first.
+        """
+        query_words = normalize_name(query).split(' ')
+        common, num_query_trigrams, num_trigrams = self._count_common(query, field)
+        # a prefix match contains all trigrams of the query except the ends of the words
+        min_prefix_common = num_query_trigrams - len(query_words)
+        results = []
+        for i, c in common.items():
+            score = 2 * c / (num_query_trigrams + num_trigrams[i])
+            if score < min_score and c < min_prefix_common:
+                continue
+            entry = self.entries[i]
+            prefix = c >= min_prefix_common and _is_prefix(query_words, normalize_name(entry.get_field(field)).split())
+            if prefix or score >= min_score:
+                results.append(SearchResult(entry, score, prefix))
+        results.sort(key=lambda r: (not r.prefix, -r.score, r.entry.id))
+        return results[:limit] if limit is not None else results
+
+    def find(
+            self, first_name: Optional[str] = None, last_name: Optional[str] = None, min_score: float = 0.5
+    ) -> List[SearchResult]:
+        """
+        Resolves a politician by name like the api, but typo-tolerant: If politicians match the given names exactly
+        (ignoring case and accents), only they are returned. Otherwise, the politicians with an average similarity of
+        the given names of at least `min_score` are returned, the most similar first.
+        """
+        names = {field: value for field, value in (('first_name', first_name), ('last_name', last_name)) if value}
+        if not names:
+            return []
+        scores = {field: self.get_scores(value, field) for field, value in names.items()}
+
+        # exact matches have all trigrams of the query
+        candidates = set.intersection(*(
+            {i for i, score in field_scores.items() if score == 1.0} for field_scores in scores.values()
+        ))
+        exact = [
+            SearchResult(self.entries[i], 1.0, True) for i in sorted(candidates)
+            if all(normalize_name(self.entries[i].get_field(f)) == normalize_name(v) for f, v in names.items())
+        ]
+        if exact:
+            return exact
+
+        total_scores: Dict[int, float] = {}
+        for field_scores in scores.values():
+            for i, score in field_scores.items():
+                total_scores[i] = total_scores.get(i, 0) + score / len(names)
+        results = [
+            SearchResult(self.entries[i], score, False) for i, score in total_scores.items() if score >= min_score
+        ]
+        results.sort(key=lambda r: (-r.score, r.entry.id))
+        return results
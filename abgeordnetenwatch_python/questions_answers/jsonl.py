@@ -0,0 +1,162 @@
+import datetime
+import json
+from pathlib import Path
+from typing import Optional, List, Dict, Iterator, BinaryIO, Tuple
+
+from pydantic import BaseModel
+
+from abgeordnetenwatch_python.models.questions_answers import QuestionAnswerResult, QuestionsAnswers
+
+
+class JsonlIndexEntry(BaseModel):
+    offset: int
+    length: int
+    url: Optional[str] = None
+    question_date: Optional[datetime.date] = None
+
+    @staticmethod
+    def from_qa(qa: QuestionAnswerResult, offset: int, length: int) -> 'JsonlIndexEntry':
+        return JsonlIndexEntry(offset=offset, length=length, url=qa.url, question_date=qa.question_date)
+
+
+class JsonlIndex:
+    """
+    Maps urls and question dates of a jsonl file to the byte offsets of the corresponding lines.
+    """
+    def __init__(self, entries: Optional[List[JsonlIndexEntry]] = None):
+        self.entries: List[JsonlIndexEntry] = []
+        self.by_url: Dict[str, JsonlIndexEntry] = {}
+        self.by_question_date: Dict[datetime.date, List[JsonlIndexEntry]] = {}
+        for entry in entries or []:
+            self.add(entry)
+
+    def add(self, entry: JsonlIndexEntry):
+        self.entries.append(entry)
+        if entry.url is not None:
+            self.by_url[entry.url] = entry
+        if entry.question_date is not None:
+            self.by_question_date.setdefault(entry.question_date, []).append(entry)
+
+    def end_offset(self) -> int:
+        """
+        :return: The offset directly behind the last indexed line.
+        """
+        if not self.entries:
+            return 0
+        return max(entry.offset + entry.length for entry in self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def get_index_filename(filename: Path) -> Path:
+    """
+    :return: The filename of the sidecar index for the given jsonl file.
+    """
+    return filename.with_name(filename.name + '.idx')
+
+
+def encode_line(qa: QuestionAnswerResult) -> bytes:
+    return (json.dumps(qa.model_dump(mode='json'), ensure_ascii=False) + '\n').encode('utf-8')
+
+
+def encode_index_line(entry: JsonlIndexEntry) -> bytes:
+    return (entry.model_dump_json() + '\n').encode('utf-8')
+
+
+def _iter_lines(f: BinaryIO) -> Iterator[Tuple[int, bytes]]:
+    offset = 0
+    for line in f:
+        yield offset, line
+        offset += len(line)
+
+
+def build_jsonl_index(filename: Path) -> JsonlIndex:
+    """
+    Scans the given jsonl file and (re)writes its sidecar index.
+
+    :param filename: The jsonl file to index.
+    :return: The created index.
+    """
+    index = JsonlIndex()
+    with open(filename, 'rb') as f, open(get_index_filename(filename), 'wb') as index_file:
+        for offset, line in _iter_lines(f):
+            if not line.strip():
+                continue
+            qa = QuestionAnswerResult.model_validate_json(line)
+            entry = JsonlIndexEntry.from_qa(qa, offset, len(line))
+            index.add(entry)
+            index_file.write(encode_index_line(entry))
+    return index
+
+
+def load_jsonl_index(filename: Path) -> JsonlIndex:
+    """
+    Loads the sidecar index of the given jsonl file. If the index is missing or does not cover the whole file, it is
+    rebuilt.
+
+    :param filename: The jsonl file whose index should be loaded.
+    :return: The index of the file.
+    """
+    index_filename = get_index_filename(filename)
+    if index_filename.is_file():
+        with open(index_filename, 'rb') as f:
+            index = JsonlIndex([JsonlIndexEntry.model_validate_json(line) for line in f if line.strip()])
+        if index.end_offset() == filename.stat().st_size:
+            return index
+    return build_jsonl_index(filename)
+
+
+def _read_entries(filename: Path, entries: List[JsonlIndexEntry]) -> List[QuestionAnswerResult]:
+    results = []
+    with open(filename, 'rb') as f:
+        for entry in entries:
+            f.seek(entry.offset)
+            results.append(QuestionAnswerResult.model_validate_json(f.read(entry.length)))
+    return results
+
+
+def read_question_answer(
+        filename: Path, url: str, index: Optional[JsonlIndex] = None
+) -> Optional[QuestionAnswerResult]:
+    """
+    Reads a single question from a jsonl file with one seek.
+
+    :param filename: The jsonl file to read from.
+    :param url: The url of the question.
+    :param index: The index of the file. If None, the sidecar index is loaded.
+    :return: The question with the given url or None, if the file does not contain it.
+    """
+    if index is None:
+        index = load_jsonl_index(filename)
+    entry = index.by_url.get(url)
+    if entry is None:
+        return None
+    return _read_entries(filename, [entry])[0]
+
+
+def read_questions_answers_by_date(
+        filename: Path, question_date: datetime.date, index: Optional[JsonlIndex] = None
+) -> List[QuestionAnswerResult]:
+    """
+    Reads all questions asked at the given date from a jsonl file.
+
+    :param filename: The jsonl file to read from.
+    :param question_date: The date of the questions.
+    :param index: The index of the file. If None, the sidecar index is loaded.
+    :return: A (possibly empty) list of questions.
+    """
+    if index is None:
+        index = load_jsonl_index(filename)
+    return _read_entries(filename, index.by_question_date.get(question_date, []))
+
+
+def iter_jsonl_file(filename: Path) -> Iterator[QuestionAnswerResult]:
+    with open(filename, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield QuestionAnswerResult.model_validate_json(line)
+
+
+def parse_jsonl_file(filename: Path) -> QuestionsAnswers:
+    return QuestionsAnswers(questions_answers=list(iter_jsonl_file(filename)))
@@ -1,23 +1,28 @@
+import codecs
 import csv
 import datetime
-import functools
 import html.parser
 import json
 import asyncio
 import re
 import warnings
 from pathlib import Path
-from typing import List, Optional, Tuple, Iterable, Set
+from typing import List, Optional, Tuple, Iterable, Set, Dict, Callable, AsyncIterator, Container, TYPE_CHECKING
 
-import aiohttp
-from bs4 import BeautifulSoup
+from abgeordnetenwatch_python.models.questions_answers import QuestionAnswerResult, str_to_date, QuestionsAnswers, \
+    TqdmArgs, normalize_tqdm_args, QuestionTile, sort_questions_answers, normalize_text
+from abgeordnetenwatch_python.cache import CacheInfo, CacheIndex
+from abgeordnetenwatch_python.hedging import fetch_text
+from abgeordnetenwatch_python.page_store import PageStore
+from abgeordnetenwatch_python.questions_answers.jsonl import parse_jsonl_file
+from abgeordnetenwatch_python.questions_answers.writers import QuestionsAnswersWriter, QuestionsAnswersCsvWriter, \
+    QuestionsAnswersJsonWriter, QuestionsAnswersTxtWriter, open_questions_answers_writer
 
-from tqdm import tqdm
-from tqdm.asyncio import tqdm_asyncio
+if TYPE_CHECKING:
+    import aiohttp
 
-from abgeordnetenwatch_python.models.questions_answers import QuestionAnswerResult, str_to_date, QuestionsAnswers, \
-    TqdmArgs, normalize_tqdm_args
-from abgeordnetenwatch_python.cache import CacheInfo
+# how often a listing page is requested, before its timeout fails the politician
+LISTING_PAGE_ATTEMPTS = 3
 
 
 def normalize_base_url(base_url: str) -> str:
@@ -32,25 +37,96 @@ def normalize_base_url(base_url: str) -> str:
 
 
 class QuestionsAnswersParser(html.parser.HTMLParser):
-    def __init__(self, base_url: str, hrefs: Optional[Set[str]] = None):
+    """
+    Collects the question urls of a listing page. For every question tile, the answered state and the date of the
+    answer is collected in `tiles`.
+
+    The parser can be fed chunk by chunk. `done` is set, as soon as the rest of the page is not needed anymore: Either
+    the question list is parsed completely (the pager follows it) or a question out of `known_hrefs` was found.
+    """
+    def __init__(
+            self, base_url: str, hrefs: Optional[Set[str]] = None, known_hrefs: Optional[Container[str]] = None
+    ):
         super().__init__()
         self.base_url = normalize_base_url(base_url)
         self.hrefs = hrefs if hrefs is not None else set()
+        self.tiles: Dict[str, QuestionTile] = {}
+        self.known_hrefs = known_hrefs
+        self.found_known = False
+        self.done = False
+
+        # state of the question tile that is currently parsed
+        self._tile: Optional[QuestionTile] = None
+        self._article_depth = 0
+        self._div_depth = 0
+        self._info_depth: Optional[int] = None
+        self._info_texts: List[str] = []
+        self._num_infos = 0
 
     def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        if self.done:
+            # the rest of the current chunk is ignored as well, so the result does not depend on the chunk size
+            return
+        attrs = dict(attrs)
         if tag == 'a':
-            attrs = dict(attrs)
             if 'href' in attrs:
                 href = attrs['href']
                 if href.startswith(self.base_url):
                     self.hrefs.add(href)
+                    if self._tile is not None and not self._tile.href:
+                        self._tile.href = href
+                        if self.known_hrefs is not None and href in self.known_hrefs:
+                            self.found_known = True
+                            self.done = True
+        elif tag == 'article':
+            self._article_depth += 1
+            if attrs.get('itemtype') == 'https://schema.org/Question' and self._tile is None:
+                self._tile = QuestionTile(href='')
+                self._num_infos = 0
+        elif tag == 'div':
+            self._div_depth += 1
+            if self._tile is not None and self._info_depth is None \
+                    and 'tile__politician__info' in (attrs.get('class') or '').split():
+                self._info_depth = self._div_depth
+                self._info_texts = []
+
+        if self._tile is not None and attrs.get('itemprop') in ('acceptedAnswer', 'suggestedAnswer'):
+            self._tile.answered = True
+
+        # the pager (<nav class="pager">) follows the list of questions
+        if self.tiles and 'pager' in (attrs.get('class') or '').split():
+            self.done = True
+
+    def handle_data(self, data: str):
+        if self._info_depth is not None and not self.done:
+            self._info_texts.append(data)
 
     def handle_endtag(self, tag: str):
-        pass
+        if self.done:
+            return
+        if tag == 'div':
+            if self._info_depth is not None and self._div_depth == self._info_depth:
+                self._handle_info(normalize_text(''.join(self._info_texts)))
+                self._info_depth = None
+            self._div_depth -= 1
+        elif tag == 'article':
+            self._article_depth -= 1
+            if self._article_depth == 0 and self._tile is not None:
+                if self._tile.href:
+                    self.tiles[self._tile.href] = self._tile
+                self._tile = None
+
+    def _handle_info(self, text: str):
+        # like on the question page, the first info contains the question date, the second one the answer date
+        self._num_infos += 1
+        if self._num_infos >= 2:
+            self._tile.answered = True
+            self._tile.answer_date = date_from_text(text)
 
 
 async def download_question_answer(
-        url: str, session: aiohttp.ClientSession, cache_info: Optional[CacheInfo]
+        url: str, session: 'aiohttp.ClientSession', cache_info: Optional[CacheInfo],
+        page_store: Optional[PageStore] = None
 ) -> QuestionAnswerResult:
     cached_result = None
     if cache_info:
@@ -58,20 +134,37 @@ async def download_question_answer(
         if cache_info.should_cache(cached_result):
             return cached_result
     result = QuestionAnswerResult(url=url)
-    async with session.get(url) as r:
-        if r.ok:
-            parse_question_answer(await r.text(), result)
-            if cached_result is not None and cached_result.answer is None and result.answer is not None:
-                if cache_info.num_answers_missing == 0:
-                    warnings.warn(f'Found answer, but did not expect to find one more.')
-                cache_info.num_answers_missing -= 1
-        else:
-            result.errors.append(f'Page download for "{url}" failed with code {r.status}')
+    try:
+        status, content = await fetch_text(url, session)
+    except asyncio.TimeoutError:
+        # the question is not cached without question, so it is loaded again by the next run
+        result.errors.append(f'Page download for "{url}" timed out')
+        return result
+    if content is not None:
+        if page_store is not None:
+            page_store.add(url, content)
+        parse_question_answer(content, result)
+        if cached_result is not None and cached_result.answer is None and result.answer is not None:
+            if cache_info.num_answers_missing == 0:
+                warnings.warn(f'Found answer, but did not expect to find one more.')
+            cache_info.num_answers_missing -= 1
+    else:
+        result.errors.append(f'Page download for "{url}" failed with code {status}')
     return result
 
 
-def normalize_text(text: str) -> str:
-    return ' '.join(filter(bool, text.strip().replace('\n', ' ').split(' ')))
+async def feed_response(parser: QuestionsAnswersParser, resp: 'aiohttp.ClientResponse', chunk_size: int = 16384):
+    """
+    Feeds the body of the given response chunk by chunk into the parser. If the parser is done before the body is read
+    completely, the connection is closed.
+    """
+    decoder = codecs.getincrementaldecoder(resp.charset or 'utf-8')(errors='replace')
+    async for chunk in resp.content.iter_chunked(chunk_size):
+        parser.feed(decoder.decode(chunk))
+        if parser.done:
+            resp.close()
+            return
+    parser.feed(decoder.decode(b'', final=True))
 
 
 def _parse_tag(tag):
@@ -90,6 +183,8 @@ def date_from_text(text: str) -> Optional[datetime.date]:
 
 
 def parse_question_answer(content: str, qa_result: QuestionAnswerResult):
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(content, 'html.parser')
 
     main_article = soup.find_all('article', {'itemtype': 'https://schema.org/Question'})[0]
@@ -134,46 +229,26 @@ def print_questions_answers(questions_answers: QuestionsAnswers):
 
 
 def questions_answers_to_json(filename: Path, questions_answers: QuestionsAnswers):
-    data = questions_answers.model_dump(mode='json')
-    with open(filename, 'w') as f:
-        json.dump(data, f, indent=2)
+    with QuestionsAnswersJsonWriter(filename) as writer:
+        writer.write_all(questions_answers.questions_answers)
 
 
 def questions_answers_to_txt(filename: Path, questions_answers: QuestionsAnswers):
-    with open(filename, 'w') as f:
-        for qa in questions_answers.questions_answers:
-            question = qa.question or 'Frage konnte nicht runtergeladen werden'
-            f.write('\n' + '-' * 50 + '\n\n')
-            f.write('Frage vom {}:\n'.format(qa.get_question_date()))
-            f.write(question + '\n')
-            if qa.question_addition:
-                f.write('\nErläuterungen:\n')
-                f.write(qa.question_addition + '\n')
-            if qa.answer:
-                f.write('\nAntwort vom {}:\n'.format(qa.get_answer_date()))
-                f.write(qa.answer + '\n')
+    with QuestionsAnswersTxtWriter(filename) as writer:
+        writer.write_all(questions_answers.questions_answers)
 
 
 def questions_answers_to_csv(filename: Path, questions_answers: QuestionsAnswers):
-    with open(filename, 'w', newline='') as csvfile:
-        fieldnames = ['url', 'question_date', 'question', 'question_addition', 'answer_date', 'answer']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-        writer.writeheader()
+    with QuestionsAnswersCsvWriter(filename) as writer:
+        writer.write_all(questions_answers.questions_answers)
 
-        for qa in questions_answers.questions_answers:
-            dump_data = qa.model_dump(mode='json')
-            dump_data = {key: dump_data[key] for key in fieldnames}
-            writer.writerow(dump_data)
 
-
-def save_answers_to_format(questions_answers: QuestionsAnswers, filename: Path, fmt: str):
-    if fmt == 'csv':
-        questions_answers_to_csv(filename, questions_answers)
-    elif fmt == 'json':
-        questions_answers_to_json(filename, questions_answers)
-    elif fmt == 'txt':
-        questions_answers_to_txt(filename, questions_answers)
+def save_answers_to_format(questions_answers: QuestionsAnswers, filename: Path, fmt: str, append: bool = False):
+    """
+    :param append: Append the questions and answers to an existing jsonl file, see `open_questions_answers_writer()`.
+    """
+    with open_questions_answers_writer(filename, fmt, append) as writer:
+        writer.write_all(questions_answers.questions_answers)
 
 
 def parse_questions_answers(input_file: Path, input_format: Optional[str] = None) -> QuestionsAnswers:
@@ -186,6 +261,8 @@ def parse_questions_answers(input_file: Path, input_format: Optional[str] = None
         with open(input_file, 'r') as f:
             data = json.load(f)
             return QuestionsAnswers.model_validate(data)
+    elif input_format == 'jsonl':
+        return parse_jsonl_file(input_file)
     elif input_format == 'csv':
         results = []
         with open(input_file, 'r', newline='') as csvfile:
@@ -229,33 +306,6 @@ def parse_txt_file(input_file: Path) -> QuestionsAnswers:
     return QuestionsAnswers(questions_answers=questions_answers)
 
 
-def sort_questions_answers(questions_answers: QuestionsAnswers, sort_by: str):
-    """
-    Sort the given QuestionAnswerResults.
-
-    :param questions_answers: The questions and answers to sort
-    :param sort_by: The value to sort by. Either 'answer' or 'question'. Sorts by the date of the answer or the
-                    question.
-    :return: The same list, sorted by answer or question date.
-    """
-    if sort_by == 'answer':
-        def _key_function(qa):
-            if qa.answer_date:
-                return qa.answer_date
-            if qa.question_date:
-                return qa.question_date
-            return datetime.date.today()
-    elif sort_by == 'question':
-        def _key_function(qa):
-            if qa.question_date:
-                return qa.question_date
-            return datetime.date.today()
-    else:
-        raise ValueError('Invalid sort option: {}'.format(sort_by))
-    questions_answers = list(sorted(questions_answers.questions_answers, key=_key_function))
-    return QuestionsAnswers(questions_answers=questions_answers)
-
-
 def get_questions_answers_url(url: str, page: Optional[int] = None):
     if page is None:
         return '{}/{}'.format(url, 'fragen-antworten')
@@ -264,65 +314,113 @@ def get_questions_answers_url(url: str, page: Optional[int] = None):
 
 
 async def async_get_questions_answers_urls(
-        url: str, session: aiohttp.ClientSession, cache_info: Optional[CacheInfo] = None, verbose: bool = False,
+        url: str, session: 'aiohttp.ClientSession', cache_info: Optional[CacheInfo] = None, verbose: bool = False,
         threads: int = 5, tqdm_args: Optional[TqdmArgs] = None,
         politician_name: Optional[str] = None,
 ) -> List[str]:
     sem = asyncio.Semaphore(threads)
     base_url = 'https://www.abgeordnetenwatch.de'
 
-    async def fetch_page(page_index: int):
-        page_url = get_questions_answers_url(url, page_index)
-        async with sem, session.get(page_url) as resp:
-            if resp.status != 200:
-                return None
-            return await resp.text()
-
     total = None
+    # the hrefs found on the listing pages, without the cached ones
     all_urls = set()
+    num_cached = 0
+    known_hrefs = None
     # if we know how many questions are missing ...
     if cache_info is not None and cache_info.num_questions_missing != -1:
         # ... then, we know the number of questions missing + the cached questions = all questions
-        total = len(cache_info.questions_answers) + cache_info.num_questions_missing
-        all_urls = set([qa.url.removeprefix(base_url) for qa in cache_info.questions_answers.questions_answers])
+        num_cached = len(cache_info.index)
+        total = num_cached + cache_info.num_questions_missing
+        known_hrefs = _CachedHrefs(cache_info.index, base_url)
+
+    def num_urls() -> int:
+        return num_cached + len(all_urls)
+
+    def add_hrefs(hrefs: Set[str]):
+        all_urls.update(hrefs if known_hrefs is None else (href for href in hrefs if href not in known_hrefs))
+
+    async def fetch_page(page_index: int, stop_at_known: bool) -> Optional[QuestionsAnswersParser]:
+        page_url = get_questions_answers_url(url, page_index)
+        for attempt in range(LISTING_PAGE_ATTEMPTS):
+            page_parser = QuestionsAnswersParser(url, known_hrefs=known_hrefs if stop_at_known else None)
+            try:
+                async with sem, session.get(page_url) as resp:
+                    if resp.status != 200:
+                        return None
+                    await feed_response(page_parser, resp)
+                return page_parser
+            except asyncio.TimeoutError:
+                warnings.warn(f'Download of "{page_url}" timed out')
+                # a page missing in the middle would end the paging early, and the dossier would be saved with the
+                # new statistics, so the skipped questions are never loaded. Failing the politician keeps the old
+                # dossier, which is loaded again by the next run.
+                if attempt == LISTING_PAGE_ATTEMPTS - 1:
+                    raise
+
+    def is_answer_missing() -> bool:
+        # the cache info decides by the tiles parsed so far
+        return cache_info is not None and cache_info.is_answer_missing()
 
-    parser = QuestionsAnswersParser(url, all_urls)
     pages = 0
     pbar = None
     if verbose:
+        from tqdm import tqdm
         tqdm_args = normalize_tqdm_args(tqdm_args, f'collecting {politician_name or "questions"}')
         pbar = tqdm(total=total, **tqdm_args)
-        pbar.update(len(all_urls))
+        pbar.update(num_urls())
+
     running = True
     while running:
-        # if we found all urls, stop searching for more
-        if total is not None and len(all_urls) >= total:
-            if len(all_urls) > total:
-                warnings.warn(f'Found more questions than expected. Expected {total}, found {len(all_urls)}')
+        # if we found all urls and know which cached questions got answered, stop searching for more
+        if total is not None and num_urls() >= total and not is_answer_missing():
+            if num_urls() > total:
+                warnings.warn(f'Found more questions than expected. Expected {total}, found {num_urls()}')
             break
 
-        tasks = [asyncio.create_task(fetch_page(p)) for p in range(pages, pages + threads)]
-        for page_text in await asyncio.gather(*tasks):
+        # while looking for newly answered questions, the tiles of known questions are needed as well
+        stop_at_known = not is_answer_missing()
+        tasks = [asyncio.create_task(fetch_page(p, stop_at_known)) for p in range(pages, pages + threads)]
+        for page_parser in await asyncio.gather(*tasks):
             old_count = len(all_urls)
-            if page_text:
-                parser.feed(page_text)
-
-            # if no new urls here, stop searching for more
-            running = len(all_urls) != old_count
+            found_tiles = False
+            if page_parser is not None:
+                add_hrefs(page_parser.hrefs)
+                if cache_info is not None and page_parser.tiles:
+                    cache_info.add_tiles({base_url + href: tile for href, tile in page_parser.tiles.items()})
+                    found_tiles = True
+
+            # if no new urls here, stop searching for more, except we still look for newly answered questions
+            running = len(all_urls) != old_count or (found_tiles and is_answer_missing())
             if pbar is not None:
                 pbar.update(len(all_urls) - old_count)
-            if cache_info is not None and not cache_info.is_question_missing():
+            if cache_info is not None and not cache_info.is_question_missing() and not is_answer_missing():
+                running = False
+            # questions are listed newest first, so there is nothing new behind a known question
+            if page_parser is not None and page_parser.found_known:
                 running = False
         pages += threads
 
     if total is not None:
-        if total != len(all_urls):
-            warnings.warn(f'Expected {total} questions, but found {len(all_urls)}')
+        if total != num_urls():
+            warnings.warn(f'Expected {total} questions, but found {num_urls()}')
 
     if pbar is not None:
         pbar.close()
 
-    return [str(base_url + href) for href in all_urls]
+    urls = [str(base_url + href) for href in all_urls]
+    if num_cached:
+        urls.extend(cache_info.index.get_urls())
+    return urls
+
+
+class _CachedHrefs:
+    # the hrefs of the questions in a cache index, to stop the listing pages at the first cached question
+    def __init__(self, index: CacheIndex, base_url: str):
+        self.index = index
+        self.base_url = base_url
+
+    def __contains__(self, href: str) -> bool:
+        return self.base_url + href in self.index
 
 
 def get_batches(frames: List, batch_size: int) -> Iterable[List]:
@@ -342,10 +440,27 @@ def get_batches(frames: List, batch_size: int) -> Iterable[List]:
 
 
 async def load_questions_answers(
-        politician_url: str, session: aiohttp.ClientSession, verbose: bool = False, threads: int = 1,
+        politician_url: str, session: 'aiohttp.ClientSession', verbose: bool = False, threads: int = 1,
         url_threads: int = -1, cache_info: Optional[CacheInfo] = None, tqdm_args: TqdmArgs = None,
-        politician_name: Optional[str] = None,
+        politician_name: Optional[str] = None, sink: Optional[QuestionsAnswersWriter] = None,
+        page_store: Optional[PageStore] = None,
 ) -> QuestionsAnswers:
+    """
+    Loads all questions and answers of the politician with the given url.
+
+    :param politician_url: The abgeordnetenwatch url of the politician.
+    :param session: The aiohttp session to use for making the requests.
+    :param verbose: Output progress information.
+    :param threads: The number of questions to download in parallel.
+    :param url_threads: The number of listing pages to download in parallel. If -1, the argument "threads" is used.
+    :param cache_info: Previously downloaded questions and answers to skip.
+    :param tqdm_args: Additional arguments to pass to tqdm.
+    :param politician_name: Name of the politician to show in the progress bar.
+    :param sink: If given, every result is written to this writer as soon as it is downloaded instead of being
+                 collected. The returned QuestionsAnswers is empty in that case.
+    :param page_store: If given, the html of every downloaded question page is stored in it.
+    :return: The loaded questions and answers.
+    """
     if url_threads == -1:
         url_threads = threads
 
@@ -354,11 +469,132 @@ async def load_questions_answers(
         politician_name=politician_name
     )
 
-    gather_func = asyncio.gather
+    pbar = None
     if verbose:
+        from tqdm import tqdm
         tqdm_args = normalize_tqdm_args(tqdm_args, f"loading {politician_name or 'questions'}")
-        gather_func = functools.partial(tqdm_asyncio.gather, total=len(urls), **tqdm_args)
-    tasks = [download_question_answer(url, session, cache_info) for url in urls]
-    results: List[QuestionAnswerResult] = await gather_func(*tasks)
+        pbar = tqdm(total=len(urls), **tqdm_args)
+
+    results: List[Optional[QuestionAnswerResult]] = [None] * len(urls) if sink is None else []
+
+    def on_result(index: int, result: QuestionAnswerResult):
+        if sink is None:
+            results[index] = result
+        else:
+            sink.write(result)
+        if pbar is not None:
+            pbar.update(1)
+
+    try:
+        await download_questions_answers(urls, session, cache_info, threads, on_result, page_store)
+    finally:
+        if pbar is not None:
+            pbar.close()
 
     return QuestionsAnswers(questions_answers=results)
+
+
+async def iter_questions_answers(
+        politician_url: str, session: 'aiohttp.ClientSession', threads: int = 1, url_threads: int = -1,
+        cache_info: Optional[CacheInfo] = None, page_store: Optional[PageStore] = None,
+) -> AsyncIterator[QuestionAnswerResult]:
+    """
+    Like `load_questions_answers()`, but yields every question as soon as it is downloaded and parsed, in the order of
+    completion. If the iteration is stopped early (break, `aclose()` or cancellation of the consuming task), the
+    pending downloads are cancelled.
+
+    Usage:
+        async for result in iter_questions_answers(politician.abgeordnetenwatch_url, session, threads=8):
+            ...
+
+    :param politician_url: The abgeordnetenwatch url of the politician.
+    :param session: The aiohttp session to use for making the requests.
+    :param threads: The number of questions to download in parallel.
+    :param url_threads: The number of listing pages to download in parallel. If -1, the argument "threads" is used.
+    :param cache_info: Previously downloaded questions and answers to skip. Cached questions are yielded as well.
+    :param page_store: If given, the html of every downloaded question page is stored in it.
+    """
+    if url_threads == -1:
+        url_threads = threads
+
+    urls = await async_get_questions_answers_urls(politician_url, session, cache_info=cache_info, threads=url_threads)
+    async for _index, result in iter_download_questions_answers(urls, session, cache_info, threads, page_store):
+        yield result
+
+
+async def iter_download_questions_answers(
+        urls: Iterable[str], session: 'aiohttp.ClientSession', cache_info: Optional[CacheInfo], threads: int,
+        page_store: Optional[PageStore] = None
+) -> AsyncIterator[Tuple[int, QuestionAnswerResult]]:
+    """
+    Downloads the given questions with a fixed number of workers and yields the results as they complete. The urls are
+    passed to the workers and the results back through bounded queues, so the number of pending downloads and buffered
+    results does not grow with the number of questions, even if the consumer is slow.
+
+    The workers are cancelled, when the iteration is stopped early.
+
+    :param urls: The urls of the questions to download.
+    :param session: The aiohttp session to use for making the requests.
+    :param cache_info: Previously downloaded questions and answers to skip.
+    :param threads: The number of workers, that download questions in parallel.
+    :param page_store: If given, the html of every downloaded question page is stored in it.
+    :return: Tuples of the index of the url and the result for every question.
+    """
+    threads = max(threads, 1)
+    url_queue: asyncio.Queue[Optional[Tuple[int, str]]] = asyncio.Queue(maxsize=threads * 2)
+    # a result, an exception of a worker or None, if a worker is done
+    result_queue: asyncio.Queue = asyncio.Queue(maxsize=threads * 2)
+
+    async def produce():
+        for index, url in enumerate(urls):
+            await url_queue.put((index, url))
+        for _ in range(threads):
+            await url_queue.put(None)
+
+    async def work():
+        try:
+            while True:
+                item = await url_queue.get()
+                if item is None:
+                    break
+                index, url = item
+                await result_queue.put((index, await download_question_answer(url, session, cache_info, page_store)))
+        except Exception as e:
+            await result_queue.put(e)
+        else:
+            await result_queue.put(None)
+
+    tasks = [asyncio.create_task(produce())] + [asyncio.create_task(work()) for _ in range(threads)]
+    try:
+        running = threads
+        while running:
+            item = await result_queue.get()
+            if item is None:
+                running -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        # wait for the cancelled downloads, so their connections are released
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def download_questions_answers(
+        urls: Iterable[str], session: 'aiohttp.ClientSession', cache_info: Optional[CacheInfo], threads: int,
+        on_result: Callable[[int, QuestionAnswerResult], None], page_store: Optional[PageStore] = None
+):
+    """
+    Downloads the given questions with a fixed number of workers, see `iter_download_questions_answers()`.
+
+    :param urls: The urls of the questions to download.
+    :param session: The aiohttp session to use for making the requests.
+    :param cache_info: Previously downloaded questions and answers to skip.
+    :param threads: The number of workers, that download questions in parallel.
+    :param on_result: Called with the index of the url and the result for every downloaded question.
+    :param page_store: If given, the html of every downloaded question page is stored in it.
+    """
+    async for index, result in iter_download_questions_answers(urls, session, cache_info, threads, page_store):
+        on_result(index, result)
@@ -0,0 +1,174 @@
+import abc
+import csv
+import json
+import textwrap
+from pathlib import Path
+from typing import Iterable, Optional, TextIO, BinaryIO, Union
+
+from abgeordnetenwatch_python.models.questions_answers import QuestionAnswerResult
+from abgeordnetenwatch_python.questions_answers.jsonl import JsonlIndexEntry, get_index_filename, encode_line, \
+    encode_index_line, load_jsonl_index
+
+
+class QuestionsAnswersWriter(abc.ABC):
+    """
+    Writes QuestionAnswerResults one by one to a file. Every result is flushed as soon as it is written, so partial
+    output is visible while a download is still running.
+
+    Writers can be used as context managers and as sink for `load_questions_answers()`.
+    """
+    def __init__(self, filename: Path):
+        self.filename = filename
+        self.file: Optional[Union[TextIO, BinaryIO]] = self._open()
+        self.num_written = 0
+
+    def _open(self) -> TextIO:
+        return open(self.filename, 'w')
+
+    def _write_header(self):
+        pass
+
+    @abc.abstractmethod
+    def _write_entry(self, qa: QuestionAnswerResult):
+        pass
+
+    def _write_footer(self):
+        pass
+
+    def write(self, qa: QuestionAnswerResult):
+        if self.file is None:
+            raise ValueError(f'Writer for "{self.filename}" is already closed')
+        if self.num_written == 0:
+            self._write_header()
+        self._write_entry(qa)
+        self.num_written += 1
+        self.file.flush()
+
+    def write_all(self, questions_answers: Iterable[QuestionAnswerResult]):
+        for qa in questions_answers:
+            self.write(qa)
+
+    def close(self):
+        if self.file is None:
+            return
+        if self.num_written == 0:
+            self._write_header()
+        self._write_footer()
+        self.file.close()
+        self.file = None
+
+    def __enter__(self) -> 'QuestionsAnswersWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class QuestionsAnswersJsonWriter(QuestionsAnswersWriter):
+    """
+    Writes the same document as `QuestionsAnswers.model_dump()` with an indentation of 2, but entry by entry.
+    """
+    def _write_header(self):
+        self.file.write('{\n  "questions_answers": [')
+
+    def _write_entry(self, qa: QuestionAnswerResult):
+        separator = ',' if self.num_written else ''
+        entry = json.dumps(qa.model_dump(mode='json'), indent=2)
+        self.file.write(separator + '\n' + textwrap.indent(entry, ' ' * 4))
+
+    def _write_footer(self):
+        if self.num_written:
+            self.file.write('\n  ')
+        self.file.write(']\n}')
+
+
+class QuestionsAnswersTxtWriter(QuestionsAnswersWriter):
+    def _write_entry(self, qa: QuestionAnswerResult):
+        question = qa.question or 'Frage konnte nicht runtergeladen werden'
+        self.file.write('\n' + '-' * 50 + '\n\n')
+        self.file.write('Frage vom {}:\n'.format(qa.get_question_date()))
+        self.file.write(question + '\n')
+        if qa.question_addition:
+            self.file.write('\nErläuterungen:\n')
+            self.file.write(qa.question_addition + '\n')
+        if qa.answer:
+            self.file.write('\nAntwort vom {}:\n'.format(qa.get_answer_date()))
+            self.file.write(qa.answer + '\n')
+
+
+class QuestionsAnswersCsvWriter(QuestionsAnswersWriter):
+    FIELDNAMES = ['url', 'question_date', 'question', 'question_addition', 'answer_date', 'answer']
+
+    def __init__(self, filename: Path):
+        super().__init__(filename)
+        self.writer = csv.DictWriter(self.file, fieldnames=self.FIELDNAMES)
+
+    def _open(self) -> TextIO:
+        return open(self.filename, 'w', newline='')
+
+    def _write_header(self):
+        self.writer.writeheader()
+
+    def _write_entry(self, qa: QuestionAnswerResult):
+        dump_data = qa.model_dump(mode='json')
+        self.writer.writerow({key: dump_data[key] for key in self.FIELDNAMES})
+
+
+class QuestionsAnswersJsonlWriter(QuestionsAnswersWriter):
+    """
+    Writes one QuestionAnswerResult per line and maintains a sidecar index (see `jsonl.load_jsonl_index()`), that maps
+    urls and question dates to byte offsets.
+    """
+    def __init__(self, filename: Path, append: bool = False):
+        self.append = append
+        self.offset = 0
+        self.index_file = None
+        super().__init__(filename)
+
+    def _open(self) -> BinaryIO:
+        if self.append and self.filename.is_file():
+            # makes sure, the index covers all existing lines before we append to it
+            self.offset = load_jsonl_index(self.filename).end_offset()
+            self.index_file = open(get_index_filename(self.filename), 'ab')
+            return open(self.filename, 'ab')
+        self.index_file = open(get_index_filename(self.filename), 'wb')
+        return open(self.filename, 'wb')
+
+    def _write_entry(self, qa: QuestionAnswerResult):
+        line = encode_line(qa)
+        self.file.write(line)
+        self.index_file.write(encode_index_line(JsonlIndexEntry.from_qa(qa, self.offset, len(line))))
+        self.index_file.flush()
+        self.offset += len(line)
+
+    def close(self):
+        super().close()
+        if self.index_file is not None:
+            self.index_file.close()
+            self.index_file = None
+
+
+WRITERS = {
+    'csv': QuestionsAnswersCsvWriter,
+    'json': QuestionsAnswersJsonWriter,
+    'jsonl': QuestionsAnswersJsonlWriter,
+    'txt': QuestionsAnswersTxtWriter,
+}
+
+
+def open_questions_answers_writer(filename: Path, fmt: str, append: bool = False) -> QuestionsAnswersWriter:
+    """
+    Opens a streaming writer for the given format.
+
+    :param filename: The file to write to. Existing files are overwritten, except with `append`.
+    :param fmt: One of 'csv', 'json', 'jsonl' or 'txt'.
+    :param append: Append to an existing file instead of overwriting it. Only supported by 'jsonl'.
+    :return: A writer, that accepts QuestionAnswerResults one by one.
+    """
+    if fmt not in WRITERS:
+        raise ValueError('Unsupported file format: {}'.format(fmt))
+    if append:
+        if fmt != 'jsonl':
+            raise ValueError('Appending is only supported for jsonl, not for {}'.format(fmt))
+        return QuestionsAnswersJsonlWriter(filename, append=True)
+    return WRITERS[fmt](filename)
@@ -0,0 +1,246 @@
+import gzip
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional, Dict, List, Any
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+from pydantic import BaseModel
+from yarl import URL
+
+from abgeordnetenwatch_python.session import SessionWrapper
+
+
+class RecordIndexEntry(BaseModel):
+    """
+    Position of one recorded response in an archive file of a record directory.
+    """
+    key: str
+    url: str
+    status: int
+    content_type: Optional[str] = None
+    charset: Optional[str] = None
+    archive: str
+    offset: int
+    length: int
+    fetched_at: float
+
+
+def get_request_key(url: str, params: Optional[Dict[str, Any]] = None, method: str = 'GET') -> str:
+    """
+    :return: A key identifying a request, which does not depend on the order of the query parameters.
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query.extend((str(k), str(v)) for k, v in params.items())
+    query.sort()
+    return f'{method} {urlunsplit(parts._replace(query=urlencode(query), fragment=""))}'
+
+
+class ReplayContent:
+    """
+    Replacement for `aiohttp.StreamReader` reading from a recorded body.
+    """
+    def __init__(self, body: bytes):
+        self._body = body
+        self._pos = 0
+
+    async def read(self, n: int = -1) -> bytes:
+        end = len(self._body) if n < 0 else self._pos + n
+        data = self._body[self._pos:end]
+        self._pos += len(data)
+        return data
+
+    async def iter_chunked(self, n: int):
+        while self._pos < len(self._body):
+            yield await self.read(n)
+
+
+class ReplayResponse:
+    """
+    Response served from a record directory. Provides the parts of `aiohttp.ClientResponse` used by this package.
+    """
+    def __init__(self, url: str, status: int, body: bytes, content_type: Optional[str] = None,
+                 charset: Optional[str] = None):
+        self.url = URL(url)
+        self.method = 'GET'
+        self.status = status
+        self.reason = 'OK' if status < 400 else ''
+        self.charset = charset
+        self.content_type = content_type or 'application/octet-stream'
+        headers = CIMultiDict()
+        if content_type is not None:
+            headers['Content-Type'] = content_type if charset is None else f'{content_type}; charset={charset}'
+        self.headers = CIMultiDictProxy(headers)
+        self.content = ReplayContent(body)
+        self._body = body
+
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self, encoding: Optional[str] = None, errors: str = 'strict') -> str:
+        return self._body.decode(encoding or self.charset or 'utf-8', errors)
+
+    async def json(self, **kwargs) -> Any:
+        return json.loads(self._body)
+
+    def raise_for_status(self):
+        if not self.ok:
+            request_info = aiohttp.RequestInfo(self.url, self.method, CIMultiDictProxy(CIMultiDict()), self.url)
+            raise aiohttp.ClientResponseError(
+                request_info, (), status=self.status, message=self.reason, headers=self.headers
+            )
+
+    def close(self):
+        pass
+
+    def release(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+class _ResponseContext:
+    # the object returned by `get()`, so it can be used as "async with session.get(...) as r"
+    def __init__(self, coro):
+        self._coro = coro
+        self._response = None
+
+    async def __aenter__(self) -> ReplayResponse:
+        self._response = await self._coro
+        return self._response
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._response.release()
+
+    def __await__(self):
+        return self._coro.__await__()
+
+
+class RecordingSession(SessionWrapper):
+    """
+    Session, that records all responses to a directory, so a run can be replayed later with `ReplaySession`.
+
+    The directory contains an archive "records-<pid>.gz" and an index "index-<pid>.jsonl" per process. Every response
+    body is a separate gzip member in the archive, so single responses can be decompressed without reading the whole
+    archive, and the archive is still a valid gzip file. The index holds one `RecordIndexEntry` per line.
+    """
+    def __init__(self, session: aiohttp.ClientSession, directory: Path):
+        super().__init__(session)
+        self.directory = directory
+        directory.mkdir(parents=True, exist_ok=True)
+        pid = os.getpid()
+        self._archive_name = f'records-{pid}.gz'
+        self._archive = open(directory / self._archive_name, 'ab')
+        self._index = open(directory / f'index-{pid}.jsonl', 'a', encoding='utf-8')
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, raise_for_status: bool = False,
+            **kwargs) -> _ResponseContext:
+        return _ResponseContext(self._get(url, params, raise_for_status, **kwargs))
+
+    async def _get(self, url: str, params: Optional[Dict[str, Any]], raise_for_status: bool,
+                   **kwargs) -> ReplayResponse:
+        async with self.session.get(url, params=params, **kwargs) as r:
+            body = await r.read()
+            response = ReplayResponse(str(r.url), r.status, body, r.content_type, r.charset)
+        self._write(get_request_key(url, params), response, body)
+        if raise_for_status:
+            response.raise_for_status()
+        return response
+
+    def _write(self, key: str, response: ReplayResponse, body: bytes):
+        data = gzip.compress(body, mtime=0)
+        offset = self._archive.tell()
+        self._archive.write(data)
+        self._archive.flush()
+        entry = RecordIndexEntry(
+            key=key, url=str(response.url), status=response.status, content_type=response.content_type,
+            charset=response.charset,
+            archive=self._archive_name, offset=offset, length=len(data), fetched_at=time.time()
+        )
+        self._index.write(entry.model_dump_json() + '\n')
+        self._index.flush()
+
+    async def close(self):
+        self._archive.close()
+        self._index.close()
+        await super().close()
+
+
+class ReplaySession:
+    """
+    Session, that serves all requests from a directory written by `RecordingSession` without using the network.
+    If a request was recorded several times, the responses are served in the recorded order and the last response is
+    repeated afterwards. Requests, that were not recorded, raise an `aiohttp.ClientConnectionError`.
+    """
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.closed = False
+        self._entries: Dict[str, List[RecordIndexEntry]] = {}
+        self._served: Dict[str, int] = {}
+        self._archives: Dict[str, Any] = {}
+        for index_file in sorted(directory.glob('index-*.jsonl')):
+            with open(index_file, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = RecordIndexEntry.model_validate_json(line)
+                        self._entries.setdefault(entry.key, []).append(entry)
+        for entries in self._entries.values():
+            entries.sort(key=lambda e: e.fetched_at)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def _next_entry(self, key: str) -> Optional[RecordIndexEntry]:
+        entries = self._entries.get(key)
+        if not entries:
+            return None
+        served = self._served.get(key, 0)
+        self._served[key] = served + 1
+        return entries[min(served, len(entries) - 1)]
+
+    def _read_body(self, entry: RecordIndexEntry) -> bytes:
+        archive = self._archives.get(entry.archive)
+        if archive is None:
+            archive = self._archives[entry.archive] = open(self.directory / entry.archive, 'rb')
+        archive.seek(entry.offset)
+        return gzip.decompress(archive.read(entry.length))
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, raise_for_status: bool = False,
+            **kwargs) -> _ResponseContext:
+        return _ResponseContext(self._get(url, params, raise_for_status))
+
+    async def _get(self, url: str, params: Optional[Dict[str, Any]], raise_for_status: bool) -> ReplayResponse:
+        key = get_request_key(url, params)
+        entry = self._next_entry(key)
+        if entry is None:
+            raise aiohttp.ClientConnectionError(f'{key} was not recorded in {self.directory}')
+        response = ReplayResponse(entry.url, entry.status, self._read_body(entry), entry.content_type, entry.charset)
+        if raise_for_status:
+            response.raise_for_status()
+        return response
+
+    async def close(self):
+        for archive in self._archives.values():
+            archive.close()
+        self._archives.clear()
+        self.closed = True
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
@@ -0,0 +1,196 @@
+import asyncio
+import time
+from pathlib import Path
+from typing import Optional, List, Dict, Tuple, Callable, TYPE_CHECKING
+
+from abgeordnetenwatch_python.change_feed import ChangeFeedWriter
+from abgeordnetenwatch_python.compression import FileCompression, find_dossier_files
+from abgeordnetenwatch_python.mandate_cache import MandateCache
+from abgeordnetenwatch_python.models.parliament import Parliament, get_parliament
+from abgeordnetenwatch_python.models.politician_dossier import PoliticianDossier, \
+    load_politician_dossier_with_cache_file
+from abgeordnetenwatch_python.models.politicians import Politician, get_politicians_by_ids, get_default_filename
+from abgeordnetenwatch_python.page_store import PageStore
+from abgeordnetenwatch_python.work_queue import in_shard
+
+if TYPE_CHECKING:
+    import aiohttp
+
+# (statistic_questions, statistic_questions_answered) of a politician
+Statistics = Tuple[Optional[int], Optional[int]]
+
+
+def get_statistics(politician: Politician) -> Statistics:
+    return politician.statistic_questions, politician.statistic_questions_answered
+
+
+class RefreshDaemon:
+    """
+    Keeps the dossiers of a parliament fresh with one long-lived session: The statistics of all politicians are polled
+    in bulk every `poll_interval` seconds, and only politicians whose number of questions or answers changed are
+    downloaded again. Their dossiers are used as cache, so only the new questions and answers are requested. The
+    politicians of the parliament are looked up again every `mandate_interval` seconds.
+
+    The request volume can be limited with a request budget of the session (see `SessionConfig.requests_per_hour`).
+
+    Usage:
+        async with create_session(SessionConfig(limit=8, requests_per_hour=2000)) as session:
+            await RefreshDaemon(session, 'Bundestag', Path('data/json/bundestag'), threads=8).run()
+    """
+    def __init__(
+            self, session: 'aiohttp.ClientSession', parliament_label: str, outdir: Path, threads: int = 1,
+            sort_by: str = 'question', poll_interval: float = 15 * 60, mandate_interval: float = 24 * 60 * 60,
+            shard: Optional[Tuple[int, int]] = None, mandate_cache: Optional[MandateCache] = None,
+            page_store: Optional[PageStore] = None, compression: Optional[FileCompression] = None,
+            change_feed: Optional[ChangeFeedWriter] = None, log: Optional[Callable[[str], None]] = print
+    ):
+        """
+        :param session: The session used for all requests.
+        :param parliament_label: The label of the parliament, e.g. "Bundestag".
+        :param outdir: The directory of the dossiers.
+        :param threads: The number of politicians loaded in parallel and of questions per politician.
+        :param sort_by: Sort the questions of the dossiers by "question" or "answer" date.
+        :param poll_interval: Seconds between two polls of the statistics.
+        :param mandate_interval: Seconds between two lookups of the politicians of the parliament.
+        :param shard: If given, only the politicians of shard (i, n) are refreshed.
+        :param mandate_cache: If given, the mandates of closed parliament periods are taken from this cache.
+        :param page_store: If given, the html of every downloaded question page is stored in it.
+        :param compression: The compression of the dossiers.
+        :param change_feed: If given, the new questions and answers are written to it.
+        :param log: Called with progress messages. None for no output.
+        """
+        self.session = session
+        self.parliament_label = parliament_label
+        self.outdir = outdir
+        self.threads = threads
+        self.sort_by = sort_by
+        self.poll_interval = poll_interval
+        self.mandate_interval = mandate_interval
+        self.shard = shard
+        self.mandate_cache = mandate_cache
+        self.page_store = page_store
+        self.compression = compression or FileCompression()
+        self.change_feed = change_feed
+        self.log = log
+
+        self.parliament: Optional[Parliament] = None
+        self.politician_ids: List[int] = []
+        # statistics of the saved dossiers by politician id
+        self.saved_statistics: Dict[int, Statistics] = {}
+        self.num_errors = 0
+        self._politician_ids_updated: Optional[float] = None
+
+    def _log(self, message: str):
+        if self.log is not None:
+            self.log(message)
+
+    def load_saved_statistics(self):
+        """
+        Reads the statistics of the politicians from the saved dossiers. Only the politicians are read, not the
+        questions and answers.
+        """
+        if not self.outdir.is_dir():
+            return
+        for path in sorted(find_dossier_files(self.outdir)):
+            politician = PoliticianDossier.read_politician(path)
+            if politician is not None:
+                self.saved_statistics[politician.id] = get_statistics(politician)
+        self._log(f'found {len(self.saved_statistics)} saved dossiers')
+
+    async def update_politician_ids(self, force: bool = False):
+        """
+        Looks up the politicians of the parliament, if the last lookup is older than `mandate_interval`.
+        """
+        now = time.monotonic()
+        if not force and self._politician_ids_updated is not None \
+                and now - self._politician_ids_updated < self.mandate_interval:
+            return
+        if self.parliament is None:
+            self.parliament = await get_parliament(self.session, label=self.parliament_label)
+        politician_ids = await self.parliament.get_politician_ids(
+            self.session, verbose=False, mandate_cache=self.mandate_cache
+        )
+        if self.shard is not None:
+            politician_ids = [p_id for p_id in politician_ids if in_shard(p_id, self.shard)]
+        self.politician_ids = politician_ids
+        self._politician_ids_updated = now
+        self._log(f'found {len(politician_ids)} politicians')
+
+    async def poll(self) -> List[Politician]:
+        """
+        Requests the statistics of all politicians in bulk.
+
+        :return: The politicians, whose statistics differ from their saved dossier. Politicians with a saved dossier
+                 come first, politicians without one after them.
+        """
+        politicians = await get_politicians_by_ids(self.session, self.politician_ids)
+        changed = [p for p in politicians if self.saved_statistics.get(p.id, get_statistics(p)) != get_statistics(p)]
+        new = [p for p in politicians if p.id not in self.saved_statistics]
+        self._log(f'{len(changed)} changed and {len(new)} new of {len(politicians)} politicians')
+        return changed + new
+
+    async def refresh(self, politicians: List[Politician]) -> int:
+        """
+        Downloads the new questions and answers of the given politicians, `threads` politicians at a time.
+
+        :return: The number of refreshed politicians. Failed politicians are retried by the next poll.
+        """
+        queue: asyncio.Queue[Politician] = asyncio.Queue()
+        for politician in politicians:
+            queue.put_nowait(politician)
+        refreshed = 0
+
+        async def work():
+            nonlocal refreshed
+            while not queue.empty():
+                politician = queue.get_nowait()
+                filename = get_default_filename(politician, self.outdir, self.compression.method)
+                try:
+                    await load_politician_dossier_with_cache_file(
+                        politician, filename, session=self.session, sort_by=self.sort_by, threads=self.threads,
+                        url_threads=1, page_store=self.page_store, compression_level=self.compression.level,
+                        change_feed=self.change_feed
+                    )
+                except Exception as e:
+                    self._log(f'failed to refresh politician {politician.id}: {e}')
+                    self.num_errors += 1
+                    continue
+                self.saved_statistics[politician.id] = get_statistics(politician)
+                refreshed += 1
+
+        await asyncio.gather(*[work() for _ in range(max(self.threads, 1))])
+        return refreshed
+
+    async def run_once(self) -> int:
+        """
+        Updates the politicians of the parliament if due, polls their statistics and refreshes the changed ones.
+
+        :return: The number of refreshed politicians.
+        """
+        await self.update_politician_ids()
+        started = time.monotonic()
+        changed = await self.poll()
+        refreshed = await self.refresh(changed)
+        if changed:
+            self._log(f'refreshed {refreshed} of {len(changed)} politicians in {time.monotonic() - started:.0f}s')
+        return refreshed
+
+    async def run(self, iterations: Optional[int] = None):
+        """
+        Refreshes the parliament every `poll_interval` seconds.
+
+        :param iterations: The number of polls. None runs until cancelled.
+        """
+        await asyncio.to_thread(self.load_saved_statistics)
+        iteration = 0
+        while iterations is None or iteration < iterations:
+            started = time.monotonic()
+            try:
+                await self.run_once()
+            except Exception as e:
+                # e.g. the api is not reachable. The next poll tries again.
+                self._log(f'poll failed: {e}')
+                self.num_errors += 1
+            iteration += 1
+            if iterations is None or iteration < iterations:
+                await asyncio.sleep(max(self.poll_interval - (time.monotonic() - started), 0))
@@ -0,0 +1,68 @@
+import asyncio
+import time
+from typing import Optional, TYPE_CHECKING
+
+from abgeordnetenwatch_python.session import SessionWrapper, WrappedRequest
+
+if TYPE_CHECKING:
+    import aiohttp
+
+
+class RequestBudget:
+    """
+    Token bucket, that allows `requests_per_hour` requests on average and bursts of up to `burst` requests.
+    """
+    def __init__(self, requests_per_hour: float, burst: Optional[int] = None):
+        """
+        :param requests_per_hour: The average number of requests per hour.
+        :param burst: The number of requests, that can be sent at once after a pause. Defaults to a minute of budget,
+                      but at least 1.
+        """
+        self.rate = requests_per_hour / 3600
+        self.capacity = float(burst if burst is not None else max(requests_per_hour / 60, 1))
+        self.tokens = self.capacity
+        self.num_requests = 0
+        self.waited = 0.0
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.tokens + (now - self._updated) * self.rate, self.capacity)
+        self._updated = now
+
+    async def acquire(self):
+        """
+        Waits until the budget allows another request.
+        """
+        # the lock keeps the waiting requests in order
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                delay = (1 - self.tokens) / self.rate
+                self.waited += delay
+                await asyncio.sleep(delay)
+                self._refill()
+            self.tokens -= 1
+            self.num_requests += 1
+
+
+class BudgetSession(SessionWrapper):
+    """
+    Session, that sends at most the requests allowed by a `RequestBudget`. Requests beyond the budget wait.
+    """
+    def __init__(self, session: 'aiohttp.ClientSession', budget: RequestBudget):
+        super().__init__(session)
+        self.budget = budget
+
+    def get(self, url: str, **kwargs) -> WrappedRequest:
+        return WrappedRequest(self, url, kwargs)
+
+    async def before_request(self):
+        await self.budget.acquire()
+
+    def get_summary(self) -> str:
+        return 'request budget: {} requests, waited {:.0f}s for the budget'.format(
+            self.budget.num_requests, self.budget.waited
+        )
+
@@ -0,0 +1,81 @@
+import asyncio
+import random
+from typing import Tuple, Any, TYPE_CHECKING
+
+from abgeordnetenwatch_python.adaptive_concurrency import is_overload_status, is_overload_error
+from abgeordnetenwatch_python.session import SessionWrapper, WrappedRequest
+
+if TYPE_CHECKING:
+    import aiohttp
+
+
+class RetryPolicy:
+    """
+    Decides how often and after which delay a failed request is sent again: after timeouts, dropped connections and
+    responses with status 429 or 5xx, with an exponentially growing delay and random jitter.
+    """
+    def __init__(self, retries: int = 3, backoff: float = 1.0, max_delay: float = 30.0):
+        """
+        :param retries: The maximal number of retries per request.
+        :param backoff: The delay before the first retry in seconds. Every further retry waits twice as long.
+        :param max_delay: The maximal delay before a retry in seconds.
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.max_delay = max_delay
+        self.num_retries = 0
+        # requests, that failed after all retries
+        self.num_failures = 0
+
+    def get_delay(self, attempt: int) -> float:
+        """
+        :param attempt: The number of the failed attempt, starting with 0.
+        :return: The seconds to wait before the next attempt. Between half and the full exponential delay, so retries
+                 of simultaneous requests are spread.
+        """
+        delay = min(self.backoff * 2 ** attempt, self.max_delay)
+        return delay * random.uniform(0.5, 1.0)
+
+
+class RetrySession(SessionWrapper):
+    """
+    Session, that sends requests again, which failed according to a `RetryPolicy`. Only opening a request is retried,
+    errors while reading the body are raised to the caller.
+    """
+    def __init__(self, session: 'aiohttp.ClientSession', policy: RetryPolicy):
+        super().__init__(session)
+        self.policy = policy
+
+    def get(self, url: str, **kwargs) -> WrappedRequest:
+        return WrappedRequest(self, url, kwargs)
+
+    async def open_request(self, url: str, kwargs: dict) -> Tuple[Any, 'aiohttp.ClientResponse']:
+        policy = self.policy
+        attempt = 0
+        while True:
+            retry = attempt < policy.retries
+            try:
+                request, response = await super().open_request(url, kwargs)
+            except Exception as e:
+                if not is_overload_error(e):
+                    raise
+                if not retry:
+                    policy.num_failures += 1
+                    raise
+            else:
+                if not is_overload_status(response.status):
+                    return request, response
+                if not retry:
+                    # the caller decides about the failed response
+                    policy.num_failures += 1
+                    return request, response
+                await request.__aexit__(None, None, None)
+            policy.num_retries += 1
+            await asyncio.sleep(policy.get_delay(attempt))
+            attempt += 1
+
+    def get_summary(self) -> str:
+        return 'retried {} requests, {} failed after {} retries'.format(
+            self.policy.num_retries, self.policy.num_failures, self.policy.retries
+        )
+
@@ -0,0 +1,303 @@
+import argparse
+import importlib.util
+from pathlib import Path
+from typing import Optional, Callable, List, Tuple, Any, TYPE_CHECKING
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    import aiohttp
+
+
+def get_default_accept_encoding() -> str:
+    """
+    :return: The encodings to accept. Brotli is only accepted if aiohttp can decode it (pip install aiohttp[speedups]).
+    """
+    encodings = ['gzip', 'deflate']
+    if importlib.util.find_spec('brotli') is not None or importlib.util.find_spec('brotlicffi') is not None:
+        encodings.append('br')
+    return ', '.join(encodings)
+
+
+class SessionWrapper:
+    """
+    Base class for objects, that wrap an aiohttp session and change the behaviour of `get()`. All other attributes are
+    taken from the wrapped session, so a wrapper can be used wherever a session is expected.
+    """
+    def __init__(self, session: 'aiohttp.ClientSession'):
+        self.session = session
+
+    def get(self, url: str, **kwargs):
+        return self.session.get(url, **kwargs)
+
+    async def close(self):
+        await self.session.close()
+
+    def get_summary(self) -> Optional[str]:
+        """
+        :return: A summary of the statistics collected by this wrapper, e.g. the chosen concurrency limits. None, if
+                 the wrapper collects no statistics.
+        """
+        return None
+
+    # hooks of the requests returned as `WrappedRequest` by the `get()` of a subclass
+
+    async def before_request(self):
+        """
+        Awaited before a request is sent, e.g. to wait for a free slot.
+        """
+
+    async def open_request(self, url: str, kwargs: dict) -> Tuple[Any, 'aiohttp.ClientResponse']:
+        """
+        Sends the request with the wrapped session.
+
+        :return: The request context of the wrapped session, which is exited after the body was read, and the response.
+        """
+        request = self.session.get(url, **kwargs)
+        return request, await request.__aenter__()
+
+    async def after_request(self, error: Optional[BaseException]):
+        """
+        Awaited once for every request, for which `before_request()` returned: after the body was read, or after
+        sending the request or reading the body failed.
+
+        :param error: The exception, that ended the request, or None.
+        """
+
+    def __getattr__(self, name: str):
+        return getattr(self.session, name)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
+class WrappedRequest:
+    """
+    The object returned by `get()` of a session wrapper, so it can be used as "async with session.get(...) as r". It
+    calls the request hooks of the wrapper.
+    """
+    def __init__(self, wrapper: SessionWrapper, url: str, kwargs: dict):
+        self._wrapper = wrapper
+        self._url = url
+        self._kwargs = kwargs
+        self._request = None
+
+    async def __aenter__(self) -> 'aiohttp.ClientResponse':
+        await self._wrapper.before_request()
+        try:
+            self._request, response = await self._wrapper.open_request(self._url, self._kwargs)
+        except BaseException as e:
+            await self._wrapper.after_request(e)
+            raise
+        return response
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        try:
+            await self._request.__aexit__(exc_type, exc_val, exc_tb)
+        finally:
+            await self._wrapper.after_request(exc_val)
+
+
+def get_session_summaries(session: 'aiohttp.ClientSession') -> List[str]:
+    """
+    :return: The summaries of all wrappers of the given session, that collect statistics.
+    """
+    summaries = []
+    while isinstance(session, SessionWrapper):
+        summary = session.get_summary()
+        if summary is not None:
+            summaries.append(summary)
+        session = session.session
+    return summaries
+
+
+class SessionConfig(BaseModel):
+    """
+    Connection pool settings for sessions created by `create_session()`.
+    """
+    # maximal number of simultaneous connections
+    limit: int = 100
+    # maximal number of simultaneous connections to the same host. 0 means no limit.
+    limit_per_host: int = 0
+    # seconds to keep idle connections open for reuse
+    keepalive_timeout: float = 30.0
+    # seconds to cache dns lookups. None caches forever.
+    ttl_dns_cache: Optional[int] = 300
+    # value of the Accept-Encoding header. None uses `get_default_accept_encoding()`.
+    accept_encoding: Optional[str] = None
+    # overall timeout of a single request in seconds. None uses the aiohttp default.
+    total_timeout: Optional[float] = None
+    # seconds to wait for a connection to the server. None uses the aiohttp default.
+    connect_timeout: Optional[float] = None
+    # seconds to wait for the next part of a response. None waits until the total timeout.
+    read_timeout: Optional[float] = None
+    # if given, all responses are recorded to this directory (see record_replay.RecordingSession)
+    record_dir: Optional[Path] = None
+    # if given, responses are served from this directory instead of the network (see record_replay.ReplaySession)
+    replay_dir: Optional[Path] = None
+    # adapt the number of simultaneous requests between min_concurrency and limit to the latency and errors of the
+    # server (see adaptive_concurrency.AdaptiveSession)
+    adaptive_concurrency: bool = False
+    min_concurrency: int = 1
+    # send failed requests (timeouts, dropped connections, 429 and 5xx) up to this many times again
+    # (see retry.RetrySession)
+    retries: int = 0
+    # request question pages again, that take longer than 95% of the previous ones (see hedging.HedgingSession)
+    hedge_requests: bool = False
+    # if given, at most this many requests are sent per hour on average (see request_budget.BudgetSession)
+    requests_per_hour: Optional[float] = None
+
+
+def create_session(
+        config: Optional[SessionConfig] = None, log: Optional[Callable[[str], None]] = None, **kwargs
+) -> 'aiohttp.ClientSession':
+    """
+    Creates a session with a tuned connection pool. Has to be called inside a running event loop. If recording,
+    replaying, a request budget, adaptive concurrency, retries or hedging is configured, the session is wrapped
+    accordingly.
+
+    Usage:
+        async with create_session(SessionConfig(limit=8)) as session:
+            politicians = await get_politicians(session, last_name='Merkel')
+
+    :param config: The settings of the connection pool. If None, the defaults are used.
+    :param log: Called with messages about changes of the adaptive concurrency limit, e.g. `tqdm.write`.
+    :param kwargs: Additional arguments for aiohttp.ClientSession.
+    :return: A new aiohttp session.
+    """
+    if config is None:
+        config = SessionConfig()
+    session = _create_base_session(config, **kwargs)
+    if config.requests_per_hour is not None:
+        # innermost, so every request sent to the server counts
+        from abgeordnetenwatch_python.request_budget import BudgetSession, RequestBudget
+        session = BudgetSession(session, RequestBudget(config.requests_per_hour))
+    if config.adaptive_concurrency:
+        # local imports to prevent cyclic import
+        from abgeordnetenwatch_python.adaptive_concurrency import AdaptiveSession, AdaptiveLimiter
+        limiter = AdaptiveLimiter(max_limit=config.limit, min_limit=config.min_concurrency, log=log)
+        session = AdaptiveSession(session, limiter)
+    if config.retries > 0:
+        # outside of the adaptive limit, so it sees every failed attempt
+        from abgeordnetenwatch_python.retry import RetrySession, RetryPolicy
+        session = RetrySession(session, RetryPolicy(config.retries))
+    if config.hedge_requests:
+        # outermost, so hedged requests are limited as well
+        from abgeordnetenwatch_python.hedging import HedgingSession
+        session = HedgingSession(session)
+    return session
+
+
+def _create_base_session(config: SessionConfig, **kwargs) -> 'aiohttp.ClientSession':
+    if config.replay_dir is not None:
+        # local imports to prevent cyclic import
+        from abgeordnetenwatch_python.record_replay import ReplaySession
+        return ReplaySession(config.replay_dir)
+
+    # aiohttp takes long to import, so it is only imported, when a session is created
+    import aiohttp
+
+    connector = aiohttp.TCPConnector(
+        limit=config.limit, limit_per_host=config.limit_per_host, keepalive_timeout=config.keepalive_timeout,
+        ttl_dns_cache=config.ttl_dns_cache, use_dns_cache=True,
+    )
+    headers = {'Accept-Encoding': config.accept_encoding or get_default_accept_encoding()}
+    headers.update(kwargs.pop('headers', {}))
+    if 'timeout' not in kwargs and (
+            config.total_timeout is not None or config.connect_timeout is not None or config.read_timeout is not None
+    ):
+        default_timeout = aiohttp.client.DEFAULT_TIMEOUT
+        kwargs['timeout'] = aiohttp.ClientTimeout(
+            total=config.total_timeout if config.total_timeout is not None else default_timeout.total,
+            sock_connect=config.connect_timeout if config.connect_timeout is not None else default_timeout.sock_connect,
+            sock_read=config.read_timeout,
+        )
+    session = aiohttp.ClientSession(connector=connector, headers=headers, **kwargs)
+
+    if config.record_dir is not None:
+        from abgeordnetenwatch_python.record_replay import RecordingSession
+        session = RecordingSession(session, config.record_dir)
+    return session
+
+
+def add_session_arguments(parser: argparse.ArgumentParser):
+    """
+    Adds the command line arguments used by `session_config_from_args()` to the given parser.
+    """
+    parser.add_argument(
+        '--limit-per-host', type=int, default=0,
+        help='Maximal number of simultaneous connections per host. Defaults to 0 (no limit besides --threads).'
+    )
+    parser.add_argument(
+        '--keepalive-timeout', type=float, default=30.0,
+        help='Seconds to keep idle connections open for reuse. Defaults to 30.'
+    )
+    parser.add_argument(
+        '--dns-ttl', type=int, default=300, help='Seconds to cache dns lookups. Defaults to 300.'
+    )
+    parser.add_argument(
+        '--accept-encoding', type=str, default=None,
+        help='Value of the Accept-Encoding header. Defaults to "gzip, deflate" (and "br", if brotli is installed).'
+    )
+    parser.add_argument(
+        '--connect-timeout', type=float, default=30.0,
+        help='Seconds to wait for a connection to the server per request. Defaults to 30.'
+    )
+    parser.add_argument(
+        '--read-timeout', type=float, default=60.0,
+        help='Seconds to wait for the next part of a response. A request, that hangs longer, fails with a timeout. '
+             'Defaults to 60.'
+    )
+    parser.add_argument(
+        '--hedge-requests', action='store_true',
+        help='Request a question page a second time, if it takes longer than 95%% of the previous pages, and use the '
+             'faster response.'
+    )
+    parser.add_argument(
+        '--retries', type=int, default=0,
+        help='Send requests again, that failed with a timeout, a dropped connection or a 429 or 5xx response, up to '
+             'this many times with exponential backoff. Defaults to 0.'
+    )
+    parser.add_argument(
+        '--requests-per-hour', type=float, default=None,
+        help='Send at most this many requests per hour on average. Requests beyond the budget wait. Defaults to no '
+             'limit.'
+    )
+    parser.add_argument(
+        '--adaptive-concurrency', action='store_true',
+        help='Adapt the number of simultaneous requests between --min-threads and --threads: more requests while the '
+             'server answers quickly, fewer after timeouts and 429 or 5xx responses.'
+    )
+    parser.add_argument(
+        '--min-threads', type=int, default=1,
+        help='Minimal number of simultaneous requests with --adaptive-concurrency. Defaults to 1.'
+    )
+    record_replay_group = parser.add_mutually_exclusive_group()
+    record_replay_group.add_argument(
+        '--record', type=Path, default=None, metavar='DIR',
+        help='Record all requests and responses to the given directory.'
+    )
+    record_replay_group.add_argument(
+        '--replay', type=Path, default=None, metavar='DIR',
+        help='Serve all requests from responses recorded with --record instead of the network.'
+    )
+
+
+def session_config_from_args(args: argparse.Namespace, **kwargs) -> SessionConfig:
+    """
+    Creates a session config from arguments added by `add_session_arguments()`. The number of connections is taken from
+    the "--threads" argument.
+
+    :param args: The parsed arguments.
+    :param kwargs: Additional settings of the config.
+    """
+    return SessionConfig(
+        limit=args.threads, limit_per_host=args.limit_per_host, keepalive_timeout=args.keepalive_timeout,
+        ttl_dns_cache=args.dns_ttl, accept_encoding=args.accept_encoding, record_dir=args.record,
+        replay_dir=args.replay, adaptive_concurrency=args.adaptive_concurrency, min_concurrency=args.min_threads,
+        connect_timeout=args.connect_timeout, read_timeout=args.read_timeout, hedge_requests=args.hedge_requests,
+        requests_per_hour=args.requests_per_hour, retries=args.retries, **kwargs
+    )
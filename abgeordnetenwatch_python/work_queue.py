@@ -0,0 +1,162 @@
+import os
+import socket
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Optional, Dict, Iterator, Tuple
+
+
+class WorkQueue:
+    """
+    A queue of politician ids in a SQLite file, that is shared by several worker processes, possibly on different hosts
+    with a shared filesystem. Every id is claimed by one worker at a time. Claims, that were not completed or renewed
+    within `claim_timeout` seconds, expire and can be claimed again, so ids of crashed workers are not lost.
+    """
+    PENDING = 'pending'
+    CLAIMED = 'claimed'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    def __init__(self, filename: Path, claim_timeout: float = 60 * 60, worker_id: Optional[str] = None):
+        """
+        :param filename: The SQLite file of the queue. Created, if it does not exist.
+        :param claim_timeout: Seconds after which an unfinished claim expires.
+        :param worker_id: Name of this worker. Defaults to "<hostname>:<pid>".
+        """
+        self.filename = filename
+        self.claim_timeout = claim_timeout
+        self.worker_id = worker_id or f'{socket.gethostname()}:{os.getpid()}'
+        filename.parent.mkdir(exist_ok=True, parents=True)
+        with self._transaction() as con:
+            con.execute(
+                'CREATE TABLE IF NOT EXISTS items ('
+                'id INTEGER PRIMARY KEY, status TEXT NOT NULL, worker TEXT, claimed_at REAL, '
+                'attempts INTEGER NOT NULL DEFAULT 0, error TEXT)'
+            )
+            con.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # a new connection per transaction, so the queue can be used from several threads
+        con = sqlite3.connect(self.filename, timeout=60, isolation_level=None)
+        try:
+            con.execute('BEGIN IMMEDIATE')
+            try:
+                yield con
+            except BaseException:
+                con.execute('ROLLBACK')
+                raise
+            con.execute('COMMIT')
+        finally:
+            con.close()
+
+    def fill(self, item_ids: Iterable[int], reset: bool = False):
+        """
+        Adds the given ids to the queue and marks the queue as filled.
+
+        :param item_ids: The ids to add. Ids already in the queue are kept in their current state.
+        :param reset: If True, all ids in the queue are removed first.
+        """
+        with self._transaction() as con:
+            if reset:
+                self._reset(con)
+            con.executemany(
+                'INSERT OR IGNORE INTO items (id, status) VALUES (?, ?)', ((i, self.PENDING) for i in item_ids)
+            )
+            con.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', ('filled_at', str(time.time())))
+
+    def reset(self):
+        """
+        Removes all ids and marks the queue as not filled, so workers wait for the next `fill()` instead of finding the
+        finished ids of the previous run.
+        """
+        with self._transaction() as con:
+            self._reset(con)
+
+    @staticmethod
+    def _reset(con: sqlite3.Connection):
+        con.execute('DELETE FROM items')
+        con.execute('DELETE FROM meta WHERE key = ?', ('filled_at',))
+
+    def is_filled(self) -> bool:
+        with self._transaction() as con:
+            return con.execute('SELECT 1 FROM meta WHERE key = ?', ('filled_at',)).fetchone() is not None
+
+    def claim(self) -> Optional[int]:
+        """
+        Claims the next pending id or an id whose claim expired.
+
+        :return: The claimed id or None, if there is nothing left to claim.
+        """
+        now = time.time()
+        with self._transaction() as con:
+            row = con.execute(
+                'SELECT id FROM items WHERE status = ? OR (status = ? AND claimed_at < ?) ORDER BY id LIMIT 1',
+                (self.PENDING, self.CLAIMED, now - self.claim_timeout)
+            ).fetchone()
+            if row is None:
+                return None
+            con.execute(
+                'UPDATE items SET status = ?, worker = ?, claimed_at = ?, attempts = attempts + 1 WHERE id = ?',
+                (self.CLAIMED, self.worker_id, now, row[0])
+            )
+            return row[0]
+
+    def renew(self, item_id: int) -> bool:
+        """
+        Extends the claim of the given id.
+
+        :return: False, if the id is not claimed by this worker anymore.
+        """
+        with self._transaction() as con:
+            cursor = con.execute(
+                'UPDATE items SET claimed_at = ? WHERE id = ? AND status = ? AND worker = ?',
+                (time.time(), item_id, self.CLAIMED, self.worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, item_id: int):
+        self._finish(item_id, self.DONE, None)
+
+    def fail(self, item_id: int, error: str):
+        self._finish(item_id, self.FAILED, error)
+
+    def _finish(self, item_id: int, status: str, error: Optional[str]):
+        with self._transaction() as con:
+            con.execute(
+                'UPDATE items SET status = ?, error = ? WHERE id = ? AND status = ? AND worker = ?',
+                (status, error, item_id, self.CLAIMED, self.worker_id)
+            )
+
+    def counts(self) -> Dict[str, int]:
+        """
+        :return: The number of ids per status.
+        """
+        with self._transaction() as con:
+            return dict(con.execute('SELECT status, COUNT(*) FROM items GROUP BY status').fetchall())
+
+    def get_errors(self) -> Iterator[Tuple[int, str]]:
+        with self._transaction() as con:
+            rows = con.execute('SELECT id, error FROM items WHERE status = ?', (self.FAILED,)).fetchall()
+        yield from rows
+
+
+def parse_shard(shard: str) -> Tuple[int, int]:
+    """
+    Parses a shard given as "i/n" with 0 <= i < n.
+
+    :return: A tuple (i, n).
+    """
+    try:
+        index, count = (int(part) for part in shard.split('/'))
+    except ValueError:
+        raise ValueError(f'Invalid shard "{shard}". Expected "i/n", e.g. "0/4".')
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f'Invalid shard "{shard}". Expected 0 <= i < n.')
+    return index, count
+
+
+def in_shard(item_id: int, shard: Tuple[int, int]) -> bool:
+    index, count = shard
+    return item_id % count == index
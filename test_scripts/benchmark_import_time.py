@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Measures the import time of the package modules and CLIs with "python -X importtime" and checks them against a budget.
+Heavy dependencies (aiohttp, bs4, tqdm) must not be imported by modules, that do not need them.
+
+Usage: python test_scripts/benchmark_import_time.py [--runs 5] [--scale 1.0]
+
+Exits with code 1, if a module exceeds its budget or imports a forbidden module. Use --scale on slow machines.
+"""
+import argparse
+import json
+import subprocess
+import sys
+from typing import List, Dict, Tuple
+
+HEAVY_MODULES = ['aiohttp', 'bs4', 'tqdm', 'zstandard']
+
+# module -> (budget in milliseconds, modules that must not be imported)
+BUDGETS: Dict[str, Tuple[float, List[str]]] = {
+    'abgeordnetenwatch_python.models.questions_answers': (100, HEAVY_MODULES + ['asyncio']),
+    'abgeordnetenwatch_python.models.politician_dossier': (120, HEAVY_MODULES + [
+        'asyncio', 'abgeordnetenwatch_python.questions_answers.load_qa'
+    ]),
+    'abgeordnetenwatch_python.corpus.loader': (120, HEAVY_MODULES),
+    'abgeordnetenwatch_python.corpus.query': (120, HEAVY_MODULES),
+    'abgeordnetenwatch_python.cli.convert_qa': (120, HEAVY_MODULES + [
+        'asyncio', 'abgeordnetenwatch_python.questions_answers.load_qa'
+    ]),
+    'abgeordnetenwatch_python.cli.load_questions_answers': (150, ['aiohttp', 'bs4', 'tqdm']),
+    'abgeordnetenwatch_python.cli.load_parliament_qa': (150, ['aiohttp', 'bs4']),
+    'abgeordnetenwatch_python.questions_answers.load_qa': (150, ['aiohttp', 'bs4', 'tqdm']),
+}
+
+
+def measure_import_time(module: str) -> float:
+    """
+    :return: The cumulative import time of the given module in milliseconds, measured in a new interpreter.
+    """
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'], capture_output=True, text=True, check=True
+    ).stderr
+    for line in reversed(output.splitlines()):
+        # "import time: self [us] | cumulative | imported package"
+        parts = [p.strip() for p in line.removeprefix('import time:').split('|')]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000
+    raise ValueError(f'No import time found for {module}')
+
+
+def get_imported_modules(module: str) -> List[str]:
+    code = f'import json, sys, {module}; print(json.dumps(sorted(sys.modules)))'
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the import time of the package against a budget.')
+    parser.add_argument('--runs', type=int, default=5, help='Number of measurements per module. The fastest counts.')
+    parser.add_argument('--scale', type=float, default=1.0, help='Factor for all budgets.')
+    args = parser.parse_args()
+
+    failed = False
+    print(f'{"module":<56}{"ms":>8}{"budget":>8}  forbidden imports')
+    for module, (budget, forbidden) in BUDGETS.items():
+        duration = min(measure_import_time(module) for _ in range(args.runs))
+        imported = set(get_imported_modules(module))
+        forbidden_imports = [m for m in forbidden if m in imported]
+        budget *= args.scale
+        if duration > budget or forbidden_imports:
+            failed = True
+        print(f'{module:<56}{duration:>8.1f}{budget:>8.0f}  {", ".join(forbidden_imports) or "-"}')
+
+    if failed:
+        print('import time budget exceeded')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Compares connection reuse and transferred bytes of different session setups against a local server.
+
+Usage: python test_scripts/benchmark_session.py [--requests 500] [--threads 8] [--pause 20]
+
+With --pause, the requests are sent in two bursts. Connections idle for longer than the keepalive timeout are closed
+between the bursts and have to be reopened.
+"""
+import argparse
+import asyncio
+import gzip
+import time
+import zlib
+
+import aiohttp
+from aiohttp import web
+
+from abgeordnetenwatch_python.session import create_session, SessionConfig
+
+PAGE = ''.join(
+    f'<div class="tile"><article itemtype="https://schema.org/Question"><a href="/profile/x/fragen-antworten/{i}">'
+    f'Frage {i}</a><div class="tile__politician__info">Frage vom 01.01.2024</div></article></div>'
+    for i in range(500)
+).encode()
+
+
+class Stats:
+    def __init__(self):
+        self.connections = set()
+        self.requests = 0
+        self.bytes_sent = 0
+
+    def reset(self):
+        self.__init__()
+
+
+def create_app(stats: Stats) -> web.Application:
+    async def handle(request: web.Request) -> web.Response:
+        stats.connections.add(request.transport.get_extra_info('peername'))
+        stats.requests += 1
+        accept_encoding = request.headers.get('Accept-Encoding', '')
+        headers = {'Content-Type': 'text/html'}
+        if 'gzip' in accept_encoding:
+            body = gzip.compress(PAGE)
+            headers['Content-Encoding'] = 'gzip'
+        elif 'deflate' in accept_encoding:
+            body = zlib.compress(PAGE)
+            headers['Content-Encoding'] = 'deflate'
+        else:
+            body = PAGE
+        stats.bytes_sent += len(body)
+        return web.Response(body=body, headers=headers)
+
+    app = web.Application()
+    app.router.add_get('/page/{index}', handle)
+    return app
+
+
+async def run_requests(session: aiohttp.ClientSession, base_url: str, num_requests: int, threads: int) -> float:
+    sem = asyncio.Semaphore(threads)
+
+    async def fetch(index: int):
+        async with sem, session.get(f'{base_url}/page/{index}') as resp:
+            await resp.text()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(fetch(i) for i in range(num_requests)))
+    return time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Benchmark session setups against a local server.')
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--pause', type=float, default=0.0, help='Seconds to wait between two bursts of requests.')
+    args = parser.parse_args()
+
+    stats = Stats()
+    runner = web.AppRunner(create_app(stats))
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    base_url = f'http://127.0.0.1:{port}'
+
+    setups = {
+        'no keep-alive, identity': lambda: aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=args.threads, force_close=True),
+            headers={'Accept-Encoding': 'identity'}
+        ),
+        'previous cli session': lambda: aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=args.threads)),
+        'create_session()': lambda: create_session(SessionConfig(limit=args.threads)),
+    }
+
+    print(f'{args.requests} requests with {args.threads} threads, page size {len(PAGE)} bytes')
+    print(f'{"setup":<26}{"connections":>12}{"kB sent":>12}{"seconds":>10}')
+    for name, session_factory in setups.items():
+        stats.reset()
+        async with session_factory() as session:
+            duration = await run_requests(session, base_url, args.requests, args.threads)
+            if args.pause:
+                await asyncio.sleep(args.pause)
+                duration += await run_requests(session, base_url, args.requests, args.threads)
+        print(f'{name:<26}{len(stats.connections):>12}{stats.bytes_sent / 1000:>12.1f}{duration:>10.3f}')
+
+    await runner.cleanup()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
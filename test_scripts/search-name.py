@@ -1,13 +1,11 @@
 #!/usr/bin/env python3
 
-import json
 from pathlib import Path
-from typing import Iterator, Tuple, List
-from itertools import islice
+from typing import List
 
 from tqdm import tqdm
 
-from abgeordnetenwatch_python.models.politician_dossier import PoliticianDossier
+from abgeordnetenwatch_python.corpus.loader import DossierLoader
 from abgeordnetenwatch_python.models.questions_answers import QuestionAnswerResult
 
 DATA_DIR = Path("data/json/bundestag/")
@@ -16,7 +14,7 @@ NAME = "Max M."
 
 
 def main():
-    dossiers = LoadDossiers(DATA_DIR)
+    dossiers = DossierLoader(DATA_DIR)
     lines = []
     for path, dossier in tqdm(dossiers):
         for qa in dossier.questions_answers.questions_answers:
@@ -27,24 +25,6 @@ def main():
     print('\n'.join(lines))
 
 
-class LoadDossiers:
-    def __init__(self, data_dir: Path, limit: int = -1):
-        self.data_dir = data_dir
-        json_files = data_dir.rglob("*.json")
-        if limit > 0:
-            json_files = islice(json_files, limit)
-        self.json_files = sorted(list(json_files))
-
-    def __iter__(self) -> Iterator[Tuple[Path, PoliticianDossier]]:
-        for path in self.json_files:
-            with open(path, 'r') as f:
-                data = json.load(f)
-                yield path, PoliticianDossier.model_validate(data)
-
-    def __len__(self):
-        return len(self.json_files)
-
-
 def str_in(s, sub) -> bool:
     return s and sub in s
 
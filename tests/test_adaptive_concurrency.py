@@ -0,0 +1,72 @@
+import asyncio
+
+from abgeordnetenwatch_python.adaptive_concurrency import AdaptiveLimiter
+
+
+def test_additive_increase():
+    limiter = AdaptiveLimiter(max_limit=8, initial_limit=4)
+    limiter.in_flight = 4
+    # about one more request per round trip of `limit` requests
+    for _ in range(4):
+        limiter.on_success(0.1)
+    assert limiter.get_limit() == 4
+    limiter.on_success(0.1)
+    assert limiter.get_limit() == 5
+    for _ in range(100):
+        limiter.in_flight = limiter.get_limit()
+        limiter.on_success(0.1)
+    assert limiter.get_limit() == 8
+    assert limiter.num_backoffs == 0
+
+
+def test_no_increase_below_limit():
+    limiter = AdaptiveLimiter(max_limit=8, initial_limit=4)
+    limiter.in_flight = 2
+    for _ in range(20):
+        limiter.on_success(0.1)
+    assert limiter.get_limit() == 4
+
+
+def test_multiplicative_decrease():
+    limiter = AdaptiveLimiter(max_limit=20, min_limit=2, initial_limit=10, backoff=0.5)
+    # without a measured latency, every overload backs off
+    limiter.on_overload('timeout')
+    assert limiter.get_limit() == 5
+    limiter.on_overload('429')
+    limiter.on_overload('429')
+    assert limiter.get_limit() == 2
+    assert limiter.num_backoffs == 3
+    assert [limit for _, limit in limiter.history] == [10, 5, 2]
+
+
+def test_one_decrease_per_round_trip():
+    limiter = AdaptiveLimiter(max_limit=20, initial_limit=10, backoff=0.5)
+    limiter.on_success(60.0)
+    # the other requests of the round trip fail for the same reason
+    for _ in range(5):
+        limiter.on_overload('503')
+    assert limiter.get_limit() == 5
+    assert limiter.num_backoffs == 1
+
+
+def test_decrease_on_latency():
+    limiter = AdaptiveLimiter(max_limit=20, initial_limit=10, backoff=0.5, latency_tolerance=2.0)
+    limiter.on_success(0.001)
+    while limiter.num_backoffs == 0:
+        limiter.on_success(0.01)
+    assert limiter.get_limit() == 5
+
+
+def test_acquire_waits_for_limit():
+    async def run():
+        limiter = AdaptiveLimiter(max_limit=2, initial_limit=2)
+        await limiter.acquire()
+        await limiter.acquire()
+        waiting = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0.01)
+        assert not waiting.done()
+        await limiter.release()
+        await asyncio.wait_for(waiting, 1)
+        assert limiter.in_flight == 2
+
+    asyncio.run(run())
@@ -0,0 +1,87 @@
+import io
+import json
+import warnings
+
+from abgeordnetenwatch_python.cache import CacheIndex
+from abgeordnetenwatch_python.models.politician_dossier import PoliticianDossier
+from abgeordnetenwatch_python.models.politicians import Politician
+from abgeordnetenwatch_python.models.questions_answers import QuestionAnswerResult, QuestionsAnswers
+
+BASE_URL = 'https://www.abgeordnetenwatch.de/profile/erika-mustermann/fragen-antworten/'
+
+
+class CollidingUrl(str):
+    # all instances have the same hash
+    def __hash__(self):
+        return 1
+
+
+def test_duplicated_urls():
+    index = CacheIndex([
+        QuestionAnswerResult(url=BASE_URL + 'a', question='Frage'),
+        QuestionAnswerResult(url=BASE_URL + 'b', question='Frage'),
+        QuestionAnswerResult(url=BASE_URL + 'a', question='Frage', answer='Antwort'),
+        QuestionAnswerResult(url=None, question='Frage'),
+    ])
+    assert len(index) == 2
+    assert index.num_unanswered == 1
+    assert index.is_answered(BASE_URL + 'a')
+    assert index.get(BASE_URL + 'a').answer == 'Antwort'
+    assert index.is_unanswered(BASE_URL + 'b')
+    assert index.is_answered(BASE_URL + 'c') is None
+    assert sorted(index.get_urls()) == [BASE_URL + 'a', BASE_URL + 'b']
+    index.close()
+
+
+def test_colliding_hashes():
+    urls = [CollidingUrl(BASE_URL + name) for name in ('a', 'b', 'c', 'b')]
+    index = CacheIndex([
+        QuestionAnswerResult.model_construct(url=url, question='Frage', answer='Antwort' if i == 3 else None)
+        for i, url in enumerate(urls)
+    ])
+    assert len(index) == 3
+    for name, answered in (('a', False), ('b', True), ('c', False)):
+        assert index.is_answered(CollidingUrl(BASE_URL + name)) == answered
+        assert index.get(CollidingUrl(BASE_URL + name)).url == BASE_URL + name
+    assert CollidingUrl(BASE_URL + 'd') not in index
+    assert index.get(CollidingUrl(BASE_URL + 'd')) is None
+    index.close()
+
+
+def test_invalid_record_is_loaded_again():
+    records = [
+        {'url': BASE_URL + 'a', 'question': 'Frage', 'question_date': 'kein Datum'}, {'url': None, 'question': 'Frage'}
+    ]
+    data, index = CacheIndex.load_json(io.StringIO(json.dumps({'questions_answers': records})))
+    assert data == {'questions_answers': [None, None]}
+    assert len(index) == 1
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        assert index.get(BASE_URL + 'a') is None
+    assert len(caught) == 1
+    index.close()
+
+
+def test_dossier_with_index(tmp_path):
+    politician = Politician(
+        id=1, first_name='Erika', last_name='Mustermann',
+        api_url='https://www.abgeordnetenwatch.de/api/v2/politicians/1',
+        abgeordnetenwatch_url='https://www.abgeordnetenwatch.de/profile/erika-mustermann'
+    )
+    questions_answers = [
+        QuestionAnswerResult(url=BASE_URL + 'a', question='Frage', answer='Antwort'),
+        QuestionAnswerResult(url=BASE_URL + 'b', question='Frage'),
+    ]
+    filename = tmp_path / 'dossier.json.gz'
+    PoliticianDossier(
+        politician=politician, mandate_ids=[3], questions_answers=QuestionsAnswers(questions_answers=questions_answers)
+    ).dump_to_file(filename)
+
+    dossier, index = PoliticianDossier.from_file_with_index(filename)
+    assert dossier.politician == politician
+    assert dossier.mandate_ids == [3]
+    assert len(dossier.questions_answers) == 0
+    assert [index.get(qa.url) for qa in questions_answers] == questions_answers
+    index.close()
+
+    assert PoliticianDossier.from_file_with_index(tmp_path / 'missing.json') == (None, None)
@@ -0,0 +1,34 @@
+from pathlib import Path
+
+import pytest
+
+from abgeordnetenwatch_python.compression import open_file, get_compression_method, strip_dossier_suffix, \
+    get_dossier_file_variants
+
+# more than one block of the compressors, with umlauts
+CONTENT = '\n'.join(f'{{"frage": "Wie stehen Sie zur Förderung Nr. {i}?"}}' for i in range(20000))
+
+
+@pytest.mark.parametrize(
+    'name, method', [('dossier.json', None), ('dossier.json.gz', 'gzip'), ('dossier.json.zst', 'zstd')]
+)
+def test_round_trip(tmp_path, name, method):
+    filename = tmp_path / name
+    assert get_compression_method(filename) == method
+    with open_file(filename, 'w', level=1) as f:
+        f.write(CONTENT)
+    with open_file(filename, 'r') as f:
+        assert f.read() == CONTENT
+    # read line by line, like the dossier header
+    with open_file(filename, 'r') as f:
+        assert f.readline() == CONTENT.split('\n', 1)[0] + '\n'
+    if method is not None:
+        assert filename.stat().st_size < len(CONTENT) / 2
+
+
+def test_dossier_suffixes():
+    assert strip_dossier_suffix(Path('a/b.json.zst')) == Path('a/b')
+    assert strip_dossier_suffix(Path('a/b.json')) == Path('a/b')
+    assert get_dossier_file_variants(Path('a/b.json.gz')) == [
+        Path('a/b.json'), Path('a/b.json.gz'), Path('a/b.json.zst')
+    ]
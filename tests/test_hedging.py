@@ -0,0 +1,67 @@
+import asyncio
+
+from abgeordnetenwatch_python.hedging import HedgingSession, fetch_text, is_hedging
+from abgeordnetenwatch_python.session import SessionWrapper
+
+
+class FakeResponse:
+    status = 200
+    ok = True
+
+    def __init__(self, body: str):
+        self.body = body
+
+    async def read(self) -> bytes:
+        return self.body.encode('utf-8')
+
+    async def text(self) -> str:
+        return self.body
+
+
+class SlowOnceSession:
+    # answers every request after `delay` seconds, the request number `slow` takes 10 seconds
+    def __init__(self, slow: int, delay: float = 0.01):
+        self.slow = slow
+        self.delay = delay
+        self.requests = []
+
+    def get(self, url: str, **kwargs):
+        return self._Request(self, url, kwargs)
+
+    class _Request:
+        def __init__(self, session: 'SlowOnceSession', url: str, kwargs: dict):
+            self.session = session
+            self.url = url
+            assert 'hedge' not in kwargs
+
+        async def __aenter__(self) -> FakeResponse:
+            self.session.requests.append(self.url)
+            await asyncio.sleep(10 if len(self.session.requests) == self.session.slow else self.session.delay)
+            return FakeResponse(self.url)
+
+        async def __aexit__(self, exc_type, exc_val, exc_tb):
+            pass
+
+
+def test_hedging_inside_other_wrappers():
+    async def run():
+        inner = SlowOnceSession(slow=4)
+        hedging = HedgingSession(inner, min_samples=3)
+        session = SessionWrapper(SessionWrapper(hedging))
+        assert is_hedging(session)
+        for i in range(4):
+            assert await asyncio.wait_for(fetch_text(f'page{i}', session), 5) == (200, f'page{i}')
+        assert inner.requests == ['page0', 'page1', 'page2', 'page3', 'page3']
+        assert (hedging.num_requests, hedging.num_hedged, hedging.num_hedge_wins) == (4, 1, 1)
+
+    asyncio.run(run())
+
+
+def test_no_hedging():
+    async def run():
+        inner = SlowOnceSession(slow=0)
+        session = SessionWrapper(inner)
+        assert not is_hedging(session)
+        assert await fetch_text('page', session) == (200, 'page')
+
+    asyncio.run(run())
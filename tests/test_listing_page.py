@@ -0,0 +1,186 @@
+import asyncio
+import datetime
+import re
+import warnings
+from pathlib import Path
+
+import pytest
+
+from abgeordnetenwatch_python.cache import CacheInfo
+from abgeordnetenwatch_python.models.questions_answers import QuestionAnswerResult, QuestionsAnswers
+from abgeordnetenwatch_python.questions_answers.load_qa import QuestionsAnswersParser, \
+    async_get_questions_answers_urls, LISTING_PAGE_ATTEMPTS
+
+# a listing page of a politician with an answered, an unanswered and another answered question, followed by the pager
+LISTING_PAGE = (Path(__file__).parent / 'data' / 'listing_page.html').read_text(encoding='utf-8')
+SITE_URL = 'https://www.abgeordnetenwatch.de'
+POLITICIAN_URL = SITE_URL + '/profile/erika-mustermann'
+BASE_URL = '/profile/erika-mustermann/fragen-antworten/'
+ANSWERED = BASE_URL + 'wie-stehen-sie-zur-grundsteuer'
+UNANSWERED = BASE_URL + 'warum-haben-sie-gegen-den-antrag-gestimmt'
+SUGGESTED = BASE_URL + 'was-planen-sie-fuer-den-nahverkehr'
+
+
+def parse(content: str, chunk_size: int = 0, **kwargs) -> QuestionsAnswersParser:
+    parser = QuestionsAnswersParser(POLITICIAN_URL, **kwargs)
+    for start in range(0, len(content), chunk_size or len(content)):
+        parser.feed(content[start:start + (chunk_size or len(content))])
+        if parser.done:
+            break
+    return parser
+
+
+def get_cache_info(hrefs_answered: dict, num_answers_missing: int) -> CacheInfo:
+    questions_answers = QuestionsAnswers(questions_answers=[
+        QuestionAnswerResult(url=SITE_URL + href, question='Frage', answer='Antwort' if answered else None)
+        for href, answered in hrefs_answered.items()
+    ])
+    return CacheInfo(
+        questions_answers=questions_answers, num_questions_missing=0, num_answers_missing=num_answers_missing
+    )
+
+
+def add_tiles(cache_info: CacheInfo, parser: QuestionsAnswersParser):
+    cache_info.add_tiles({SITE_URL + href: tile for href, tile in parser.tiles.items()})
+
+
+def should_cache(cache_info: CacheInfo, href: str) -> bool:
+    return cache_info.should_cache(cache_info.get_by_url(SITE_URL + href))
+
+
+def test_tiles():
+    parser = parse(LISTING_PAGE)
+    assert list(parser.tiles) == [ANSWERED, UNANSWERED, SUGGESTED]
+    assert parser.tiles[ANSWERED].answered
+    assert parser.tiles[ANSWERED].answer_date == datetime.date(2024, 4, 2)
+    assert not parser.tiles[UNANSWERED].answered
+    assert parser.tiles[UNANSWERED].answer_date is None
+    assert parser.tiles[SUGGESTED].answered
+    assert parser.tiles[SUGGESTED].answer_date == datetime.date(2024, 2, 15)
+
+
+def test_tiles_in_chunks():
+    parser = parse(LISTING_PAGE)
+    for chunk_size in (1, 7, 100, 1000):
+        chunked = parse(LISTING_PAGE, chunk_size)
+        assert chunked.tiles == parser.tiles
+
+
+def test_newly_answered_question_is_loaded_again():
+    cache_info = get_cache_info({ANSWERED: False, UNANSWERED: False}, num_answers_missing=1)
+    add_tiles(cache_info, parse(LISTING_PAGE))
+    assert cache_info.are_tiles_reliable()
+    assert cache_info.num_unanswered_seen == 2
+    assert cache_info.num_newly_answered == 1
+    assert not cache_info.is_answer_missing()
+    assert not should_cache(cache_info, ANSWERED)
+    assert should_cache(cache_info, UNANSWERED)
+
+
+def test_page_without_answered_questions():
+    # a page of unanswered questions does not disable the tiles, as long as other pages show answered questions
+    tiles = parse(LISTING_PAGE).tiles
+    cache_info = get_cache_info({UNANSWERED: False, SUGGESTED: False}, num_answers_missing=1)
+    cache_info.add_tiles({SITE_URL + UNANSWERED: tiles[UNANSWERED]})
+    assert cache_info.is_answer_missing()
+    cache_info.add_tiles({SITE_URL + href: tiles[href] for href in (ANSWERED, SUGGESTED)})
+    assert cache_info.are_tiles_reliable()
+    assert not cache_info.is_answer_missing()
+    assert should_cache(cache_info, UNANSWERED)
+    assert not should_cache(cache_info, SUGGESTED)
+
+
+def test_page_without_answered_markers():
+    # e.g. a changed layout of the listing page: the answered state of the tiles is unknown
+    content = re.sub(r'<div class="tile__answer" itemprop=.*?</div>\s*</div>\s*</div>', '', LISTING_PAGE, flags=re.S)
+    parser = parse(content)
+    assert len(parser.tiles) == 3
+    assert not any(tile.answered for tile in parser.tiles.values())
+
+    cache_info = get_cache_info({ANSWERED: False, UNANSWERED: False}, num_answers_missing=1)
+    add_tiles(cache_info, parser)
+    assert not cache_info.are_tiles_reliable()
+    # all unanswered questions are loaded again, like without tiles
+    for href in (ANSWERED, UNANSWERED):
+        assert not should_cache(cache_info, href)
+
+
+def test_stops_at_pager():
+    parser = parse(LISTING_PAGE)
+    assert parser.done
+    assert not parser.found_known
+    # the links behind the pager are not part of the question list
+    assert parser.hrefs == {ANSWERED, UNANSWERED, SUGGESTED}
+    for chunk_size in (1, 7, 100, 1000):
+        assert parse(LISTING_PAGE, chunk_size).hrefs == parser.hrefs
+
+
+def test_no_stop_without_pager():
+    parser = parse(LISTING_PAGE.replace('class="pager"', 'class="navigation"'))
+    assert not parser.done
+    assert BASE_URL + 'beliebteste-frage' in parser.hrefs
+
+
+def test_stops_at_known_question():
+    parser = parse(LISTING_PAGE, known_hrefs={UNANSWERED})
+    assert parser.done
+    assert parser.found_known
+    assert list(parser.tiles) == [ANSWERED]
+    assert SUGGESTED not in parser.hrefs
+
+
+class FakeContent:
+    def __init__(self, body: bytes):
+        self.body = body
+
+    async def iter_chunked(self, chunk_size: int):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start:start + chunk_size]
+
+
+class FakeResponse:
+    charset = 'utf-8'
+
+    def __init__(self, status: int, body: bytes):
+        self.status = status
+        self.content = FakeContent(body)
+
+    def close(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+class ListingSession:
+    # serves the listing page as first page, all other pages are empty. The first `timeouts` requests time out.
+    def __init__(self, timeouts: int):
+        self.timeouts = timeouts
+        self.requests = []
+
+    def get(self, url: str) -> FakeResponse:
+        self.requests.append(url)
+        if len(self.requests) <= self.timeouts:
+            raise asyncio.TimeoutError()
+        return FakeResponse(200, (LISTING_PAGE if url.endswith('page=0') else '').encode('utf-8'))
+
+
+def get_urls(session: ListingSession) -> list:
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return asyncio.run(async_get_questions_answers_urls(POLITICIAN_URL, session, threads=1))
+
+
+def test_listing_page_timeout_is_retried():
+    session = ListingSession(timeouts=LISTING_PAGE_ATTEMPTS - 1)
+    assert sorted(get_urls(session)) == sorted(SITE_URL + href for href in (ANSWERED, UNANSWERED, SUGGESTED))
+    assert session.requests[:LISTING_PAGE_ATTEMPTS] == [session.requests[0]] * LISTING_PAGE_ATTEMPTS
+
+
+def test_listing_page_timeout_fails():
+    # skipping the page would save the dossier without its questions
+    with pytest.raises(asyncio.TimeoutError):
+        get_urls(ListingSession(timeouts=LISTING_PAGE_ATTEMPTS))
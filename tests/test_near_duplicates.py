@@ -0,0 +1,29 @@
+import numpy as np
+
+from abgeordnetenwatch_python.corpus.near_duplicates import NearDuplicateIndex, IndexRecord
+
+
+def add(index: NearDuplicateIndex, name: str, signature: list):
+    index._add_signature(IndexRecord(name, 1, False), np.array(signature, dtype=np.uint32))
+
+
+def test_first_candidate_not_similar():
+    # 4 bands of 2 rows: a and b agree in 7 of 8 values, b and c as well, but a and c only in 6
+    index = NearDuplicateIndex(num_perm=8, bands=4, threshold=0.8)
+    add(index, 'a', [0, 1, 2, 3, 4, 5, 6, 7])
+    add(index, 'b', [0, 1, 2, 3, 4, 5, 6, 70])
+    add(index, 'other', [10, 11, 12, 13, 14, 15, 16, 17])
+    # a is the first candidate of the cluster of a and b, but only b is similar enough
+    add(index, 'c', [0, 1, 2, 3, 4, 5, 60, 70])
+    assert index.get_candidates(index._signatures[3]) == [0, 1, 3]
+    assert index.get_clusters() == [[0, 1, 3]]
+
+
+def test_clusters():
+    index = NearDuplicateIndex()
+    campaign = ' '.join(f'wort{i}' for i in range(60))
+    for i in range(5):
+        index.add(f'campaign{i}', i, campaign.replace(f'wort{10 * i}', 'sehr'))
+    index.add('other', 1, ' '.join(f'anders{i}' for i in range(60)))
+    assert index.get_clusters() == [[0, 1, 2, 3, 4]]
+    assert index.find_similar(campaign) == [0, 1, 2, 3, 4]
@@ -0,0 +1,41 @@
+import datetime
+
+from abgeordnetenwatch_python.politician_directory import PoliticianDirectory, DirectoryEntry, FIELDS
+
+
+def get_directory(tmp_path) -> PoliticianDirectory:
+    directory = PoliticianDirectory(tmp_path / 'politicians.json.gz')
+    directory._set_entries([
+        DirectoryEntry(1, 'Angela', 'Merkel', 'CDU', 'Berlin'),
+        DirectoryEntry(2, 'Olaf', 'Scholz', 'SPD', 'Potsdam'),
+        DirectoryEntry(3, 'Hans', 'Müller-Lüdenscheidt', None, 'Hamburg'),
+    ])
+    directory.synced_at = datetime.datetime(2024, 5, 1, 12, 30)
+    return directory
+
+
+def test_index_is_saved_with_directory(tmp_path):
+    directory = get_directory(tmp_path)
+    directory.save()
+    assert directory.index_filename.is_file()
+
+    loaded = PoliticianDirectory(directory.filename)
+    assert set(loaded._indexes) == set(FIELDS)
+    assert loaded.find(first_name='Angla', last_name='Merkl') == directory.find(first_name='Angla', last_name='Merkl')
+    assert [r.entry.id for r in loaded.search('mueller ludensch')] == [3]
+    assert [r.entry.id for r in loaded.search('spd', field='party')] == [2]
+
+
+def test_index_of_other_directory_is_ignored(tmp_path):
+    directory = get_directory(tmp_path)
+    directory.save()
+    index = directory.index_filename.read_bytes()
+    directory.update([])
+    directory.synced_at = datetime.datetime(2024, 6, 1)
+    directory.save()
+    # e.g. a crash between writing the directory and its index
+    directory.index_filename.write_bytes(index)
+
+    loaded = PoliticianDirectory(directory.filename)
+    assert loaded._indexes == {}
+    assert [r.entry.id for r in loaded.search('scholz')] == [2]
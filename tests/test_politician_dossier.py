@@ -0,0 +1,29 @@
+import json
+
+from abgeordnetenwatch_python.models.politician_dossier import PoliticianDossier
+from abgeordnetenwatch_python.models.politicians import Politician
+from abgeordnetenwatch_python.models.questions_answers import QuestionAnswerResult, QuestionsAnswers
+
+
+def test_read_politician(tmp_path):
+    politician = Politician(
+        id=1, first_name='Erika', last_name='Mustermann', statistic_questions=2, statistic_questions_answered=1,
+        api_url='https://www.abgeordnetenwatch.de/api/v2/politicians/1',
+        abgeordnetenwatch_url='https://www.abgeordnetenwatch.de/profile/erika-mustermann'
+    )
+    questions_answers = [
+        QuestionAnswerResult(url=politician.abgeordnetenwatch_url + '/fragen-antworten/a', question='')
+    ]
+    dossier = PoliticianDossier(
+        politician=politician, mandate_ids=[3], questions_answers=QuestionsAnswers(questions_answers=questions_answers)
+    )
+    for filename in (tmp_path / 'dossier.json', tmp_path / 'dossier.json.zst'):
+        dossier.dump_to_file(filename)
+        assert PoliticianDossier.read_politician(filename) == politician
+
+    # not saved by dump_to_file()
+    filename = tmp_path / 'compact.json'
+    filename.write_text(json.dumps(dossier.model_dump(mode='json')))
+    assert PoliticianDossier.read_politician(filename) == politician
+
+    assert PoliticianDossier.read_politician(tmp_path / 'missing.json') is None
@@ -0,0 +1,25 @@
+import numpy as np
+
+from abgeordnetenwatch_python.corpus.qa_stats import grouped_quantiles
+
+
+def test_grouped_quantiles():
+    rng = np.random.default_rng(1)
+    num_groups = 5
+    codes = rng.integers(0, num_groups - 1, size=500)
+    values = rng.normal(size=500)
+    values[::7] = np.nan
+    for q in (0.0, 0.25, 0.5, 0.9, 1.0):
+        result = grouped_quantiles(codes, values, num_groups, q)
+        for group in range(num_groups - 1):
+            group_values = values[(codes == group) & ~np.isnan(values)]
+            assert np.isclose(result[group], np.quantile(group_values, q))
+        # the last group has no values
+        assert np.isnan(result[-1])
+
+
+def test_grouped_quantiles_interpolation():
+    codes = np.array([1, 0, 1, 1, 0, 1])
+    values = np.array([4.0, 10.0, 1.0, 2.0, np.nan, 3.0])
+    assert np.allclose(grouped_quantiles(codes, values, 2, 0.5), [10.0, 2.5])
+    assert np.allclose(grouped_quantiles(codes, values, 2, 0.25), [10.0, 1.75])
@@ -0,0 +1,89 @@
+import datetime
+import itertools
+import random
+
+from abgeordnetenwatch_python.corpus.query import QuestionsAnswersCorpus
+from abgeordnetenwatch_python.models.party import Party
+from abgeordnetenwatch_python.models.politician_dossier import PoliticianDossier
+from abgeordnetenwatch_python.models.politicians import Politician
+from abgeordnetenwatch_python.models.questions_answers import QuestionAnswerResult, QuestionsAnswers
+
+PARTIES = [Party(id=1, label='SPD'), Party(id=2, label='CDU'), None]
+START = datetime.date(2024, 1, 1)
+
+
+def create_corpus(num_politicians: int = 6, num_questions: int = 40) -> QuestionsAnswersCorpus:
+    rng = random.Random(1)
+    dossiers = []
+    for politician_id in range(1, num_politicians + 1):
+        politician = Politician(
+            id=politician_id, first_name='Erika', last_name=f'Mustermann{politician_id}',
+            party=PARTIES[politician_id % len(PARTIES)], api_url='', abgeordnetenwatch_url=''
+        )
+        questions_answers = []
+        for i in range(num_questions):
+            # some questions without date
+            question_date = START + datetime.timedelta(days=rng.randrange(60)) if i % 10 else None
+            answered = rng.random() < 0.5
+            questions_answers.append(QuestionAnswerResult(
+                url=f'{politician_id}/{i}', question='Frage', question_date=question_date,
+                answer='Antwort' if answered else None,
+                answer_date=START + datetime.timedelta(days=rng.randrange(60, 90)) if answered and i % 7 else None
+            ))
+        dossiers.append(PoliticianDossier(
+            politician=politician, mandate_ids=[],
+            questions_answers=QuestionsAnswers(questions_answers=questions_answers)
+        ))
+    return QuestionsAnswersCorpus(dossiers)
+
+
+def matches(record, politician_id=None, party=None, answered=None, question_date_from=None, question_date_to=None,
+            answer_date_from=None, answer_date_to=None) -> bool:
+    def in_range(date, start, end):
+        if start is None and end is None:
+            return True
+        return date is not None and (start is None or start <= date) and (end is None or date <= end)
+
+    return (politician_id is None or record.politician.id == politician_id) \
+        and (party is None or (record.politician.party is not None and record.politician.party.label == party)) \
+        and (answered is None or (record.qa.answer is not None) == answered) \
+        and in_range(record.qa.question_date, question_date_from, question_date_to) \
+        and in_range(record.qa.answer_date, answer_date_from, answer_date_to)
+
+
+def test_query_without_filters():
+    corpus = create_corpus()
+    records = corpus.query()
+    assert len(records) == len(corpus)
+    dates = [r.qa.question_date for r in records]
+    # sorted by question date, undated questions last
+    assert dates == sorted(dates, key=lambda d: (d is None, d or START))
+    assert corpus.get_parties() == ['CDU', 'SPD']
+
+
+def test_query_filters():
+    corpus = create_corpus()
+    filter_values = {
+        'politician_id': [None, 2, 99],
+        'party': [None, 'SPD', 'FDP'],
+        'answered': [None, True, False],
+        'question_date_from': [None, START + datetime.timedelta(days=10)],
+        'question_date_to': [None, START + datetime.timedelta(days=20)],
+        'answer_date_from': [None, START + datetime.timedelta(days=70)],
+    }
+    for values in itertools.product(*filter_values.values()):
+        filters = {key: value for key, value in zip(filter_values, values) if value is not None}
+        expected = {r.qa.url for r in corpus.records if matches(r, **filters)}
+        records = corpus.query(**filters)
+        assert [r.qa.url for r in records] == [r.qa.url for r in corpus.query() if r.qa.url in expected], filters
+
+
+def test_query_date_range_includes_both_ends():
+    corpus = create_corpus()
+    day = START + datetime.timedelta(days=5)
+    records = corpus.query(question_date_from=day, question_date_to=day)
+    assert records
+    assert all(r.qa.question_date == day for r in records)
+    assert corpus.query_questions_answers(question_date_from=day, question_date_to=day).questions_answers == [
+        r.qa for r in records
+    ]
@@ -0,0 +1,77 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from abgeordnetenwatch_python.record_replay import RecordingSession, ReplaySession, get_request_key
+
+API_URL = 'https://www.abgeordnetenwatch.de/api/v2/politicians'
+
+
+class FakeResponse:
+    content_type = 'application/json'
+    charset = 'utf-8'
+
+    def __init__(self, url: str, status: int, body: bytes):
+        self.url = url
+        self.status = status
+        self.body = body
+
+    async def read(self) -> bytes:
+        return self.body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+class CountingSession:
+    # answers with the number of the request, the url "missing" with 404
+    def __init__(self):
+        self.num_requests = 0
+
+    def get(self, url: str, params: dict = None, **kwargs) -> FakeResponse:
+        self.num_requests += 1
+        status = 404 if url.endswith('missing') else 200
+        return FakeResponse(url, status, f'{{"request": {self.num_requests}}}'.encode('utf-8'))
+
+    async def close(self):
+        pass
+
+
+def test_request_key():
+    assert get_request_key(API_URL, {'id': 1, 'range_end': 10}) == get_request_key(API_URL + '?range_end=10&id=1')
+    assert get_request_key(API_URL, {'id': 1}) != get_request_key(API_URL, {'id': 2})
+
+
+def test_round_trip(tmp_path):
+    async def record():
+        async with RecordingSession(CountingSession(), tmp_path) as session:
+            for params in ({'id': 1}, {'id': 2}, {'id': 1}):
+                async with session.get(API_URL, params=params) as r:
+                    assert (await r.json())['request'] > 0
+            async with session.get(API_URL + '/missing') as r:
+                assert r.status == 404
+
+    async def replay():
+        async with ReplaySession(tmp_path) as session:
+            assert len(session) == 4
+            # repeated requests are served in the recorded order, the last response is repeated
+            for params, request in (({'id': 1}, 1), ({'id': 2}, 2), ({'id': 1}, 3), ({'id': 1}, 3)):
+                async with session.get(API_URL, params=params) as r:
+                    assert r.status == 200
+                    assert r.content_type == 'application/json'
+                    assert await r.json() == {'request': request}
+            async with session.get(API_URL + '?id=2') as r:
+                assert await r.text() == '{"request": 2}'
+            with pytest.raises(aiohttp.ClientResponseError):
+                async with session.get(API_URL + '/missing', raise_for_status=True):
+                    pass
+            with pytest.raises(aiohttp.ClientConnectionError):
+                async with session.get(API_URL, params={'id': 3}):
+                    pass
+
+    asyncio.run(record())
+    asyncio.run(replay())
@@ -0,0 +1,31 @@
+import datetime
+
+from abgeordnetenwatch_python.cli.reparse_qa import should_replace
+from abgeordnetenwatch_python.models.questions_answers import QuestionAnswerResult
+
+URL = 'https://www.abgeordnetenwatch.de/profile/erika-mustermann/fragen-antworten/frage'
+
+
+def get_result(**kwargs) -> QuestionAnswerResult:
+    return QuestionAnswerResult(url=URL, question='Wie stehen Sie zur Grundsteuer?', **kwargs)
+
+
+def test_fixed_parse_replaces_record():
+    old = get_result(answer='Antwort', answer_date=None)
+    new = get_result(answer='Antwort', answer_date=datetime.date(2024, 4, 2))
+    assert should_replace(old, new)
+    assert not should_replace(new, new.model_copy())
+
+
+def test_newer_answer_replaces_record():
+    assert should_replace(get_result(), get_result(answer='Antwort'))
+
+
+def test_older_page_never_removes_answer():
+    # the page was stored before the question was answered
+    assert not should_replace(get_result(answer='Antwort'), get_result())
+
+
+def test_failed_parse_never_replaces_record():
+    new = get_result(answer='Andere Antwort', errors=['Parsing stored page failed'])
+    assert not should_replace(get_result(answer='Antwort'), new)
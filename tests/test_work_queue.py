@@ -0,0 +1,49 @@
+import time
+
+from abgeordnetenwatch_python.work_queue import WorkQueue
+
+
+def claim_all(work_queue: WorkQueue) -> list:
+    item_ids = []
+    while (item_id := work_queue.claim()) is not None:
+        work_queue.complete(item_id)
+        item_ids.append(item_id)
+    return item_ids
+
+
+def test_second_run_on_same_queue_file(tmp_path):
+    filename = tmp_path / 'queue.sqlite'
+    work_queue = WorkQueue(filename, worker_id='worker')
+    work_queue.fill([1, 2, 3], reset=True)
+    assert claim_all(work_queue) == [1, 2, 3]
+
+    # the coordinator of the second run resets the queue before it loads the politicians
+    coordinator = WorkQueue(filename, worker_id='coordinator')
+    coordinator.reset()
+    assert not work_queue.is_filled()
+    assert work_queue.claim() is None
+
+    coordinator.fill([2, 3, 4], reset=True)
+    assert work_queue.is_filled()
+    assert work_queue.counts() == {WorkQueue.PENDING: 3}
+    assert claim_all(work_queue) == [2, 3, 4]
+
+
+def test_finish_requires_claim(tmp_path):
+    filename = tmp_path / 'queue.sqlite'
+    work_queue = WorkQueue(filename, worker_id='worker')
+    work_queue.fill([1])
+    assert work_queue.claim() == 1
+    time.sleep(0.01)
+
+    # the claim expired and was taken over, the first worker must not finish the id anymore
+    other = WorkQueue(filename, claim_timeout=0, worker_id='other')
+    assert other.claim() == 1
+    assert not work_queue.renew(1)
+    work_queue.fail(1, 'error')
+    assert work_queue.counts() == {WorkQueue.CLAIMED: 1}
+
+    other.complete(1)
+    # finishing a finished id again keeps its state
+    other.fail(1, 'error')
+    assert work_queue.counts() == {WorkQueue.DONE: 1}
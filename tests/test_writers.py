@@ -0,0 +1,38 @@
+import datetime
+
+import pytest
+
+from abgeordnetenwatch_python.models.questions_answers import QuestionAnswerResult, QuestionsAnswers
+from abgeordnetenwatch_python.questions_answers.jsonl import load_jsonl_index, read_question_answer
+from abgeordnetenwatch_python.questions_answers.load_qa import save_answers_to_format, parse_questions_answers
+from abgeordnetenwatch_python.questions_answers.writers import open_questions_answers_writer
+
+BASE_URL = 'https://www.abgeordnetenwatch.de/profile/erika-mustermann/fragen-antworten/'
+
+
+def get_questions_answers(*names: str) -> QuestionsAnswers:
+    return QuestionsAnswers(questions_answers=[
+        QuestionAnswerResult(url=BASE_URL + name, question=f'Frage {name}', question_date=datetime.date(2024, 1, 2))
+        for name in names
+    ])
+
+
+def test_append_jsonl(tmp_path):
+    filename = tmp_path / 'questions.jsonl'
+    save_answers_to_format(get_questions_answers('a', 'b'), filename, 'jsonl')
+    save_answers_to_format(get_questions_answers('c'), filename, 'jsonl', append=True)
+
+    assert parse_questions_answers(filename) == get_questions_answers('a', 'b', 'c')
+    index = load_jsonl_index(filename)
+    assert len(index) == 3
+    assert read_question_answer(filename, BASE_URL + 'c', index).question == 'Frage c'
+
+    # without append, the file is overwritten
+    save_answers_to_format(get_questions_answers('d'), filename, 'jsonl')
+    assert parse_questions_answers(filename) == get_questions_answers('d')
+    assert len(load_jsonl_index(filename)) == 1
+
+
+def test_append_only_jsonl(tmp_path):
+    with pytest.raises(ValueError):
+        open_questions_answers_writer(tmp_path / 'questions.csv', 'csv', append=True)